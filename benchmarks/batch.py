@@ -0,0 +1,53 @@
+'''
+Compares records per second of encrypting and decrypting many short
+values one call at a time against 'encrypt_many' and 'decrypt_many'
+with an increasing amount of processes. tests/test_batch.py checks
+both give the same output
+
+Usage:
+    python benchmarks/batch.py [records] [record size]
+'''
+
+import os
+import sys
+import time
+from multiprocessing import cpu_count
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, WorkerPool, encrypt_many, decrypt_many
+
+
+def records_per_second(function, count:int) -> float:
+    start = time.perf_counter()
+    function()
+    return count/(time.perf_counter() - start)
+
+
+def main(count:int, size:int):
+    key = "benchmark key"
+    records = [f"{record:0{size}d}" for record in range(count)]
+    cipher = Cipher(key)
+
+    encrypted_records = [cipher.encrypt(record, processes=1) for record in records]
+
+    print(f"{count} records of {size} characters, {cpu_count()} cores")
+    print(f"{'mode':>16} {'encrypt/s':>10} {'decrypt/s':>10}")
+    encrypting = records_per_second(lambda: [cipher.encrypt(record, processes=1) for record in records], count)
+    decrypting = records_per_second(lambda: [cipher.decrypt(record, processes=1) for record in encrypted_records], count)
+    print(f"{'one per call':>16} {encrypting:>10.0f} {decrypting:>10.0f}")
+
+    processes = 1
+    while processes <= cpu_count():
+        with WorkerPool(processes) as pool:
+            encrypting = records_per_second(lambda: encrypt_many(key, records, processes, pool=pool), count)
+            decrypting = records_per_second(lambda: decrypt_many(key, encrypted_records, processes, pool=pool), count)
+        print(f"{f'many, {processes} procs':>16} {encrypting:>10.0f} {decrypting:>10.0f}")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 32,
+    )
@@ -0,0 +1,47 @@
+'''
+Compares encrypting bytes in format version 2, where they're encrypted
+as they are, against format version 1, where 'convert_data' first tries
+decoding them and checks each attempt with a full encrypt and decrypt,
+falling back to base64 for binary data
+
+Usage:
+    python benchmarks/bytes_mode.py [size in MB] [processes]
+'''
+
+import os
+import sys
+import time
+from multiprocessing import cpu_count
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import encrypt, decrypt
+
+
+def main(size:int, processes:int):
+    key = "benchmark key"
+    payloads = {
+        "text": (b"The quick brown fox jumps over the lazy dog\n"*(size//44+1))[:size],
+        "binary": os.urandom(size),
+    }
+
+    print(f"{processes} processes, {size/1e6:.1f} MB")
+    print(f"{'payload':>8} {'version':>8} {'output MB':>10} {'encrypt s':>10} {'decrypt s':>10}")
+    for name, data in payloads.items():
+        for version in (1, 2):
+            start = time.perf_counter()
+            encrypted_data = encrypt(key, data, processes=processes, format_version=version)
+            encrypt_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decrypt(key, encrypted_data, processes=processes)
+            decrypt_time = time.perf_counter() - start
+
+            print(f"{name:>8} {version:>8} {len(encrypted_data)/1e6:>10.2f} {encrypt_time:>10.2f} {decrypt_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(float(sys.argv[1])*1e6) if len(sys.argv) > 1 else 4_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else cpu_count(),
+    )
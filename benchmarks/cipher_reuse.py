@@ -0,0 +1,50 @@
+'''
+Compares records per second of calling 'encrypt' and 'decrypt' for every
+record against reusing one 'Cipher' for all of them, which derives the key
+once and keeps the keystream it generates. tests/test_cipher.py checks
+both give the same output
+
+Usage:
+    python benchmarks/cipher_reuse.py [records] [record size]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, encrypt, decrypt
+
+
+def records_per_second(function, records:list) -> float:
+    start = time.perf_counter()
+    for record in records:
+        function(record)
+    return len(records)/(time.perf_counter() - start)
+
+
+def main(count:int, size:int):
+    key = "benchmark key"
+    records = [f"{record:0{size}d}" for record in range(count)]
+    cipher = Cipher(key)
+
+    print(f"{count} records of {size} characters")
+    print(f"{'format':>7} {'mode':>9} {'functions/s':>12} {'Cipher/s':>10} {'speedup':>8}")
+    for version in (1, 2):
+        encrypted_records = [encrypt(key, record, processes=1, format_version=version) for record in records]
+
+        functions = records_per_second(lambda record: encrypt(key, record, processes=1, format_version=version), records)
+        cached = records_per_second(lambda record: cipher.encrypt(record, processes=1, format_version=version), records)
+        print(f"{version:>7} {'encrypt':>9} {functions:>12.0f} {cached:>10.0f} {cached/functions:>7.1f}x")
+
+        functions = records_per_second(lambda record: decrypt(key, record, processes=1), encrypted_records)
+        cached = records_per_second(lambda record: cipher.decrypt(record, processes=1), encrypted_records)
+        print(f"{version:>7} {'decrypt':>9} {functions:>12.0f} {cached:>10.0f} {cached/functions:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
@@ -0,0 +1,73 @@
+'''
+Compares the throughput of waiting for the worker processes by polling
+'is_alive()' in a loop (how 'encrypt' and 'decrypt' used to wait)
+against blocking until the workers send their results, with as many
+processes as CPU cores so the main process competes with its workers
+
+Usage:
+    python benchmarks/completion.py [size in MB] [processes]
+'''
+
+import os
+import sys
+import time
+from multiprocessing import Manager, Process, cpu_count
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Keystream
+from listcrypt.listcrypt import _run_tasks, _cipher_task
+
+
+def polling_worker(task:tuple, segment:int, shared_dictionary:dict):
+    shared_dictionary[segment] = _cipher_task(task)
+
+
+def polling(tasks:list) -> list:
+    '''
+    Starts a process per task and spins on 'is_alive()' until they finish
+    '''
+    shared_dictionary = Manager().dict()
+    still_alive = []
+    for segment, task in enumerate(tasks[1:], 1):
+        p = Process(target=polling_worker, args=(task, segment, shared_dictionary))
+        p.start()
+        still_alive.append(p)
+
+    polling_worker(tasks[0], 0, shared_dictionary)
+
+    while still_alive:
+        removal = [item for item in still_alive if not item.is_alive()]
+        [still_alive.remove(item) for item in removal]
+
+    return [shared_dictionary[segment] for segment in range(len(tasks))]
+
+
+def blocking(tasks:list) -> list:
+    return _run_tasks(_cipher_task, tasks, None, None)
+
+
+def main(size:int, processes:int):
+    data = ("0123456789abcdef"*(size//16+1))[:size]
+    segment_length = size//processes
+    keystream = Keystream("benchmark key")
+    tasks = [
+        (keystream.read(start, segment_length), data[start:start+segment_length].encode(), 'B', 'B', 130, False, 'python')
+        for start in range(0, segment_length*processes, segment_length)
+    ]
+
+    print(f"{processes} processes, {size/1e6:.1f} MB")
+    for name, function in (("polling", polling), ("blocking", blocking)):
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            function(tasks)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>9}: {size/best/1e6:.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main(
+        int(float(sys.argv[1])*1e6) if len(sys.argv) > 1 else 8_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else cpu_count(),
+    )
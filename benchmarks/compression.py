@@ -0,0 +1,124 @@
+'''
+Compares the end to end time and bytes written of 'encrypt' and 'decrypt'
+with each compression against none, on corpora like the payloads
+ListCrypt usually sees: prose, JSON records, logs and CSV, along with
+random bytes that don't compress and are left uncompressed. Also
+streams each corpus through 'encrypt_stream' and 'decrypt_stream'.
+The round trips are checked in tests/test_compression.py
+
+Usage:
+    python benchmarks/compression.py [size in MB]
+'''
+
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import COMPRESSIONS, Cipher, decrypt_stream, encrypt_stream, read_header
+
+KEY = "benchmark key"
+SEED = 39
+WORDS = (
+    "the of and to in is that it was for on are as with his they at be this from have or by one had "
+    "not but what all were when we there can an your which their said if do will each about how up out "
+    "them then she many some so these would other into has more her two like him see time could no make"
+).split()
+
+
+def prose(generator:random.Random, size:int) -> str:
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = " ".join(generator.choices(WORDS, k=generator.randrange(6, 20))).capitalize()+". "
+        sentences.append(sentence)
+        length += len(sentence)
+    return "".join(sentences)[:size]
+
+
+def json_records(generator:random.Random, size:int) -> str:
+    records = []
+    length = 0
+    while length < size:
+        record = json.dumps({
+            "id": len(records),
+            "name": " ".join(generator.choices(WORDS, k=2)),
+            "score": round(generator.random()*100, 2),
+            "tags": generator.sample(WORDS, 3),
+            "active": generator.random() < 0.5,
+        })
+        records.append(record)
+        length += len(record)+2
+    return "["+",\n".join(records)+"]"
+
+
+def logs(generator:random.Random, size:int) -> bytes:
+    lines = []
+    length = 0
+    while length < size:
+        line = (
+            f"2024-05-{generator.randrange(1, 29):02} {generator.randrange(24):02}:{generator.randrange(60):02}:"
+            f"{generator.randrange(60):02} {generator.choice(('INFO', 'INFO', 'DEBUG', 'WARNING', 'ERROR'))} "
+            f"worker-{generator.randrange(16)} request {generator.getrandbits(32):08x} took {generator.randrange(1, 900)}ms\n"
+        )
+        lines.append(line)
+        length += len(line)
+    return "".join(lines).encode()
+
+
+def csv(generator:random.Random, size:int) -> bytes:
+    rows = ["time,sensor,temperature,humidity\n"]
+    length = len(rows[0])
+    while length < size:
+        row = f"{1700000000+len(rows)},{generator.randrange(64)},{generator.gauss(21, 3):.2f},{generator.uniform(20, 80):.1f}\n"
+        rows.append(row)
+        length += len(row)
+    return "".join(rows).encode()
+
+
+def corpora(size:int) -> dict:
+    generator = random.Random(SEED)
+    return {
+        "prose (str)": prose(generator, size),
+        "json (str)": json_records(generator, size),
+        "logs (bytes)": logs(generator, size),
+        "csv (bytes)": csv(generator, size),
+        "random (bytes)": generator.randbytes(size),
+    }
+
+
+def seconds(function:'callable') -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(size:int):
+    cipher = Cipher(KEY)
+    compressions = [None, *COMPRESSIONS]
+    print(f"{'corpus':>16} {'compression':>12} {'written':>10} {'ratio':>7} {'encrypt ms':>11} {'decrypt ms':>11} "
+          f"{'stream written':>15} {'stream ms':>10}")
+    for name, data in corpora(size).items():
+        for compression in compressions:
+            encrypt_time, encrypted_data = seconds(lambda: cipher.encrypt(data, compression=compression))
+            decrypt_time, _ = seconds(lambda: cipher.decrypt(encrypted_data))
+
+            source = data.encode() if type(data) == str else data
+            stream = io.BytesIO()
+            decrypted_stream = io.BytesIO()
+            encrypt_stream_time, _ = seconds(lambda: encrypt_stream(cipher, io.BytesIO(source), stream, compression=compression))
+            stream.seek(0)
+            decrypt_stream_time, _ = seconds(lambda: decrypt_stream(cipher, stream, decrypted_stream))
+
+            used = read_header(encrypted_data)["compression"] or "none"
+            print(f"{name:>16} {used:>12} {len(encrypted_data):>10} {len(source)/len(encrypted_data):>7.2f} "
+                  f"{encrypt_time*1e3:>11.1f} {decrypt_time*1e3:>11.1f} {len(stream.getvalue()):>15} "
+                  f"{(encrypt_stream_time+decrypt_stream_time)*1e3:>10.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])*(1 << 20)) if len(sys.argv) > 1 else 4 << 20)
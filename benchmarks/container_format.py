@@ -0,0 +1,50 @@
+'''
+Compares format version 1 against format version 2 for the size of the
+encrypted output, the time 'pull_metadata' takes to find the metadata and
+the time a full 'decrypt' takes
+
+Usage:
+    python benchmarks/container_format.py [size in MB]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import encrypt, decrypt, pull_metadata, sha256
+
+
+def best_time(function, repeat=3) -> float:
+    '''
+    Runs the function 'repeat' times and returns the fastest run in seconds
+    '''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(size:int):
+    key = "benchmark key"
+    payloads = {
+        "ascii": ("0123456789abcdef"*(size//16+1))[:size],
+        "latin-1": ("héllo wörld "*(size//12+1))[:size],
+        "bytes": os.urandom(size*3//4),
+    }
+
+    print(f"{'payload':>8} {'version':>8} {'size MB':>8} {'metadata ms':>12} {'decrypt s':>10}")
+    for name, data in payloads.items():
+        for version in (1, 2):
+            encrypted_data = encrypt(key, data, processes=1, format_version=version)
+
+            metadata_time = best_time(lambda: pull_metadata(sha256(key), encrypted_data))
+            decrypt_time = best_time(lambda: decrypt(key, encrypted_data, processes=1), repeat=1)
+            print(f"{name:>8} {version:>8} {len(encrypted_data)/1e6:>8.2f} {metadata_time*1e3:>12.3f} {decrypt_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])*1e6) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,54 @@
+'''
+Compares the 'python' and 'numpy' engines of 'cipher_segment' across
+payload sizes, tests/test_engines.py checks both produce identical output
+
+Usage:
+    python benchmarks/engines.py
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Keystream, cipher_segment, range_finder, numpy_available
+
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def best_time(function, repeat=3) -> float:
+    '''
+    Runs the function 'repeat' times and returns the fastest run in seconds
+    '''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    if not numpy_available():
+        print("NumPy isn't installed, only the 'python' engine can be benchmarked")
+
+    print(f"{'size':>12} {'python MB/s':>12} {'numpy MB/s':>12} {'speedup':>9}")
+    for size in SIZES:
+        data = (os.urandom(size // 2).hex() + "ünïcödé ")[:size]
+        key = Keystream("benchmark key").read(0, len(data))
+        max_range = range_finder(data)
+
+        python_time = best_time(lambda: cipher_segment(key, data, max_range, engine='python'))
+        row = f"{size:>12} {size/python_time/1e6:>12.2f}"
+
+        if numpy_available():
+            numpy_time = best_time(lambda: cipher_segment(key, data, max_range, engine='numpy'))
+            row += f" {size/numpy_time/1e6:>12.2f} {python_time/numpy_time:>8.1f}x"
+
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
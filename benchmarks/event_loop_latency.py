@@ -0,0 +1,83 @@
+'''
+Measures how late the event loop wakes a 1 ms heartbeat while large
+payloads are encrypted, calling 'encrypt' straight from a coroutine
+against awaiting 'encrypt_async' on its default process executor and
+on a thread pool executor
+
+Usage:
+    python benchmarks/event_loop_latency.py [size in MB] [payloads]
+'''
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import encrypt, encrypt_async
+
+HEARTBEAT = 0.001
+
+
+async def heartbeat(lateness:list):
+    '''
+    Records how much later than asked the loop wakes it each time
+    '''
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        lateness.append(time.perf_counter() - start - HEARTBEAT)
+
+
+async def measure(work:'coroutine function') -> dict:
+    lateness = []
+    beating = asyncio.create_task(heartbeat(lateness))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await work()
+    seconds = time.perf_counter() - start
+    # Lets the heartbeat record the wake up it was late for
+    await asyncio.sleep(0.05)
+    beating.cancel()
+
+    lateness.sort()
+    return {
+        "seconds": seconds,
+        "p50": lateness[len(lateness)//2],
+        "p99": lateness[int(len(lateness)*.99)],
+        "max": lateness[-1],
+    }
+
+
+async def main(size:int, count:int):
+    key = "benchmark key"
+    payloads = [os.urandom(size) for _ in range(count)]
+
+    async def blocking():
+        for payload in payloads:
+            encrypt(key, payload, processes=1)
+
+    async def processes():
+        await asyncio.gather(*[encrypt_async(key, payload) for payload in payloads])
+
+    # Starts the default executor's processes before measuring
+    await encrypt_async(key, b"")
+
+    with ThreadPoolExecutor(os.cpu_count()) as executor:
+        async def threads():
+            await asyncio.gather(*[encrypt_async(key, payload, executor=executor) for payload in payloads])
+
+        print(f"{count} payloads of {size/1e6:.1f} MB, heartbeat lateness in ms")
+        print(f"{'mode':>10} {'seconds':>8} {'p50':>8} {'p99':>8} {'max':>8}")
+        for name, work in (("blocking", blocking), ("default", processes), ("threads", threads)):
+            result = await measure(work)
+            print(f"{name:>10} {result['seconds']:>8.2f} {result['p50']*1e3:>8.2f} {result['p99']*1e3:>8.2f} {result['max']*1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(float(sys.argv[1])*1e6) if len(sys.argv) > 1 else 4_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    ))
@@ -0,0 +1,83 @@
+'''
+Measures the peak memory and throughput of 'encrypt_file' and
+'decrypt_file' with and without a 'chunk_size'. That the peak memory
+of streaming stays flat is checked by tests/test_file_streaming.py
+
+Each run happens in a fresh interpreter so the peak RSS
+of one run doesn't carry over into the next
+
+Usage:
+    python benchmarks/file_streaming.py [size in MB ...]
+'''
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SOURCE)
+
+SIZES_MB = [4, 16, 64]
+CHUNK_SIZE = 1 << 20
+
+
+def run(mode:str, path:str, chunk_size:int) -> dict:
+    '''
+    Runs 'mode' ('encrypt' or 'decrypt') on the file in a new
+    interpreter, returning its peak RSS in MB and the seconds taken
+    '''
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', mode, path, str(chunk_size)],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return {"rss": float(output[0]), "seconds": float(output[1])}
+
+
+def child(mode:str, path:str, chunk_size:int):
+    '''
+    Runs inside the new interpreter
+    '''
+    import resource
+    from listcrypt import encrypt_file, decrypt_file
+
+    start = time.perf_counter()
+    if mode == 'encrypt':
+        encrypt_file("benchmark key", path, metadata_removal=False, chunk_size=chunk_size or None)
+    else:
+        decrypt_file("benchmark key", path, chunk_size=chunk_size or None)
+    seconds = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024, seconds)
+
+
+def main(sizes:list):
+    streaming_rss = []
+    print(f"{'size MB':>8} {'mode':>9} {'chunked':>8} {'peak RSS MB':>12} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"{size}.bin")
+            line = b"The quick brown fox jumps over the lazy dog 0123456789\n"
+
+            for chunk_size in (0, CHUNK_SIZE):
+                with open(path, "wb") as file:
+                    for _ in range(size*(1 << 20)//len(line)):
+                        file.write(line)
+
+                for mode in ('encrypt', 'decrypt'):
+                    result = run(mode, path, chunk_size)
+                    print(f"{size:>8} {mode:>9} {str(bool(chunk_size)):>8} {result['rss']:>12.1f} {size/result['seconds']:>8.2f}")
+                    if chunk_size:
+                        streaming_rss.append(result['rss'])
+
+    growth = max(streaming_rss) - min(streaming_rss)
+    print(f"\nstreaming peak RSS grew by {growth:.1f} MB across {sizes[0]}-{sizes[-1]} MB files")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main([int(size) for size in sys.argv[1:]] or SIZES_MB)
@@ -0,0 +1,138 @@
+'''
+Compares the time and peak memory of 'remove_image_exif', which copies
+every segment but the metadata, against the previous implementation that
+decoded every pixel with Pillow and saved the image again. Also times
+skipping a large file that isn't an image. What's removed and kept is
+checked by tests/test_image_metadata.py
+
+The previous implementation only runs when Pillow is installed. Without
+it the images are built by hand, with random bytes for the compressed
+pixels, since only their containers are read
+
+Usage:
+    python benchmarks/image_metadata.py [megapixels]
+'''
+
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import remove_image_exif
+
+EXIF = b"Exif\x00\x00"+os.urandom(60_000)
+
+
+def pillow_remove_image_exif(path:str) -> bool:
+    '''
+    'remove_image_exif' before it stopped decoding the pixels
+    '''
+    try:
+        from PIL import Image
+        image = Image.open(path)
+        data = list(image.getdata())
+        image_without_exif = Image.new(image.mode, image.size)
+        image_without_exif.putdata(data)
+        image_without_exif.save(path)
+
+        return True
+    except Exception:
+        return False
+
+
+def jpeg_segment(marker:int, payload:bytes) -> bytes:
+    return bytes([0xFF, marker])+struct.pack(">H", len(payload)+2)+payload
+
+
+def png_chunk(chunk_type:bytes, data:bytes) -> bytes:
+    return struct.pack(">I", len(data))+chunk_type+data+struct.pack(">I", zlib.crc32(chunk_type+data))
+
+
+def pillow_images(megapixels:int) -> dict:
+    from PIL import Image
+
+    width = int((megapixels*1e6*3/2)**0.5)
+    image = Image.frombytes("RGB", (width, width*2//3), os.urandom(width*(width*2//3)*3))
+    exif = Image.Exif()
+    # The make, model and software tags
+    exif.update({0x010F: "Camera", 0x0110: "Model", 0x0131: "Software"*1000})
+
+    images = {}
+    for name, options in (("jpeg", {"format": "JPEG", "quality": 90}), ("png", {"format": "PNG"})):
+        file = io.BytesIO()
+        image.save(file, exif=exif, **options)
+        images[name] = file.getvalue()
+    return images
+
+
+def handmade_images(megapixels:int) -> dict:
+    # Roughly the size a photo compresses to, with no 0xFF in the
+    # compressed data the way real encoders escape it
+    pixels = os.urandom(megapixels*(1 << 18)).replace(b"\xff", b"\x00")
+    jpeg = (
+        b"\xff\xd8"
+        + jpeg_segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+        + jpeg_segment(0xE1, EXIF)
+        + jpeg_segment(0xDB, bytes(65))
+        + jpeg_segment(0xC0, bytes(15))
+        + jpeg_segment(0xDA, bytes(10))
+        + pixels
+        + b"\xff\xd9"
+    )
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + png_chunk(b"IHDR", struct.pack(">IIBBBBB", 6000, 4000, 8, 2, 0, 0, 0))
+        + png_chunk(b"eXIf", EXIF[6:])
+        + png_chunk(b"tEXt", b"Software\x00listcrypt")
+        + b"".join(png_chunk(b"IDAT", pixels[start:start+(1 << 16)]) for start in range(0, len(pixels), 1 << 16))
+        + png_chunk(b"IEND", b"")
+    )
+    return {"jpeg": jpeg, "png": png}
+
+
+def measure(function:'callable', path:str) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(path)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main(megapixels:int):
+    try:
+        images = pillow_images(megapixels)
+        implementations = {"pixel free": remove_image_exif, "pillow": pillow_remove_image_exif}
+    except ImportError:
+        print("Pillow isn't installed, only timing the pixel free version on handmade images")
+        images = handmade_images(megapixels)
+        implementations = {"pixel free": remove_image_exif}
+
+    print(f"{'image':>8} {'implementation':>16} {'seconds':>10} {'peak MB':>10} {'size before':>12} {'size after':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, image in images.items():
+            for implementation, function in implementations.items():
+                path = os.path.join(directory, f"image.{name}")
+                with open(path, "wb") as file:
+                    file.write(image)
+
+                _, seconds, peak = measure(function, path)
+                print(f"{name:>8} {implementation:>16} {seconds:>10.4f} {peak/1e6:>10.2f} {len(image):>12} {os.path.getsize(path):>12}")
+
+        path = os.path.join(directory, "archive.bin")
+        with open(path, "wb") as file:
+            for _ in range(64):
+                file.write(os.urandom(1 << 20))
+        _, seconds, peak = measure(remove_image_exif, path)
+        print(f"{'64 MB':>8} {'not an image':>16} {seconds:>10.6f} {peak/1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 24)
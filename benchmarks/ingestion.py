@@ -0,0 +1,74 @@
+'''
+Measures the peak memory 'encrypt' allocates with tracemalloc, as a
+multiple of the payload's size, and the seconds it takes for bytes,
+ascii and non-ascii str and literal payloads. tests/test_ingestion.py
+checks the peak stays close to 2x
+
+Usage:
+    python benchmarks/ingestion.py [size in MB]
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, numpy_available, serialize_literal
+
+KEY = "benchmark key"
+SEED = 39
+
+
+def payloads(size:int) -> dict:
+    generator = random.Random(SEED)
+    return {
+        "bytes": generator.randbytes(size),
+        "ascii str": "".join(generator.choices("abcdefghijklmnopqrstuvwxyz ", k=size)),
+        "non-ascii str": "".join(generator.choices("abcdéfghijklmnopqrstuvwxyz 日本", k=size//4)),
+        "literal": [generator.randrange(1 << 40) for _ in range(size//8)],
+    }
+
+
+def payload_size(data:'any data type') -> int:
+    '''
+    The bytes the payload takes once it's in the form that's encrypted
+    '''
+    if type(data) == bytes:
+        return len(data)
+    if type(data) == str:
+        return len(data)*(1 if data.isascii() else 4)
+    return len(serialize_literal(data))
+
+
+def peak(function:'callable') -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("size", nargs="?", type=float, default=64)
+    arguments = parser.parse_args()
+
+    cipher = Cipher(KEY, cache_size=0)
+    engines = ['python'] + (['numpy'] if numpy_available() else [])
+    print(f"{'payload':>14} {'engine':>7} {'size MB':>9} {'peak MB':>9} {'peak/size':>10} {'seconds':>9}")
+    for name, data in payloads(int(arguments.size*(1 << 20))).items():
+        size = payload_size(data)
+        for engine in engines:
+            _, peak_size, seconds = peak(lambda: cipher.encrypt(data, processes=1, engine=engine))
+            ratio = peak_size/size
+            print(f"{name:>14} {engine:>7} {size/1e6:>9.1f} {peak_size/1e6:>9.1f} {ratio:>10.2f} {seconds:>9.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+'''
+Prints where the time goes when encrypting and decrypting, stage by
+stage, using a 'Stats', and how little leaving 'stats' out costs by
+timing a short record with and without the checks for it.
+tests/test_stats.py checks what a Stats collects
+
+Usage:
+    python benchmarks/instrumentation.py [size in MB] [processes]
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, Stats, decrypt_file, encrypt_file
+
+CALLS = 20_000
+
+
+def seconds_per_call(function, calls:int) -> float:
+    return min(timeit.repeat(function, number=calls, repeat=5))/calls
+
+
+def print_stats(title:str, stats:Stats):
+    stats = stats.as_dict()
+    print(f"\n{title}")
+    for stage, seconds in sorted(stats["stages"].items(), key=lambda stage: -stage[1]):
+        print(f"{stage:>16} {seconds*1e3:>10.2f} ms {seconds/stats['seconds']:>6.1%}")
+    print(f"{'bytes processed':>16} {stats['bytes_processed']:>10}")
+    print(f"{'peak segment':>16} {stats['peak_segment']:>10}")
+    print(f"{'cipher MB/s':>16} {stats['throughput']/1e6:>10.2f}")
+
+
+def main(size:int, processes:int):
+    cipher = Cipher("benchmark key")
+    record = "a short record"
+    encrypted_record = cipher.encrypt(record, processes=1)
+
+    # Every stage of a call on one process, each checking for a Stats
+    checks = "\n".join(["if stats is not None: pass"]*12)
+    disabled = timeit.timeit(checks, globals={"stats": None}, number=CALLS)/CALLS
+    encrypting = seconds_per_call(lambda: cipher.encrypt(record, processes=1), CALLS)
+    decrypting = seconds_per_call(lambda: cipher.decrypt(encrypted_record, processes=1), CALLS)
+    enabled = seconds_per_call(lambda: cipher.encrypt(record, processes=1, stats=Stats()), CALLS)
+    print(f"{'disabled checks':>16} {disabled*1e6:>8.3f} us per call")
+    print(f"{'encrypt':>16} {encrypting*1e6:>8.3f} us per call, {disabled/encrypting:.2%} spent checking")
+    print(f"{'decrypt':>16} {decrypting*1e6:>8.3f} us per call, {disabled/decrypting:.2%} spent checking")
+    print(f"{'with stats':>16} {enabled*1e6:>8.3f} us per encrypt")
+
+    data = os.urandom(size << 20)
+    stats = Stats()
+    encrypted_data = cipher.encrypt(data, processes=processes, stats=stats)
+    print_stats(f"encrypt {size} MB of bytes, {processes} processes", stats)
+
+    progress = []
+    stats = Stats(lambda event: progress.append(event) if event["event"] == "progress" else None)
+    cipher.decrypt(encrypted_data, processes=processes, stats=stats)
+    print_stats(f"decrypt {size} MB of bytes, {processes} processes", stats)
+    print(f"{'progress events':>16} {len(progress):>10}")
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instrumentation.tmp")
+    with open(path, "wb") as file:
+        file.write(data)
+    try:
+        for options in ({"chunk_size": 1 << 20}, {"memory_map": True}):
+            progress = []
+            stats = Stats(lambda event: progress.append(event) if event["event"] == "progress" else None)
+            encrypt_file("benchmark key", path, metadata_removal=False, stats=stats, **options)
+            decrypt_file("benchmark key", path, stats=stats, **options)
+            print_stats(f"encrypt_file and decrypt_file {size} MB, {options}", stats)
+            print(f"{'progress events':>16} {len(progress):>10}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count(),
+    )
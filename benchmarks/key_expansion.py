@@ -0,0 +1,56 @@
+'''
+Measures how key expansion scales with the amount of processes now that
+each worker generates the keystream of its own range. For every process
+count it times generating the whole keystream in one process, generating
+it split across a pool's workers the way 'encrypt' does, and 'encrypt'
+end to end. tests/test_keystream.py checks the output is identical to
+the serial keystream for every process count
+
+Usage:
+    python benchmarks/key_expansion.py [size in MB] [processes ...]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Keystream, WorkerPool, cpu_count, encrypt, segment_ranges
+
+KEY = "benchmark key"
+
+
+def expand_range(task:tuple) -> int:
+    '''
+    Generates one range of the keystream the way a worker does
+    '''
+    start, stop = task
+    return len(Keystream(KEY).read(start, stop-start))
+
+
+def seconds(function:'callable') -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(size:int, process_counts:list):
+    data = os.urandom(size)
+    serial_time, _ = seconds(lambda: Keystream(KEY).read(0, size))
+
+    print(f"{size/1e6:.1f} MB, {cpu_count()} cores")
+    print(f"{'processes':>9} {'serial key s':>13} {'worker key s':>13} {'key speedup':>12} {'encrypt s':>10}")
+    for processes in process_counts:
+        with WorkerPool(processes) as pool:
+            ranges = segment_ranges(size, processes)
+            worker_time, _ = seconds(lambda: list(pool.imap(expand_range, ranges)))
+
+            encrypt_time, _ = seconds(lambda: encrypt(KEY, data, processes=processes, engine='python'))
+
+        print(f"{processes:>9} {serial_time:>13.3f} {worker_time:>13.3f} {serial_time/worker_time:>11.2f}x {encrypt_time:>10.3f}", flush=True)
+
+
+if __name__ == "__main__":
+    size = int(float(sys.argv[1])*(1 << 20)) if len(sys.argv) > 1 else 64 << 20
+    main(size, [int(processes) for processes in sys.argv[2:]] or list(range(1, cpu_count()+1)))
@@ -0,0 +1,72 @@
+'''
+Compares 'serialize_literal' and 'deserialize_literal' against the
+previous way literals were converted, 'str' and 'ast.literal_eval', on
+large lists of numbers, records and nested structures. Times each
+conversion on its own and 'encrypt' and 'decrypt' end to end, along
+with the bytes written. The round trips and corrupted data are checked
+in tests/test_literals.py
+
+Usage:
+    python benchmarks/literals.py [items]
+'''
+
+import ast
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, deserialize_literal, serialize_literal
+
+KEY = "benchmark key"
+SEED = 39
+
+
+def literals(items:int) -> dict:
+    generator = random.Random(SEED)
+
+    def tree(depth:int) -> dict:
+        if depth == 0:
+            return [generator.randrange(1000) for _ in range(8)]
+        return {f"node {index}": tree(depth-1) for index in range(4)}
+
+    return {
+        "ints": [generator.randrange(-1 << 40, 1 << 40) for _ in range(items)],
+        "floats": [generator.random()*1000 for _ in range(items)],
+        "records": [
+            {"id": index, "name": f"user {index}", "score": generator.random(), "tags": ["a", "b"], "active": index%2 == 0}
+            for index in range(items//10)
+        ],
+        "nested": tree(max(1, (items//8).bit_length()//2)),
+        "mixed tuple": tuple((index, str(index), None, b"x") for index in range(items//10)),
+    }
+
+
+def seconds(function:'callable') -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(items:int):
+    cipher = Cipher(KEY)
+    print(f"{'literal':>12} {'way':>8} {'bytes':>10} {'to ms':>9} {'from ms':>9} {'encrypt ms':>11} {'decrypt ms':>11} {'written':>10}")
+    for name, data in literals(items).items():
+        ways = {
+            "ast": (str, ast.literal_eval, lambda: cipher.encrypt(str(data)), lambda encrypted_data: ast.literal_eval(cipher.decrypt(encrypted_data))),
+            "literal": (serialize_literal, deserialize_literal, lambda: cipher.encrypt(data), cipher.decrypt),
+        }
+        for way, (to_data, from_data, encrypt, decrypt) in ways.items():
+            to_time, converted_data = seconds(lambda: to_data(data))
+            from_time, _ = seconds(lambda: from_data(converted_data))
+            encrypt_time, encrypted_data = seconds(encrypt)
+            decrypt_time, _ = seconds(lambda: decrypt(encrypted_data))
+
+            print(f"{name:>12} {way:>8} {len(converted_data):>10} {to_time*1e3:>9.1f} {from_time*1e3:>9.1f} "
+                  f"{encrypt_time*1e3:>11.1f} {decrypt_time*1e3:>11.1f} {len(encrypted_data):>10}", flush=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,96 @@
+'''
+Compares the throughput and peak memory of 'encrypt_file' and
+'decrypt_file' reading the whole file, streaming it with a 'chunk_size'
+and memory mapping it with 'memory_map'. tests/test_memory_map.py
+checks each mode round trips
+
+Each run happens in a fresh interpreter so the peak RSS
+of one run doesn't carry over into the next
+
+Usage:
+    python benchmarks/memory_map.py [size in MB ...]
+'''
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SOURCE)
+
+SIZES_MB = [10, 100, 500]
+CHUNK_SIZE = 1 << 22
+MODES = {
+    "whole": {},
+    "streamed": {"chunk_size": CHUNK_SIZE},
+    "mapped": {"memory_map": True},
+}
+
+
+def run(operation:str, mode:str, path:str) -> dict:
+    '''
+    Runs 'operation' ('encrypt' or 'decrypt') on the file in a new
+    interpreter, returning its peak RSS in MB and the seconds taken,
+    or None if it didn't finish (reading whole files can run out of memory)
+    '''
+    process = subprocess.run(
+        [sys.executable, __file__, '--child', operation, mode, path],
+        capture_output=True, text=True,
+    )
+    if process.returncode:
+        return None
+    output = process.stdout.split()
+    return {"rss": float(output[0]), "seconds": float(output[1])}
+
+
+def child(operation:str, mode:str, path:str):
+    '''
+    Runs inside the new interpreter
+    '''
+    import resource
+    from listcrypt import encrypt_file, decrypt_file
+
+    start = time.perf_counter()
+    if operation == 'encrypt':
+        encrypt_file("benchmark key", path, metadata_removal=False, **MODES[mode])
+    else:
+        decrypt_file("benchmark key", path, **MODES[mode])
+    seconds = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024, seconds)
+
+
+def write_file(path:str, size:int):
+    '''
+    Writes 'size' MB of binary data to the file a MB at a time,
+    the peak RSS of this process carries over into the children
+    '''
+    block = os.urandom(1 << 20)
+    with open(path, "wb") as file:
+        for _ in range(size):
+            file.write(block)
+
+
+def main(sizes:list):
+    print(f"{'size MB':>8} {'mode':>9} {'operation':>10} {'peak RSS MB':>12} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"{size}.bin")
+            for mode in MODES:
+                write_file(path, size)
+                for operation in ('encrypt', 'decrypt'):
+                    result = run(operation, mode, path)
+                    if result is None:
+                        print(f"{size:>8} {mode:>9} {operation:>10} {'failed':>12}")
+                        break
+                    print(f"{size:>8} {mode:>9} {operation:>10} {result['rss']:>12.1f} {size/result['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        main([int(size) for size in sys.argv[1:]] or SIZES_MB)
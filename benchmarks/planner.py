@@ -0,0 +1,89 @@
+'''
+Compares letting 'plan_execution' pick the engine and amount of
+processes ('auto') against every fixed choice, across payload sizes,
+and checks 'auto' is never meaningfully slower than the best of them.
+tests/test_planner.py checks the plans themselves
+
+Usage:
+    python benchmarks/planner.py [size ...] [--tolerance 0.1]
+
+Exits with status 1 if 'auto' is more than 'tolerance' slower than
+the fastest fixed choice for any size
+'''
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, calibrate, cpu_count, numpy_available, plan_execution
+
+SIZES = ["10", "1K", "64K", "1M", "8M"]
+# Differences smaller than this are timer noise rather than a worse plan
+MIN_SECONDS = 20e-6
+
+
+def parse_size(size:str) -> int:
+    units = {'K': 1 << 10, 'M': 1 << 20}
+    if size[-1].upper() in units:
+        return int(float(size[:-1])*units[size[-1].upper()])
+    return int(size)
+
+
+def round_trip_seconds(cipher:Cipher, data:bytes, processes:'int or str', engine:str) -> float:
+    def round_trip():
+        cipher.decrypt(cipher.encrypt(data, processes=processes, engine=engine), processes=processes, engine=engine)
+
+    number = max(1, min(1000, (1 << 20)//max(len(data), 1)))
+    return timeit.timeit(round_trip, number=number)/number
+
+
+def fastest(cipher:Cipher, data:bytes, choices:list, rounds=5) -> dict:
+    '''
+    The fewest seconds of each choice, timing every choice once per
+    round so changes in the machine's load affect them all alike
+    '''
+    seconds = {choice: [] for choice in choices}
+    for _ in range(rounds):
+        for choice in choices:
+            seconds[choice].append(round_trip_seconds(cipher, data, *choice))
+    return {choice: min(times) for choice, times in seconds.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", default=SIZES)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    print(calibrate())
+    engines = ['python'] + (['numpy'] if numpy_available() else [])
+    choices = [(processes, engine) for processes in sorted({1, max(cpu_count(), 2)}) for engine in engines]
+    cipher = Cipher("benchmark key")
+
+    slower = []
+    print(f"{'size':>10} {'plan':>24} {'auto ms':>10} {'best fixed':>16} {'best ms':>10} {'ratio':>7}")
+    for size in map(parse_size, arguments.sizes):
+        data = os.urandom(size)
+        fixed = fastest(cipher, data, choices)
+        best = min(fixed, key=fixed.get)
+        # The best of several choices is biased towards whichever got the
+        # luckiest timings, so 'auto' is timed again against it alone
+        fixed = fastest(cipher, data, [best, ('auto', 'auto')])
+        automatic = fixed.pop(('auto', 'auto'))
+        plan = plan_execution(size+2)
+
+        ratio = automatic/fixed[best]
+        if automatic-fixed[best] > max(MIN_SECONDS, arguments.tolerance*fixed[best]):
+            slower.append(size)
+        print(f"{size:>10} {plan['strategy']+' '+plan['engine']+' '+str(plan['processes']):>24} {automatic*1e3:>10.3f} "
+              f"{str(best[0])+' '+best[1]:>16} {fixed[best]*1e3:>10.3f} {ratio:>7.2f}", flush=True)
+
+    if slower:
+        sys.exit(f"'auto' was more than {arguments.tolerance:.0%} slower than a fixed choice for sizes {slower}")
+
+
+if __name__ == "__main__":
+    main()
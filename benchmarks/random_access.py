@@ -0,0 +1,47 @@
+'''
+Times decrypting 4 KB from the middle of growing encrypted files with
+'decrypt_range' against a full 'decrypt'. That the ranges match the
+full decryption is checked by tests/test_random_access.py
+
+Usage:
+    python benchmarks/random_access.py [size in MB ...]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import encrypt, decrypt, decrypt_range
+
+SIZES_MB = [1, 8, 32]
+RANGE_LENGTH = 4096
+
+
+def main(sizes:list):
+    key = "benchmark key"
+    print(f"{'size MB':>8} {'decrypt s':>10} {'range ms':>9} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            data = os.urandom(size << 20)
+            path = os.path.join(directory, f"{size}.bin")
+            with open(path, "wb") as file:
+                file.write(encrypt(key, data, processes=1))
+
+            start = time.perf_counter()
+            with open(path, "rb") as file:
+                decrypt(key, file.read(), processes=1)
+            full_time = time.perf_counter() - start
+
+            with open(path, "rb") as file:
+                start = time.perf_counter()
+                decrypt_range(key, file, len(data)//2, RANGE_LENGTH)
+                range_time = time.perf_counter() - start
+
+            print(f"{size:>8} {full_time:>10.2f} {range_time*1e3:>9.2f} {full_time/range_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES_MB)
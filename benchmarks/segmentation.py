@@ -0,0 +1,43 @@
+'''
+Times 'segment_ranges' against copying the segments with 'segment_data'
+and shows how short data is no longer split across processes. Its
+properties are checked by tests/test_segmentation.py
+
+Usage:
+    python benchmarks/segmentation.py
+'''
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import MIN_SEGMENT_LENGTH, decrypt, encrypt, segment_data, segment_ranges
+
+KEY = "benchmark key"
+SEED = 39
+
+
+def seconds_per_call(function, calls:int) -> float:
+    return min(timeit.repeat(function, number=calls, repeat=5))/calls
+
+
+def main():
+    generator = random.Random(SEED)
+    data = "".join(generator.choices("abcdefghijklmnopqrstuvwxyz ", k=1 << 24))
+    for segments in (4, 64, 4096):
+        ranges_time = seconds_per_call(lambda: segment_ranges(len(data), segments), 100)
+        copy_time = seconds_per_call(lambda: segment_data(data, segments), 3)
+        print(f"{f'{segments} segments of 16M':>24} {ranges_time*1e6:>10.1f} us ranges {copy_time*1e3:>10.2f} ms copied")
+
+    record = "a short record"
+    for processes in (1, 4):
+        seconds = seconds_per_call(lambda: decrypt(KEY, encrypt(KEY, record, processes=processes), processes=processes), 100)
+        print(f"{f'short record, {processes} processes':>24} {seconds*1e3:>10.3f} ms per round trip")
+    print(f"{'min segment length':>24} {MIN_SEGMENT_LENGTH:>10}")
+
+
+if __name__ == "__main__":
+    main()
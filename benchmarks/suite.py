@@ -0,0 +1,273 @@
+'''
+Times every stage of encrypting and decrypting, from generating the key
+to pulling the metadata, along with 'encrypt', 'decrypt' and the file
+functions end to end, across payload sizes, data types and process
+counts. The results are written as JSON and can be compared against a
+saved run to flag regressions
+
+Usage:
+    python benchmarks/suite.py [--sizes 1K 1M 1G] [--types str utf-8 binary literal]
+                               [--processes 1 4] [--output results.json]
+                               [--baseline baseline.json] [--tolerance 0.25]
+
+Exits with status 1 if any benchmark is more than 'tolerance' slower
+than the same benchmark in the baseline
+'''
+
+import argparse
+import json
+import os
+import platform
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import (
+    Keystream, WorkerPool, cipher_buffer, convert_data, data_verification, decrypt, decrypt_file,
+    encrypt, encrypt_file, numpy_available, pull_metadata, range_finder, segment_data, segment_ranges,
+    sha256,
+)
+from listcrypt.listcrypt import _cipher_task, _code_points, _run_tasks, _symbol_format
+
+KEY = "benchmark key"
+SEED = 39
+TYPES = ('str', 'utf-8', 'binary', 'literal')
+# Short stages are called repeatedly until a run takes atleast this long
+MIN_SECONDS = 0.05
+
+
+def parse_size(size:str) -> int:
+    '''
+    Turns sizes like 1K, 16M or 1G into bytes
+    '''
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if size[-1].upper() in units:
+        return int(float(size[:-1])*units[size[-1].upper()])
+    return int(size)
+
+
+def payload(data_type:str, size:int) -> 'any data type':
+    '''
+    Generates the same payload of roughly 'size' bytes every run
+    '''
+    generator = random.Random(f"{SEED}{data_type}{size}")
+    if data_type == 'str':
+        letters = "abcdefghijklmnopqrstuvwxyz0123456789 \n"
+        return "".join(generator.choices(letters, k=size))
+    if data_type == 'utf-8':
+        words = ["listcrypt ", "héllo ", "wörld ", "naïve ", "€uro "]
+        text = "".join(generator.choices(words, k=size//5+1)).encode()
+        return text[:size].decode(errors='ignore').encode()
+    if data_type == 'binary':
+        return generator.randbytes(size)
+    # Roughly 5 characters per item once converted to a str
+    return [generator.randrange(1000) for _ in range(max(1, size//5))]
+
+
+def measure(function:'callable', repeat:int) -> float:
+    '''
+    Returns the fastest seconds per call of 'function', calling it
+    enough times in a row for short calls to be timed accurately
+    '''
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        seconds = time.perf_counter() - start
+        if seconds >= MIN_SECONDS or calls >= 1 << 16:
+            break
+        calls *= 4
+
+    best = seconds/calls
+    for _ in range(repeat-1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter() - start)/calls)
+    return best
+
+
+def stages(data:'any data type', data_type:str, size:int) -> dict:
+    '''
+    The stages of the pipeline that don't depend on the amount of processes
+    '''
+    converted_data, _ = convert_data(KEY, data) if data_type != 'binary' else (data, 'bytes')
+    converted_data = b"39"+converted_data if data_type == 'binary' else "39"+converted_data
+    max_range = range_finder(converted_data, code_points=True)
+    data_format, segment = _code_points(converted_data)
+    code_points = memoryview(bytes(segment(0, len(converted_data)))).cast(data_format)
+    output_format = _symbol_format(max_range)
+    output = memoryview(bytearray(len(code_points)*struct.calcsize(output_format))).cast(output_format)
+    key = Keystream(KEY).read(0, len(code_points))
+
+    encrypted_v1 = encrypt(KEY, data, processes=1, format_version=1)
+    encrypted_v2 = encrypt(KEY, data, processes=1)
+    key_hash = sha256(KEY)
+
+    benchmarks = {
+        "keystream": lambda: Keystream(KEY).read(0, len(code_points)),
+        "convert_data": lambda: convert_data(KEY, data),
+        "range_finder": lambda: range_finder(converted_data, code_points=True),
+        "cipher_buffer": lambda: cipher_buffer(key, code_points, output, max_range),
+        "pull_metadata_v1": lambda: pull_metadata(key_hash, encrypted_v1),
+        "pull_metadata_v2": lambda: pull_metadata(key_hash, encrypted_v2),
+    }
+    if type(data) == bytes:
+        benchmarks["data_verification"] = lambda: data_verification(KEY, data.decode(errors='ignore'))
+    benchmarks["segment_data"] = lambda: segment_data(converted_data, 4)
+    benchmarks["segment_ranges"] = lambda: segment_ranges(len(code_points), 4)
+    return benchmarks
+
+
+def process_stages(data:'any data type', processes:int, pool:WorkerPool) -> dict:
+    '''
+    The stages run with an amount of processes
+    '''
+    encrypted_v1 = encrypt(KEY, data, processes=processes, format_version=1)
+    encrypted_v2 = encrypt(KEY, data, processes=processes)
+    return {
+        "encrypt_v1": lambda: encrypt(KEY, data, processes=processes, format_version=1),
+        "decrypt_v1": lambda: decrypt(KEY, encrypted_v1, processes=processes),
+        "encrypt": lambda: encrypt(KEY, data, processes=processes),
+        "decrypt": lambda: decrypt(KEY, encrypted_v2, processes=processes),
+        "encrypt_pool": lambda: encrypt(KEY, data, processes=processes, pool=pool),
+        "decrypt_pool": lambda: decrypt(KEY, encrypted_v2, processes=processes, pool=pool),
+    }
+
+
+def process_startup(processes:int) -> 'callable':
+    '''
+    Starting processes and collecting their results, with almost no work
+    '''
+    tasks = [(b"a", b"a", 'B', 'B', 130, False, 'python')]*processes
+    return lambda: _run_tasks(_cipher_task, tasks, None, None)
+
+
+def file_stages(data:'any data type', directory:str) -> dict:
+    '''
+    The file functions, each rewriting the same file back and forth
+    '''
+    path = os.path.join(directory, "payload")
+    contents = data if type(data) == bytes else str(data).encode()
+    with open(path, "wb") as file:
+        file.write(contents)
+
+    def round_trip(**options):
+        encrypt_file(KEY, path, metadata_removal=False, **options)
+        decrypt_file(KEY, path, **options)
+
+    return {
+        "file_whole": round_trip,
+        "file_streamed": lambda: round_trip(chunk_size=1 << 20),
+        "file_mapped": lambda: round_trip(memory_map=True),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_available(),
+        "commit": commit,
+        "seed": SEED,
+    }
+
+
+def run(arguments:argparse.Namespace) -> dict:
+    results = {}
+
+    def record(name:str, data_type:str, size:int, processes:'int or None', function:'callable'):
+        seconds = measure(function, arguments.repeat)
+        benchmark = f"{name}/{data_type}/{size}/{processes or '-'}"
+        results[benchmark] = {
+            "name": name, "type": data_type, "size": size, "processes": processes,
+            "seconds": seconds, "mb_per_s": size/seconds/1e6 if size else None,
+        }
+        rate = f"{size/seconds/1e6:>9.2f} MB/s" if size else ""
+        print(f"{benchmark:<48} {seconds*1e3:>12.3f} ms {rate}", flush=True)
+
+    for processes in arguments.processes:
+        record("process_startup", '-', 0, processes, process_startup(processes))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in arguments.sizes:
+            for data_type in arguments.types:
+                data = payload(data_type, size)
+                for name, function in stages(data, data_type, size).items():
+                    record(name, data_type, size, None, function)
+
+                for processes in arguments.processes:
+                    with WorkerPool(processes) as pool:
+                        for name, function in process_stages(data, processes, pool).items():
+                            record(name, data_type, size, processes, function)
+
+                if data_type in ('str', 'binary'):
+                    for name, function in file_stages(data, directory).items():
+                        record(name, data_type, size, None, function)
+
+    return {"environment": environment(), "results": results}
+
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list:
+    '''
+    Prints how each benchmark compares to the baseline, returning
+    the benchmarks that are more than 'tolerance' slower
+    '''
+    regressions = []
+    print(f"\n{'benchmark':<48} {'baseline ms':>12} {'now ms':>12} {'change':>8}")
+    for benchmark, result in results["results"].items():
+        if benchmark not in baseline["results"]:
+            continue
+        before = baseline["results"][benchmark]["seconds"]
+        change = result["seconds"]/before - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(benchmark)
+            flag = "  REGRESSION"
+        print(f"{benchmark:<48} {before*1e3:>12.3f} {result['seconds']*1e3:>12.3f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["1K", "64K", "1M", "16M"])
+    parser.add_argument("--types", nargs="+", default=list(TYPES), choices=TYPES)
+    parser.add_argument("--processes", nargs="+", type=int, default=sorted({1, os.cpu_count()}))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="writes the results to this JSON file")
+    parser.add_argument("--baseline", help="compares the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="how much slower than the baseline counts as a regression")
+    arguments = parser.parse_args()
+    arguments.sizes = [parse_size(size) for size in arguments.sizes]
+
+    results = run(arguments)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, arguments.tolerance)
+        if regressions:
+            sys.exit(f"\n{len(regressions)} benchmarks regressed by more than {arguments.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+'''
+Compares files per second of calling 'encrypt_file' and 'decrypt_file'
+on every file of a directory tree against 'encrypt_tree' and
+'decrypt_tree' with an increasing amount of processes.
+tests/test_tree.py checks every file comes back unchanged
+
+Usage:
+    python benchmarks/tree.py [files] [file size]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import decrypt_file, decrypt_tree, encrypt_file, encrypt_tree
+
+KEY = "benchmark key"
+
+
+def write_tree(root:str, count:int, size:int):
+    for file in range(count):
+        directory = os.path.join(root, f"{file%16}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{file}.bin"), "wb") as output:
+            output.write(os.urandom(size))
+
+
+def files_per_second(function, count:int) -> float:
+    start = time.perf_counter()
+    function()
+    return count/(time.perf_counter() - start)
+
+
+def main(count:int, size:int):
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root, count, size)
+        paths = [os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names]
+
+        print(f"{count} files of {size} bytes, {os.cpu_count()} cores")
+        print(f"{'mode':>16} {'encrypt/s':>10} {'decrypt/s':>10}")
+        encrypting = files_per_second(lambda: [encrypt_file(KEY, path, metadata_removal=False) for path in paths], count)
+        decrypting = files_per_second(lambda: [decrypt_file(KEY, path) for path in paths], count)
+        print(f"{'one per call':>16} {encrypting:>10.0f} {decrypting:>10.0f}")
+
+        processes = 1
+        while processes <= os.cpu_count():
+            encrypting = files_per_second(lambda: encrypt_tree(KEY, root, processes, metadata_removal=False), count)
+            decrypting = files_per_second(lambda: decrypt_tree(KEY, root, processes), count)
+            print(f"{f'tree, {processes} procs':>16} {encrypting:>10.0f} {decrypting:>10.0f}")
+            processes *= 2
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4096,
+    )
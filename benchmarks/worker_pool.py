@@ -0,0 +1,61 @@
+'''
+Compares calls per second of 'encrypt' and 'decrypt' when every call
+starts its own processes against reusing an already started 'WorkerPool',
+with and without the shared memory transport. tests/test_worker_pool.py
+checks they all give the same output
+
+Usage:
+    python benchmarks/worker_pool.py [--processes N] [--sizes 1024 1048576 104857600]
+'''
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import WorkerPool, encrypt, decrypt
+
+
+def calls_per_second(function, seconds=2.0, max_calls=200) -> float:
+    '''
+    Calls the function repeatedly for roughly 'seconds', returning
+    how many calls were completed per second
+    '''
+    calls = 0
+    start = time.perf_counter()
+    while calls < max_calls:
+        function()
+        calls += 1
+        if time.perf_counter() - start > seconds:
+            break
+    return calls/(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 1 << 20, 100 << 20])
+    arguments = parser.parse_args()
+    processes = arguments.processes
+
+    print(f"{'size':>10} {'spawning/s':>11} {'pool/s':>9} {'pool+shm/s':>11} {'speedup':>8}")
+    with WorkerPool(processes) as pool:
+        for size in arguments.sizes:
+            # The confirmation text makes the data 2 characters longer
+            data = ("0123456789abcdef"*(size//16+1))[:size-2]
+            key = "benchmark key"
+
+            def round_trip(pool=None, shared_memory=False):
+                encrypted_data = encrypt(key, data, processes=processes, pool=pool, shared_memory=shared_memory)
+                decrypt(key, encrypted_data, processes=processes, pool=pool, shared_memory=shared_memory)
+
+            spawning = calls_per_second(round_trip)
+            pooled = calls_per_second(lambda: round_trip(pool))
+            shared = calls_per_second(lambda: round_trip(pool, True))
+            print(f"{size:>10} {spawning:>11.2f} {pooled:>9.2f} {shared:>11.2f} {max(pooled, shared)/spawning:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
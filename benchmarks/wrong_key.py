@@ -0,0 +1,51 @@
+'''
+Times how long a wrong key takes to be turned away by 'verify_key',
+'decrypt' and 'decrypt_file' as the payload grows, next to decrypting
+it with the right key. The wrong key should take the same time at
+every size, since only the confirmation text is decrypted. That a
+wrong key is turned away is checked in tests/test_wrong_key.py
+
+Usage:
+    python benchmarks/wrong_key.py [size in MB ...]
+'''
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from listcrypt import Cipher, decrypt, decrypt_file, encrypt, encrypt_file, verify_key
+
+SIZES_MB = [0, 1, 16, 128]
+KEY = "benchmark key"
+WRONG_KEY = "wrong key"
+
+
+def seconds(function:'callable', calls:int) -> float:
+    return min(timeit.repeat(function, number=calls, repeat=3))/calls
+
+
+def main(sizes:list):
+    cipher = Cipher(WRONG_KEY)
+    print(f"{'size MB':>8} {'right key ms':>14} {'verify_key us':>14} {'decrypt us':>12} {'decrypt_file us':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "payload")
+        for size in sizes:
+            data = os.urandom(max(size << 20, 16))
+            encrypted_data = encrypt(KEY, data)
+            with open(path, "wb") as file:
+                file.write(data)
+            encrypt_file(KEY, path, metadata_removal=False, chunk_size=1 << 20)
+
+            right_key = seconds(lambda: decrypt(KEY, encrypted_data), 1)
+            verifying = seconds(lambda: verify_key(cipher, encrypted_data), 1000)
+            decrypting = seconds(lambda: decrypt(cipher, encrypted_data), 1000)
+            decrypting_file = seconds(lambda: decrypt_file(cipher, path, chunk_size=1 << 20), 100)
+
+            print(f"{size:>8} {right_key*1e3:>14.2f} {verifying*1e6:>14.2f} {decrypting*1e6:>12.2f} {decrypting_file*1e6:>16.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES_MB)
@@ -23,6 +23,12 @@ setup(
     package_dir={"":"src"},
     packages=["listcrypt"],
     install_requires=[],
+    extras_require={
+        "numpy": ["numpy"],
+    },
+    entry_points={
+        "console_scripts": ["listcrypt=listcrypt.cli:main"],
+    },
     keywords=['python','encryption','decryption','cryptography'],
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -7,10 +7,58 @@ The key is converted to a sha256 hash and used to create more key
 hashes to match and slightly exceed the length of the data.
 
 
+Format:
+    Encrypted data starts with a fixed 18 byte little endian header, read by 'read_header'
+
+        magic   3 bytes   b"\\xffLC"
+        version 1 byte    2
+        type    1 byte    the origional data type, one of 'DATA_TYPES', 'literal' for data
+                          serialized by 'serialize_literal'. 'ast' is still read
+        flags   1 byte    'FLAG_STREAMED' (1) when the length wasn't known while encrypting,
+                          bits 1 and 2 hold the compression, one of 'COMPRESSIONS' or 0
+                          and data with any other bit set is refused
+        range   4 bytes   the 'max_range' the data was encrypted with
+        length  8 bytes   the amount of encrypted characters, 0 when streamed
+
+    followed by 'length' encrypted characters of 1, 2 or 4 bytes each, the smallest
+    width that holds 'range'. Character i is always encrypted with character i of the
+    key, so the output doesn't depend on the amount of processes. Compressed data is
+    the confirmation text followed by the compressed bytes, or the compressed UTF-8 of
+    the str version for other types. Data encrypted in the origional format (version 1)
+    is still decrypted
+
 Functions:
     sha256(data: str) -> str:
         Simple hashing function, utilizes the builtin hashlib module
 
+    numpy_available() -> bool:
+        Checks whether NumPy can be imported for the vectorized engine
+
+    cpu_count() -> int
+        The amount of CPU cores, without importing multiprocessing
+
+    plan_execution(length:int, processes='auto', engine='auto', pool=None, character_size=1, records=1) -> dict
+        Picks whether to cipher 'length' characters on one process one character at a time ('serial'),
+        on one process with NumPy ('vectorized') or across worker processes ('processes') from a cost
+        model of this machine, returning the "strategy", "engine", "processes" and estimated "seconds".
+        An int for 'processes' or an engine other than 'auto' is used as it is. 'encrypt', 'decrypt'
+        and the many functions plan each call this way by default, except format version 1 data,
+        which always uses every CPU core for 'auto' since its output depends on the amount
+
+    calibrate(processes=True) -> dict
+        Times the engines, generating the keystream, and starting a worker process if 'processes',
+        on this machine, returning the costs 'plan_execution' uses. The engines are timed the first time a plan is made, and
+        processes the first time data is long enough that starting one might pay off
+
+    cipher_segment(key:bytes, data:str, max_range:int, reverse=False, engine='auto') -> str:
+        Adds (or subtracts) each character of the key to the character in the same position
+        in the data, modulo 'max_range'. The 'numpy' engine runs this as whole array operations,
+        'python' one character at a time and 'auto' uses NumPy when it's installed
+
+    cipher_buffer(key:memoryview, data:memoryview, output:memoryview, max_range:int, reverse=False, engine='auto') -> int
+        The same as 'cipher_segment', but reads the code points of the data from one buffer and
+        writes the result straight into another
+
     data_verification(key:str, data:str) -> bool:
         Verifies that your data will be encrypted and decrypted without error
 
@@ -21,50 +69,247 @@ Functions:
         Converts the data back to its origional type as given by the 'origional_data_type' parameter
         in the 'metadata' list.  This is built to work seamlessly with the 'convert_data' function.
 
-    range_finder(data:str or bytes) -> int:
-        Finds the character with the largest integer equivalent in your data
+    serialize_literal(data:'literal') -> bytes
+        Serializes None, bools, ints, floats, complex numbers, strs and bytes, and lists, tuples,
+        sets and dicts of them, to compact bytes without pickle. Lists and tuples of only ints or
+        only floats are written as arrays. Raises TypeError for anything else
+
+    deserialize_literal(data:bytes) -> 'literal'
+        Reads back the output of 'serialize_literal', only ever building those types so it's safe
+        for untrusted data. Raises ValueError if the data is truncated or corrupted
+
+    range_finder(data:str or bytes, code_points=False) -> int:
+        Finds the character with the largest integer equivalent in your data, measuring str
+        data by its code points rather than its UTF-8 bytes when 'code_points' is True
+
+    read_header(data:bytes) -> dict
+        Reads the fixed header at the start of data encrypted with format version 2, without
+        looking at any of the data after it. Its "compression" is None for uncompressed data
+
+    Keystream(key:str, cache_size=0)
+        Lazily generates the same characters as 'create_key', block i being sha256(key+str(i)),
+        so any offset of the key can be reached in O(1) without generating what comes before it.
+        With a 'cache_size' up to that many bytes of generated pages are kept, least recently used first out
 
-    create_key(key:str, data_length:int) -> bytes
+        Keystream.key_length(data_length:int) -> int
+            The length of the key 'create_key' returns for 'data_length'
+
+        Keystream.block(index:int) -> bytes
+            Returns a single block of the keystream
+
+        Keystream.readinto(buffer:bytearray, offset:int) -> int
+            Fills a preallocated buffer with the keystream starting at the character 'offset'
+
+        Keystream.page(index:int) -> bytes
+            Returns a single page of 'Keystream.page_size' bytes, from the cache when it's been generated before
+
+        Keystream.clear_cache()
+            Drops every cached page of the keystream
+
+        Keystream.read(offset:int, length:int) -> bytes
+            Returns 'length' bytes of the keystream starting at the character 'offset'
+
+    create_key(key:str, data_length:int) -> str
         Uses the sha256 hash of the 'key' parameter to create and concatenate more keys (based upon the origional) to a new
         key variable that is either the same size as or slighty larger than the length of the data
 
     segment_data(data:str, segments:int) -> list
-        Splits the data evenly amongst the amount of 'segments' required
+        Splits the data evenly amongst the amount of 'segments' required, copying each segment
+
+    segment_ranges(length:int, segments:int, min_segment_length=1, oversubscription=1) -> list
+        Splits 'length' items into neighbouring (start, stop) ranges whose lengths differ by atmost 1,
+        without copying anything. No range is shorter than 'min_segment_length' unless there's only
+        one, and there are 'oversubscription' ranges per segment for balancing work across workers.
+        'encrypt' and 'decrypt' don't split format version 2 data into ranges shorter than
+        'MIN_SEGMENT_LENGTH', and give a pool 'SEGMENTS_PER_WORKER' ranges per worker. A range
+        ciphered in the calling process is read 'WINDOW_LENGTH' characters at a time
 
     pull_metadata(key:str, data:bytes) -> dict
-        Pulls metadata from the encrypted bytes and puts it in a dictionary for easy readibility
+        Pulls metadata from the encrypted bytes and puts it in a dictionary for easy readibility,
+        in either format version
+
+    SegmentError(segment:int, message:str)
+        Raised in the caller when the worker handling a segment fails, with the position of the
+        segment in its 'segment' attribute and the origional exception as its cause
+
+    multiprocess_cipher(function:callable, task:tuple, connection:Connection) -> bool
+        Runs 'function(task)' in a child process and sends the result, or the exception it raised,
+        back through the connection
+
+    WorkerPool(processes=cpu_count())
+        A reusable set of worker processes for 'encrypt' and 'decrypt', the workers are started once
+        and stay running between calls. A worker that dies fails the call with a 'SegmentError'.
+        Usable as a context manager, which closes the workers on exit
+
+        WorkerPool.start()
+            Starts the workers, this happens automatically on first use
+
+        WorkerPool.submit(function:callable, task:any) -> Future
+            Runs 'function(task)' on one of the workers, returning a concurrent.futures Future
+
+        WorkerPool.imap(function:callable, iterable:iterable) -> iterator
+            Runs the function over the iterable on the workers, yielding the results in order
 
-    encrypt(key:'any data type', data:'any data type', processes=cpu_count()) -> bytes
+        WorkerPool.terminate()
+            Stops the workers straight away, abandoning any remaining work. 'encrypt' and 'decrypt'
+            terminate the pool when a segment fails or times out, and new workers are started the
+            next time it's used
+
+        WorkerPool.imap_unordered(function:callable, iterable:iterable) -> iterator
+            Runs the function over the iterable on the workers, yielding the results as they finish
+
+        WorkerPool.close()
+            Stops the workers once they finish any remaining work
+
+    Stats(callback=None)
+        Collects how long each stage of a call takes when passed as its 'stats', the stages being
+        'conversion', 'key expansion', 'segmentation', 'dispatch', 'cipher', 'join' and 'metadata',
+        along with the characters processed and the largest segment given to one worker.
+        'callback' is called with {"event": "stage", "stage": name, "seconds": seconds} as each
+        stage finishes and {"event": "progress", "done": done, "total": total} as each segment or
+        file chunk finishes. Without a Stats each stage costs a single 'is None' check
+
+        Stats.merge(other:Stats)
+            Adds the stages and totals collected by another Stats, such as one filled in by a call in
+            another process
+
+        Stats.as_dict() -> dict
+            Returns the seconds spent in each stage, the total seconds, 'bytes_processed',
+            'peak_segment' and the 'throughput' of the cipher stage in bytes per second
+
+    Cipher(key:'any data type', cache_size=64 MiB)
+        Derives everything 'encrypt' and 'decrypt' need from the key once, caching up to 'cache_size'
+        bytes of its keystream, for encrypting or decrypting many pieces of data under the same key
+
+        Cipher.encrypt(data:'any data type', processes='auto', ...) -> bytes
+            The same as 'encrypt', using the ciphers key
+
+        Cipher.decrypt(encrypted_data:bytes, processes='auto', ...) -> "origional data"
+            The same as 'decrypt', using the ciphers key
+
+        Cipher.decrypt_range(encrypted_data:bytes or file, start:int, length:int, engine='auto') -> str or bytes
+            The same as 'decrypt_range', using the ciphers key
+
+        Cipher.verify_key(encrypted_data:bytes or file) -> bool
+            The same as 'verify_key', using the ciphers key
+
+        Cipher.encrypt_many(data:iterable, processes='auto', ...) -> list
+            The same as 'encrypt_many', using the ciphers key
+
+        Cipher.decrypt_many(encrypted_data:iterable, processes='auto', ...) -> list
+            The same as 'decrypt_many', using the ciphers key
+
+    encrypt(key:'any data type', data:'any data type', processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, format_version=2, stats=None, compression=None) -> bytes
         Encrypts the data by adding each characters integer equivalent to the 
         integer equivalent of the character in the same position in the new key 
-        variable generated by the 'key parameter'
+        variable generated by the 'key parameter', running on the 'pool' if one is given.
+        With 'shared_memory' the data and output are kept in shared memory and each worker is
+        only sent the range it works on. Waits at most 'timeout' seconds for the workers.
+        Each worker generates the keystream of its own range, so key expansion is split
+        across the processes along with the cipher, and the parent's keystream isn't sent.
+        Bytes are encrypted as they are, without being converted to a str first, and literals like
+        lists and dicts as the bytes of 'serialize_literal' rather than their str for 'ast'.
+        'format_version=1' writes the origional format, which depends on the amount of 'processes'.
+        Records the time spent in each stage in 'stats' when a Stats is given. With 'processes' and
+        'engine' left as 'auto', 'plan_execution' picks them for the length of the data.
+        Format version 2 reads str and bytes in place, ciphering them a window at a time after the
+        confirmation text, so the peak memory of a single process is about twice the output.
+        A 'compression' of 'zlib', 'lzma' or 'bz2' compresses the data before it's encrypted,
+        unless its first 64 KiB don't compress, and 'decrypt' decompresses it
 
-        Nested Function:
-            multiprocess_decryption(data:str, segment:int, shared_dictionary:dict) -> bool
-                Takes chuncks of data and adds them to a shared dictionary,
-                with the keys being the segments origional position for concatenation
-                after encryption
-
-    decrypt(key:"any data type", encrypted_data:bytes, processes=cpu_count()) -> "origional data"
+    decrypt(key:"any data type", encrypted_data:bytes, processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, stats=None) -> "origional data"
         Decrypts the data by subtracting each characters integer equivalent
         by the integer equivalent of the character in the same position in 
-        the new key variable generated by the 'key parameter'
+        the new key variable generated by the 'key parameter', running on the 'pool' if one is given.
+        With 'shared_memory' the data and output are kept in shared memory and each worker is
+        only sent the range it works on. Waits at most 'timeout' seconds for the workers.
+        Each worker generates the keystream of its own range, as it does for 'encrypt'.
+        Records the time spent in each stage in 'stats' when a Stats is given
+
+    decrypt_range(key:'any data type', encrypted_data:bytes or file, start:int, length:int, engine='auto') -> str or bytes
+        Decrypts 'length' characters (or bytes) of the origional str (or bytes) starting at 'start',
+        reading only the header, the confirmation text and the range itself from format version 2
+        data or a binary file opened on it. Returns False if decryption fails. Compressed data
+        can't be decrypted in ranges
+
+    verify_key(key:'any data type', encrypted_data:bytes or file) -> bool
+        Checks whether the key is correct by decrypting only the confirmation text at the start of the
+        data, reading just the header and first two characters of format version 2 data or a binary file
+        opened on it, so a wrong key is found in microseconds at any size. 'decrypt', 'decrypt_many' and
+        'decrypt_file' run the same check first, returning False before decrypting anything else
+
+    encrypt_many(key:'any data type', data:iterable, processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list
+        Encrypts many pieces of data in one call, deriving the key once and splitting the pieces
+        across processes in batches. Returns the encrypted bytes of each piece in order, each of
+        which can be decrypted on its own with 'decrypt'
 
-        Nested_Function:
-            multiprocess_encryption(data:str, segment:int, shared_dictionary:dict) -> bool
-                Takes chuncks of data and adds them to a shared dictionary,
-                with the keys being the segments origional position for concatenation
-                after decryption
+    decrypt_many(key:'any data type', encrypted_data:iterable, processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list
+        Decrypts many pieces of encrypted data in one call, returning the origional data of each
+        piece in order, or False for any piece that fails to decrypt
 
     remove_image_exif(path:str) -> bool
-        Removes the metadata from the provided image, which may cause
-        unwanted effects like image rotating, but will reduce the file size greatly
+        Removes the metadata from the provided JPEG or PNG image, which may cause
+        unwanted effects like image rotating, but will reduce the file size greatly.
+        Only the Exif, XMP, IPTC and comment segments of JPEGs and the text, eXIf and
+        tIME chunks of PNGs are left out, the pixels are copied without being decoded.
+        Other files are skipped after reading their first 8 bytes
+
+    encrypt_file(key:str, path:str, metadata_removal=True, chunk_size=None, memory_map=False, stats=None, compression=None) -> bool
+        This function enables the easy encryption of files, giving a 'chunk_size' streams the file
+        through a temporary file so memory use stays constant no matter the file size.
+        With 'memory_map' the file is encrypted as bytes between memory maps of it and a preallocated
+        temporary file, one window of 'chunk_size' bytes (4 MiB by default) at a time.
+        A Stats given as 'stats' gets a progress event for each chunk or window.
+        A 'compression' compresses the file first, a streamed file a chunk at a time as bytes
+
+    decrypt_file(key:str, path:str, chunk_size=None, memory_map=False, stats=None) -> bool
+        This function enables the easy decryption of files, giving a 'chunk_size' streams the file
+        through a temporary file so memory use stays constant no matter the file size.
+        With 'memory_map' files encrypted with 'memory_map' are decrypted between memory maps
+
+    encrypt_tree(key:'any data type', root:str, processes=cpu_count(), metadata_removal=True, chunk_size=1 MiB, large_file_size=64 MiB, progress_path=None, stats=None, force=False) -> dict
+        Encrypts every file under the directory on a pool of 'processes' workers, batching files
+        smaller than 'large_file_size' so each worker streams many of them per task, and memory
+        mapping larger files split across every worker. Each file is recorded in 'progress_path'
+        if given as soon as it finishes, so running again after an interruption skips it. Files
+        already starting with an encrypted header are skipped unless 'force' is given. Returns the
+        paths under "succeeded", "skipped" and the error of each file under "failed"
+
+    decrypt_tree(key:'any data type', root:str, processes=cpu_count(), chunk_size=1 MiB, large_file_size=64 MiB, progress_path=None, stats=None) -> dict
+        Decrypts every file under the directory the same way, returning the same report
+
+    encrypt_stream(key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 MiB, processes=1, engine='auto', compression=None) -> int
+        Encrypts everything read from the source, such as 'sys.stdin.buffer', into the destination as
+        bytes 'chunk_size' bytes at a time, returning the amount encrypted. When the length of the
+        source isn't known, like with a pipe, the header is marked 'FLAG_STREAMED' with a length of 0.
+        A 'compression' compresses each chunk as it's read unless the first chunk doesn't compress,
+        the compressed data is always marked 'FLAG_STREAMED'
+
+    decrypt_stream(key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 MiB, processes=1, engine='auto') -> bool
+        Decrypts format version 2 data read from the source into the destination 'chunk_size' characters
+        at a time, writing text as UTF-8 and decompressing compressed data as it goes. Nothing is
+        written unless the key is correct
+
+    rekey_stream(key:'any data type', new_key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 MiB, processes=1, engine='auto') -> bool
+        Re-encrypts format version 2 data under 'new_key' without converting it back to its origional type
+
+    encrypt_async(key:'any data type', data:'any data type', processes=1, engine='auto', pool=None, shared_memory=False, timeout=None, executor=None, format_version=2, stats=None, compression=None) -> bytes
+        Awaitable version of 'encrypt', running it on an executor so the event loop isn't blocked.
+        The default executor has a worker process per CPU core, so the cipher doesn't hold the event
+        loop's GIL and awaiting many calls at once runs at most that many of them at a time. Cancelling
+        a call that hasn't started yet stops it from running. Calls given a 'pool' run on a thread per
+        CPU core instead, and the stages of a call in a worker process are added to 'stats' once it finishes
+
+    decrypt_async(key:'any data type', encrypted_data:bytes, processes=1, engine='auto', pool=None, shared_memory=False, timeout=None, executor=None, stats=None) -> "origional data"
+        Awaitable version of 'decrypt', running it on an executor so the event loop isn't blocked
 
-    encrypt_file(key:str, path:str, metadata_removal=True) -> bool
-        This function enables the easy encryption of files
+    encrypt_file_async(key:'any data type', path:str, metadata_removal=True, chunk_size=1 MiB, engine='auto', executor=None, stats=None) -> bool
+        Awaitable version of 'encrypt_file', streaming the file on an executor 'chunk_size' characters
+        at a time. Cancelling it stops between chunks and leaves the origional file untouched
 
-    decrypt_file(key:str, path:str) -> bool
-        This function enables the easy decryption of files
+    decrypt_file_async(key:'any data type', path:str, chunk_size=1 MiB, engine='auto', executor=None, stats=None) -> bool
+        Awaitable version of 'decrypt_file', streaming the file on an executor 'chunk_size' characters
+        at a time. Cancelling it stops between chunks and leaves the encrypted file untouched
 '''
 
 from listcrypt.listcrypt import *
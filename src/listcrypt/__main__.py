@@ -0,0 +1,5 @@
+import sys
+
+from listcrypt.cli import main
+
+sys.exit(main())
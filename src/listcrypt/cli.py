@@ -0,0 +1,237 @@
+'''
+The 'listcrypt' command, streaming from stdin (or a file) to stdout
+(or a file) a chunk at a time so it fits into pipelines
+
+    tar -c photos | listcrypt encrypt --key-file key.txt > photos.tar.lc
+    listcrypt encrypt --key-file key.txt --compression zlib -i notes.txt -o notes.lc
+    listcrypt decrypt --key-file key.txt < photos.tar.lc | tar -x
+    listcrypt rekey --key-file old.txt --new-key-file new.txt -i photos.tar.lc -o photos.tar.lc
+    listcrypt bench --size 64M
+
+The key is read from '--key', '--key-file', the LISTCRYPT_KEY environment
+variable, or asked for on the terminal, in that order
+'''
+
+import argparse
+import base64
+import binascii
+import contextlib
+import os
+import sys
+import time
+
+from listcrypt.listcrypt import (
+    COMPRESSIONS, _atomic_write, cpu_count, decrypt, decrypt_stream, encrypt, encrypt_stream, rekey_stream,
+)
+
+# Base64 lines are 76 characters, 57 bytes before encoding
+BASE64_LINE = 57
+
+
+class Base64Writer:
+    '''
+    Writes everything written to it to the file as lines of base64
+    '''
+    def __init__(self, file:'binary file'):
+        self.file = file
+        self._leftover = b""
+
+    def write(self, data:bytes) -> int:
+        length = len(data)
+        data = self._leftover+bytes(data)
+        split = len(data) - len(data)%BASE64_LINE
+        self._leftover = data[split:]
+        self.file.write(base64.encodebytes(data[:split]))
+        return length
+
+    def flush(self):
+        if self._leftover:
+            self.file.write(base64.encodebytes(self._leftover))
+            self._leftover = b""
+        self.file.flush()
+
+
+class Base64Reader:
+    '''
+    Reads the decoded bytes of a file of base64, ignoring line breaks
+    '''
+    def __init__(self, file:'binary file'):
+        self.file = file
+        self._decoded = b""
+        self._leftover = b""
+
+    def read(self, size:int) -> bytes:
+        while len(self._decoded) < size:
+            encoded = self.file.read(max(size//3*4, 4))
+            if not encoded:
+                break
+            # Base64 only decodes cleanly in multiples of 4 characters
+            encoded = self._leftover+b"".join(encoded.split())
+            split = len(encoded) - len(encoded)%4
+            self._leftover = encoded[split:]
+            self._decoded += base64.b64decode(encoded[:split])
+        if self._leftover and len(self._decoded) < size:
+            raise binascii.Error("The base64 input is incomplete")
+
+        data, self._decoded = self._decoded[:size], self._decoded[size:]
+        return data
+
+
+def parse_size(size:str) -> int:
+    '''
+    Turns sizes like 64K, 1M or 1G into bytes
+    '''
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    try:
+        if size[-1:].upper() in units:
+            return int(float(size[:-1])*units[size[-1].upper()])
+        return int(size)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size '{size}'") from None
+
+
+def read_key(key:str, key_file:str, environment:str, prompt:str) -> str:
+    '''
+    Returns the key from the first of the option, key file, environment
+    variable or terminal prompt that's given
+    '''
+    if key is not None:
+        return key
+    if key_file is not None:
+        with open(key_file) as file:
+            return file.read().rstrip("\n")
+    if environment in os.environ:
+        return os.environ[environment]
+
+    import getpass
+    return getpass.getpass(prompt)
+
+
+def open_streams(arguments:argparse.Namespace):
+    '''
+    Returns the binary source and destination of the command, writing
+    to a temporary file that replaces the output once it's finished, so
+    the input and output can be the same file
+    '''
+    source = open(arguments.input, "rb") if arguments.input else sys.stdin.buffer
+    if arguments.output:
+        return source, _atomic_write(arguments.output, "wb")
+    return source, contextlib.nullcontext(sys.stdout.buffer)
+
+
+def run_encrypt(arguments:argparse.Namespace) -> int:
+    key = read_key(arguments.key, arguments.key_file, "LISTCRYPT_KEY", "Key: ")
+    source, output = open_streams(arguments)
+    with source, output as destination:
+        if arguments.format == 'base64':
+            destination = Base64Writer(destination)
+        encrypt_stream(key, source, destination, arguments.chunk_size, arguments.processes, compression=arguments.compression)
+    return 0
+
+
+def run_decrypt(arguments:argparse.Namespace) -> int:
+    key = read_key(arguments.key, arguments.key_file, "LISTCRYPT_KEY", "Key: ")
+    source, output = open_streams(arguments)
+    with source, output as destination:
+        if arguments.format == 'base64':
+            source = Base64Reader(source)
+        if not decrypt_stream(key, source, destination, arguments.chunk_size, arguments.processes):
+            # Raised so a temporary output file is removed
+            raise ValueError("Decryption failed, the key is wrong")
+    return 0
+
+
+def run_rekey(arguments:argparse.Namespace) -> int:
+    key = read_key(arguments.key, arguments.key_file, "LISTCRYPT_KEY", "Old key: ")
+    new_key = read_key(arguments.new_key, arguments.new_key_file, "LISTCRYPT_NEW_KEY", "New key: ")
+    source, output = open_streams(arguments)
+    with source, output as destination:
+        if arguments.format == 'base64':
+            source, destination = Base64Reader(source), Base64Writer(destination)
+        if not rekey_stream(key, new_key, source, destination, arguments.chunk_size, arguments.processes):
+            raise ValueError("Decryption failed, the old key is wrong")
+    return 0
+
+
+def run_bench(arguments:argparse.Namespace) -> int:
+    import io
+
+    key = "benchmark key"
+    data = os.urandom(arguments.size)
+    size = arguments.size/1e6
+
+    def seconds(function:'callable') -> tuple:
+        start = time.perf_counter()
+        result = function()
+        return time.perf_counter() - start, result
+
+    print(f"{arguments.size} bytes, {arguments.processes} processes, {cpu_count()} cores")
+    encrypt_time, encrypted_data = seconds(lambda: encrypt(key, data, processes=arguments.processes))
+    decrypt_time, decrypted_data = seconds(lambda: decrypt(key, encrypted_data, processes=arguments.processes))
+    if decrypted_data != data:
+        print("listcrypt: decrypt didn't give back the data that was encrypted", file=sys.stderr)
+        return 1
+    print(f"{'encrypt':>16} {size/encrypt_time:>10.2f} MB/s")
+    print(f"{'decrypt':>16} {size/decrypt_time:>10.2f} MB/s")
+
+    encrypted_stream = io.BytesIO()
+    encrypt_time, _ = seconds(lambda: encrypt_stream(key, io.BytesIO(data), encrypted_stream, arguments.chunk_size, arguments.processes))
+    encrypted_stream.seek(0)
+    decrypted_stream = io.BytesIO()
+    decrypt_time, _ = seconds(lambda: decrypt_stream(key, encrypted_stream, decrypted_stream, arguments.chunk_size, arguments.processes))
+    if decrypted_stream.getvalue() != data:
+        print("listcrypt: decrypt_stream didn't give back the data that was encrypted", file=sys.stderr)
+        return 1
+    print(f"{'encrypt_stream':>16} {size/encrypt_time:>10.2f} MB/s")
+    print(f"{'decrypt_stream':>16} {size/decrypt_time:>10.2f} MB/s")
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="listcrypt", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name:str, function:'callable', description:str, new_key=False) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=description, description=description)
+        command.set_defaults(function=function)
+        command.add_argument("-p", "--processes", type=int, default=1,
+                             help="worker processes each chunk is split across (default: 1)")
+        command.add_argument("-c", "--chunk-size", type=parse_size, default=1 << 20,
+                             help="how much is read and ciphered at a time, like 64K or 4M (default: 1M)")
+        if name == 'bench':
+            return command
+
+        command.add_argument("-k", "--key", help="the key, visible to other users in the process list")
+        command.add_argument("--key-file", help="reads the key from this file")
+        if new_key:
+            command.add_argument("--new-key", help="the key to re-encrypt with")
+            command.add_argument("--new-key-file", help="reads the key to re-encrypt with from this file")
+        command.add_argument("-i", "--input", help="reads from this file instead of stdin")
+        command.add_argument("-o", "--output", help="writes to this file instead of stdout, once finished")
+        command.add_argument("-f", "--format", choices=("binary", "base64"), default="binary",
+                             help="the format of the encrypted data (default: binary)")
+        return command
+
+    encrypt_command = add_command("encrypt", run_encrypt, "encrypts stdin to stdout")
+    encrypt_command.add_argument("-z", "--compression", choices=tuple(COMPRESSIONS),
+                                 help="compresses the data before encrypting it, unless it doesn't compress")
+    add_command("decrypt", run_decrypt, "decrypts stdin to stdout")
+    add_command("rekey", run_rekey, "re-encrypts stdin under a new key to stdout", new_key=True)
+    bench = add_command("bench", run_bench, "measures throughput on this machine")
+    bench.add_argument("-s", "--size", type=parse_size, default=16 << 20, help="bytes of data to time (default: 16M)")
+    return parser
+
+
+def main(argv=None) -> int:
+    arguments = parser().parse_args(argv)
+    try:
+        return arguments.function(arguments)
+    except (OSError, ValueError) as exception:
+        print(f"listcrypt: {exception}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
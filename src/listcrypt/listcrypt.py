@@ -11,15 +11,90 @@ hashes to match and slightly exceed the length of the data.
 import hashlib
 import base64
 import ast
-from multiprocessing import Process, Manager, cpu_count
+import array
 import math
+import mmap
 import platform
+import os
+import codecs
+import collections
+import contextlib
+import functools
+import itertools
+import shutil
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
 
 
 #Defining functions before iterative use to increase efficiency
 chr_ = chr
 ord_ = ord
 
+# NumPy is optional, it's only imported the first time the
+# vectorized engine is requested
+_numpy = None
+
+# The executors the async functions run on by default, each started
+# the first time one of them is awaited
+_executors = {}
+_executor_lock = threading.Lock()
+# The costs measured by 'calibrate' for 'plan_execution'
+_costs = {}
+_costs_lock = threading.Lock()
+ENGINES = ('auto', 'numpy', 'python')
+
+# Format version 2 starts with a fixed header. UTF-8 never contains the
+# byte 0xFF, so the magic can't be the start of version 1 output
+FORMAT_VERSION = 2
+HEADER_MAGIC = b"\xffLC"
+# magic, version, data type, flags, range, length
+HEADER = struct.Struct("<3sBBBIQ")
+DATA_TYPES = {'str': 1, 'utf-8': 2, 'base64': 3, 'ISO-8859-1': 4, 'ast': 5, 'bytes': 6, 'literal': 7}
+# Types encrypted as bytes rather than as the code points of a str
+BINARY_DATA_TYPES = ('bytes', 'literal')
+# Set in the flags when the length wasn't known while encrypting, such as
+# when streaming from a pipe. The length is left as 0 and the characters
+# run to the end of the data
+FLAG_STREAMED = 1 << 0
+# Bits 1 and 2 of the flags hold the compression the data went through
+# before it was encrypted, 0 when it wasn't compressed
+COMPRESSIONS = {'zlib': 1, 'lzma': 2, 'bz2': 3}
+COMPRESSION_SHIFT = 1
+FLAG_COMPRESSION = 0b11 << COMPRESSION_SHIFT
+# Data with any other flag set was written by a later version, whose
+# meaning can't be guessed, so it's refused rather than misread
+KNOWN_FLAGS = FLAG_STREAMED | FLAG_COMPRESSION
+# Data is only compressed when this much of its start compresses to
+# less than 'COMPRESSION_RATIO' of its size with the fastest zlib level
+COMPRESSION_SAMPLE = 1 << 16
+COMPRESSION_RATIO = 0.9
+
+# Segments smaller than this cost more to hand to a worker than to
+# cipher in place, so shorter data isn't split across processes
+MIN_SEGMENT_LENGTH = 1 << 16
+# A pool is given this many segments per worker, so workers that
+# finish early take on more instead of waiting on the slowest
+SEGMENTS_PER_WORKER = 4
+# Data ciphered in a single process is read this many characters at a
+# time, bounding the memory the keystream and engines use on top of
+# the output
+WINDOW_LENGTH = 1 << 18
+# Guesses at the cost of starting a process and of a task on a pool,
+# only processes are timed and only once data takes longer than this
+PROCESS_START_SECONDS = 0.005
+POOL_TASK_SECONDS = 0.0002
+
+
+def cpu_count() -> int:
+    '''
+    The amount of CPU cores, without importing multiprocessing
+    '''
+    return os.cpu_count() or 1
+
 
 def sha256(data:str) -> str:
     '''
@@ -34,6 +109,117 @@ def sha256(data:str) -> str:
     return base64.b64encode(hashlib.sha256(data.encode()).digest()).decode()
 
 
+def numpy_available() -> bool:
+    '''
+    Checks whether NumPy can be imported for the vectorized engine
+
+    Returns:
+        bool: True if NumPy is installed, otherwise False
+    '''
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+
+    return _numpy is not False
+
+
+def cipher_segment(key:bytes, data:str, max_range:int, reverse=False, engine='auto') -> str:
+    '''
+    Adds (or subtracts if 'reverse' is True) the integer equivalent of
+    each character in the key to the character in the same position
+    in the data, modulo 'max_range'
+
+    Args:
+        key (bytes):
+            The segment's slice of the keystream, must be atleast
+            as long as the data
+        data (str):
+            The segment of data to encrypt or decrypt
+        max_range (int):
+            The range returned by the 'range_finder' function
+        reverse (bool, default:False):
+            Subtract the key instead of adding it, used for decryption
+        engine (str, default:'auto'):
+            'numpy' runs the cipher as whole array operations, 'python'
+            runs it one character at a time, 'auto' uses NumPy when
+            it's installed
+
+    Returns:
+        str: The encrypted or decrypted segment
+    '''
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
+    if engine == 'numpy' and not numpy_available():
+        raise ImportError("The 'numpy' engine requires NumPy to be installed")
+
+    if engine == 'python' or not numpy_available():
+        if reverse:
+            return "".join([chr_((ord_(data[pos])-key[pos])%max_range) for pos in range(len(data))])
+        return "".join([chr_((ord_(data[pos])+key[pos])%max_range) for pos in range(len(data))])
+
+    # Works on the code points of the data as one array, int64 leaves
+    # room for the addition and keeps the modulo of negatives positive
+    data_codes = _numpy.frombuffer(data.encode('utf-32-le', 'surrogatepass'), dtype='<u4').astype(_numpy.int64)
+    key_codes = _numpy.frombuffer(key, dtype=_numpy.uint8)[:len(data)]
+
+    if reverse:
+        data_codes -= key_codes
+    else:
+        data_codes += key_codes
+    data_codes %= max_range
+
+    return data_codes.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass')
+
+
+def cipher_buffer(key:memoryview, data:memoryview, output:memoryview, max_range:int, reverse=False, engine='auto') -> int:
+    '''
+    The same as 'cipher_segment', but reads the code points of the data
+    from one buffer and writes the result straight into another
+
+    Args:
+        key (memoryview):
+            The segment's slice of the keystream
+        data (memoryview):
+            The code points of the data, with the format 'B', 'H' or 'I'
+        output (memoryview):
+            Where the result is written, with the format 'B', 'H' or 'I'
+        max_range (int), reverse (bool), engine (str):
+            The same as in 'cipher_segment'
+
+    Returns:
+        int: The number of code points written
+    '''
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
+    if engine == 'numpy' and not numpy_available():
+        raise ImportError("The 'numpy' engine requires NumPy to be installed")
+
+    if engine == 'python' or not numpy_available():
+        if reverse:
+            output[:] = array.array(output.format, [(code-key_code)%max_range for code, key_code in zip(data, key)])
+        else:
+            output[:] = array.array(output.format, [(code+key_code)%max_range for code, key_code in zip(data, key)])
+        return len(output)
+
+    data_codes = _numpy.frombuffer(data, dtype=data.format).astype(_numpy.int64)
+    key_codes = _numpy.frombuffer(key, dtype=_numpy.uint8)[:len(data_codes)]
+
+    if reverse:
+        data_codes -= key_codes
+    else:
+        data_codes += key_codes
+    data_codes %= max_range
+
+    _numpy.frombuffer(output, dtype=output.format)[:] = data_codes
+    return len(output)
+
+
 def data_verification(key:str, data:str) -> bool:
     '''
     Verifies the data will be encrypted and decrypted without 
@@ -42,8 +228,8 @@ def data_verification(key:str, data:str) -> bool:
     version of the same data
 
     Args:
-        key (str):
-            The key used to encrypt the data
+        key (str or Cipher):
+            The key used to encrypt the data, or a Cipher of it
 
         data (str or bytes):
             The data that will be encrypted
@@ -59,9 +245,12 @@ def data_verification(key:str, data:str) -> bool:
     size = len(data)/2
     sample_data = data[round(size):round(size+10)]
 
-    encrypted_data = encrypt(key, sample_data)
+    # Only format version 1 converts data this way, so the sample is
+    # checked in that format
+    cipher = _cipher(key)
+    encrypted_data = cipher.encrypt(sample_data, processes=1, format_version=1)
    
-    decrypted_data = decrypt(key, encrypted_data)
+    decrypted_data = cipher.decrypt(encrypted_data, processes=1)
 
     # Returns true if the origional chunck of data matches
     # the decrypted version of the data
@@ -73,8 +262,8 @@ def convert_data(key:str, data:'any data type') -> list:
     Converts the data to a string format for encryption
 
     Args:
-        key (str):
-            The key used to encrypt the data
+        key (str or Cipher):
+            The key used to encrypt the data, or a Cipher of it
 
         data ('any data type'):
             The data that will be encrypted
@@ -118,10 +307,11 @@ def convert_data_back(metadata: list) -> 'any data type':
 
     Args:
         metadata (list):
-            data (str):
+            data (str or bytes):
                 This is the data variable returned
                 the 'convert_data' function that will
-                be converted back to the 'origional_data_type'
+                be converted back to the 'origional_data_type',
+                or the bytes of the 'bytes' and 'literal' types
 
             origional_data_type (str):
                 The type returned by the 'convert_data' function,
@@ -148,22 +338,261 @@ def convert_data_back(metadata: list) -> 'any data type':
         return base64.decodebytes(data.encode())
     if origional_data_type == 'ISO-8859-1':
         return data.encode('ISO-8859-1')
-    
+    if origional_data_type == 'bytes':
+        return bytes(data)
+    if origional_data_type == 'literal':
+        return deserialize_literal(data)
+
+
+# The integers, floats and complex numbers written by 'serialize_literal'
+_LITERAL_LENGTH = struct.Struct("<I")
+_LITERAL_INT = struct.Struct("<q")
+_LITERAL_FLOAT = struct.Struct("<d")
+_LITERAL_COMPLEX = struct.Struct("<dd")
+_LITERAL_CONTAINERS = {list: b"l", tuple: b"t", set: b"e"}
+# Lengths and counts below 255 take a byte, longer ones are
+# 255 followed by the length as 4 bytes
+_LITERAL_SHORT_LENGTHS = [bytes((length,)) for length in range(255)]
+# Ints from 0 to 255 take a byte after their tag
+_LITERAL_BYTE_INTS = [b"u"+bytes((value,)) for value in range(256)]
+# The array types lists and tuples of ints are written as, smallest first
+_LITERAL_INT_ARRAYS = (('b', 1 << 7), ('h', 1 << 15), ('i', 1 << 31), ('q', 1 << 63))
+
+
+def _literal_length(length:int) -> bytes:
+    if length < 255:
+        return _LITERAL_SHORT_LENGTHS[length]
+    return b"\xff"+_LITERAL_LENGTH.pack(length)
+
+
+def _literal_array(value:'list or tuple') -> array.array:
+    '''
+    The items of a list or tuple of only ints or only floats as the
+    smallest array that holds them, or None if they aren't
+    '''
+    item_types = set(map(type, value))
+    if item_types == {float}:
+        return array.array('d', value)
+    if item_types != {int}:
+        return None
+
+    smallest, largest = min(value), max(value)
+    for typecode, limit in _LITERAL_INT_ARRAYS:
+        if -limit <= smallest and largest < limit:
+            return array.array(typecode, value)
+    return None
+
+
+def _serialize_literal(value:'literal', parts:list):
+    '''
+    Appends the tag and bytes of the value to 'parts', going
+    through containers item by item
+    '''
+    value_type = type(value)
+    if value_type is int:
+        if 0 <= value < 256:
+            parts.append(_LITERAL_BYTE_INTS[value])
+        elif -(1 << 63) <= value < 1 << 63:
+            parts += (b"i", _LITERAL_INT.pack(value))
+        else:
+            encoded = value.to_bytes(value.bit_length()//8+1, 'little', signed=True)
+            parts += (b"I", _literal_length(len(encoded)), encoded)
+    elif value_type is str:
+        encoded = value.encode('utf-8', 'surrogatepass')
+        parts += (b"s", _literal_length(len(encoded)), encoded)
+    elif value_type is float:
+        parts += (b"f", _LITERAL_FLOAT.pack(value))
+    elif value_type is dict:
+        parts += (b"d", _literal_length(len(value)))
+        for key, item in value.items():
+            _serialize_literal(key, parts)
+            _serialize_literal(item, parts)
+    elif value_type in _LITERAL_CONTAINERS:
+        # Lists and tuples of only ints or only floats are written as
+        # an array of them, which is read back without a loop
+        items = _literal_array(value) if value_type is not set and value else None
+        if items is not None:
+            if sys.byteorder != 'little':
+                items.byteswap()
+            parts += (b"a", _LITERAL_CONTAINERS[value_type], items.typecode.encode(), _literal_length(len(items)), items)
+            return
+
+        parts += (_LITERAL_CONTAINERS[value_type], _literal_length(len(value)))
+        for item in value:
+            _serialize_literal(item, parts)
+    elif value_type is bytes:
+        parts += (b"b", _literal_length(len(value)), value)
+    elif value is None:
+        parts.append(b"N")
+    elif value is True:
+        parts.append(b"T")
+    elif value is False:
+        parts.append(b"F")
+    elif value_type is complex:
+        parts += (b"c", _LITERAL_COMPLEX.pack(value.real, value.imag))
+    else:
+        raise TypeError(f"'{value_type.__name__}' isn't a literal 'serialize_literal' can serialize")
+
+
+def serialize_literal(data:'literal') -> bytes:
+    '''
+    Serializes python literals to compact bytes that 'deserialize_literal'
+    reads back, without pickle, so reading them never runs any code.
+    Lists and tuples of only ints or only floats are written as arrays
+
+    Args:
+        data (literal):
+            None, a bool, int, float, complex, str or bytes, or lists,
+            tuples, sets and dicts of them
+
+    Returns:
+        bytes: A tag byte before each value, with lengths, counts
+               and numbers little endian
+
+    Raises:
+        TypeError: If anything in the data isn't one of those types
+    '''
+    parts = []
+    _serialize_literal(data, parts)
+    return b"".join(parts)
+
+
+def _deserialize_literal(view:memoryview, offset:int) -> tuple:
+    '''
+    Reads the value starting at 'offset', returning it along with
+    the offset after it
+    '''
+    tag = view[offset]
+    offset += 1
+    if tag == 0x75: # u
+        return view[offset], offset+1
+    if tag == 0x69: # i
+        return _LITERAL_INT.unpack_from(view, offset)[0], offset+_LITERAL_INT.size
+    if tag == 0x66: # f
+        return _LITERAL_FLOAT.unpack_from(view, offset)[0], offset+_LITERAL_FLOAT.size
+    if tag in b"NTF":
+        return {0x4E: None, 0x54: True, 0x46: False}[tag], offset
+    if tag == 0x63: # c
+        return complex(*_LITERAL_COMPLEX.unpack_from(view, offset)), offset+_LITERAL_COMPLEX.size
+
+    if tag == 0x61: # a
+        container, typecode = view[offset], view[offset+1]
+        offset += 2
+    # Every other tag is followed by a length or count
+    length = view[offset]
+    offset += 1
+    if length == 255:
+        length, = _LITERAL_LENGTH.unpack_from(view, offset)
+        offset += _LITERAL_LENGTH.size
+
+    if tag in b"sbI":
+        if offset+length > len(view):
+            raise ValueError("The literal data is truncated")
+        encoded = view[offset:offset+length]
+        if tag == 0x73: # s
+            value = codecs.utf_8_decode(encoded, 'surrogatepass', True)[0]
+        elif tag == 0x62: # b
+            value = bytes(encoded)
+        else:
+            value = int.from_bytes(encoded, 'little', signed=True)
+        return value, offset+length
+
+    if tag in b"dlte":
+        count = length*2 if tag == 0x64 else length
+        # Every value is atleast a byte, so a corrupted count can't
+        # make a list much larger than the data
+        if count > len(view)-offset:
+            raise ValueError("The literal data is truncated")
+        items = []
+        for _ in range(count):
+            item, offset = _deserialize_literal(view, offset)
+            items.append(item)
+        if tag == 0x64: # d
+            return dict(zip(items[::2], items[1::2])), offset
+        if tag == 0x6C: # l
+            return items, offset
+        return (tuple(items) if tag == 0x74 else set(items)), offset
+
+    if tag == 0x61 and container in b"lt" and typecode in b"bhiqd":
+        items = array.array(chr_(typecode))
+        end = offset+length*items.itemsize
+        if end > len(view):
+            raise ValueError("The literal data is truncated")
+        items.frombytes(view[offset:end])
+        if sys.byteorder != 'little':
+            items.byteswap()
+        return (items.tolist() if container == 0x6C else tuple(items)), end
+    raise ValueError(f"Unknown literal tag {tag}")
+
+
+def deserialize_literal(data:'bytes-like') -> 'literal':
+    '''
+    Reads back the literal serialized by 'serialize_literal', only ever
+    building the literal types, so it's safe for untrusted data
+
+    Args:
+        data (bytes-like):
+            The output of 'serialize_literal'
+
+    Returns:
+        literal: The same literal that was serialized
+
+    Raises:
+        ValueError: If the data is truncated or corrupted
+    '''
+    view = memoryview(data).cast('B')
+    try:
+        value, offset = _deserialize_literal(view, 0)
+    except (IndexError, struct.error, TypeError, RecursionError) as exception:
+        # Truncated numbers, unhashable set items or dict keys, or nesting too deep
+        raise ValueError(f"The literal data is corrupted: {exception}") from None
+    if offset != len(view):
+        raise ValueError("The literal data has bytes after its end")
+    return value
+
+
+def _convert_data_v2(key:'Cipher', data:'any data type') -> tuple:
+    '''
+    Converts the data the way format version 2 encrypts it. Bytes and
+    str are kept as they are without being copied, literals are
+    serialized and anything else goes through 'convert_data'
+
+    Returns:
+        tuple:
+            [0]: The data, bytes-like for the 'BINARY_DATA_TYPES'
+                 and str for the rest
+            [1]: The origional type of the data
+    '''
+    if type(data) in (bytes, bytearray):
+        return data, 'bytes'
+    if type(data) != str:
+        try:
+            return serialize_literal(data), 'literal'
+        except TypeError:
+            # Anything else is kept as its str for 'ast' to read back
+            pass
+
+    return convert_data(key, data)
 
-def range_finder(data:str or bytes) -> int:
+
+def range_finder(data:str or bytes, code_points=False) -> int:
     '''
     Finds the character with the largest integer equivalent in your data
 
     Args:
         data (str or bytes):
             The data to be used for encryption/decryption
+        code_points (bool, default:False):
+            Measures str data by its code points rather than its UTF-8
+            bytes, which format version 2 needs to keep characters
+            outside of ascii intact
 
     Returns:
         int: The largest integer equivalent character of the data
 
     '''
     if type(data) == str:
-        data = data.encode()
+        data = [ord_(max(data))] if code_points else data.encode()
 
     # Adding 1 to prevent future mathematical errors during decryption
     max_range = max(data)+1
@@ -175,407 +604,2611 @@ def range_finder(data:str or bytes) -> int:
     return max_range
 
 
-def create_key(key:str, data_length:int) -> bytes:
+def _symbol_format(max_range:int) -> str:
     '''
-    Uses the sha256 hash of the 'key' parameter to create and 
-    concatenate more keys (based upon the origional) to a new 
-    key variable that is either the same size as or slighty 
-    larger than the length of the data 
-   
-    Args:
-        key (str):
-            The key used for encryption and decryption
-        data_length (int):
-            The length of the data to be encrypted or decrypted
+    The smallest array format that holds every value below 'max_range'
+    '''
+    if max_range <= 1 << 8:
+        return 'B'
+    if max_range <= 1 << 16:
+        return 'H'
+    return 'I'
 
-    Returns:
-        bytes: The bytes equivalent of the combined keys
 
+def _code_points(data:'str or bytes-like', data_format='B') -> tuple:
     '''
+    Describes the code points of the data without copying all of it
 
-    new_key = ""
-    length_of_hash = len(sha256("x"))
-
-    # The number of iterations required to match the length of 
-    # 'new_key' and 'data_length'
-    required_key_length = math.ceil(data_length/length_of_hash)
+    Args:
+        data (str or bytes-like):
+            str is encoded one range at a time, anything else is taken
+            to already be code points in the 'data_format'
+        data_format (str, default:'B'):
+            The array format of bytes-like data
 
-    # Puts an integer at the end of the origional key and adds
-    # the hash of that to the combined 'new_key' variable
-    for i in range(required_key_length+5):
-        new_key += sha256(key+str(i))
+    Returns:
+        tuple:
+            [0]: The array format of the code points
+            [1]: A function taking (start, stop) and returning the
+                 code points in that range as bytes
+    '''
+    if type(data) == str:
+        if data.isascii() or max(data) <= '\xff':
+            return 'B', lambda start, stop: data[start:stop].encode('latin-1')
+        encoding = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+        return 'I', lambda start, stop: data[start:stop].encode(encoding, 'surrogatepass')
 
-    return new_key
+    view = memoryview(data).cast('B')
+    width = struct.calcsize(data_format)
+    return data_format, lambda start, stop: view[start*width:stop*width]
 
 
-def segment_data(data:'iterable', segments:int) -> list:
+def _prefixed_code_points(prefix:str, data:'str or bytes-like') -> tuple:
     '''
-    Splits the data evenly amongst the amount of 'segments' required
-
-    Args:
-        data (any iterable):
-            The data to evenly split
-        segments (int):
-            The amount of splits you want in the data
-
-    Returns:
-        list: 
-            A list of evenly distributed items from the data
+    The same as '_code_points' of the prefix followed by the data,
+    without joining them into a copy of the data
     '''
+    data_format, data_segment = _code_points(data)
+    prefix_codes = array.array(data_format, map(ord_, prefix)).tobytes()
+    prefix_length = len(prefix)
+    width = struct.calcsize(data_format)
 
-    # The number of items per segment, if all segments were even
-    segment_length_estimate = 1
-    data_length_adjustment = 0
-    remaining_data_length = 0
-    if len(data) > segments:
-        segment_length_estimate = int(len(data)/segments)
-        data_length_adjustment = -1
+    def segment(start:int, stop:int) -> 'bytes-like':
+        if start >= prefix_length:
+            return data_segment(start-prefix_length, stop-prefix_length)
+        # Only the range holding the prefix is joined
+        return prefix_codes[start*width:min(stop, prefix_length)*width] + data_segment(0, max(stop-prefix_length, 0))
 
-        # The remaining items after the segments are all equal in length
-        remaining_data_length = len(data)%segments
+    return data_format, segment
 
-    # Get all evenly distributed segments
-    segmented_data = [
-        data[position:position+segment_length_estimate]
-        for position in range(0, len(data)+data_length_adjustment, segment_length_estimate)
-    ]
 
-    # While there are more segments than specified
-    while len(segmented_data) > segments:
-        # Remove & return the extra segment
-        extra_segment = segmented_data.pop()
-        # While there are items in the extra segment
-        while len(extra_segment):
-            # Loop through each prior segment, and move a single item from the
-            # extra segment onto the segments until the extra_segment is empty
-            for position in range(0, len(segmented_data)-1):
-                # If the extra segment runs out before the loop ends
-                if not len(extra_segment):
-                    break
-                extra_segment_item = extra_segment.pop()
-                segmented_data[position].append(extra_segment_item)
+def _decode_code_points(data:'bytes-like', data_format:str) -> str:
+    '''
+    Turns a buffer of code points in the format 'B' or 'I' into a str
+    '''
+    if data_format == 'B':
+        return codecs.latin_1_decode(data)[0]
+    encoding = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+    return codecs.decode(data, encoding, 'surrogatepass')
 
-    # Eliminite any empty segments
-    return list(filter(None, segmented_data))
+
+def _little_endian(data:'bytes-like', data_format:str) -> 'bytes-like':
+    '''
+    Converts code points between the machine's byte order and the little
+    endian order they're stored in, which is the same on most machines
+    '''
+    if sys.byteorder == 'little' or struct.calcsize(data_format) == 1:
+        return data
+    swapped = array.array(data_format, data)
+    swapped.byteswap()
+    return swapped.tobytes()
 
 
-def pull_metadata(key:str, data:bytes) -> dict:
+def read_header(data:bytes) -> dict:
     '''
-    Pulls metadata from the encrypted bytes and puts it in a 
-    dictionary for easy readibility and manipulation
+    Reads the fixed header at the start of data encrypted with format
+    version 2, without looking at any of the data after it
 
     Args:
         data (bytes):
-            The ouput of running the encryption function
-        key (bytes):
-            The key used to encrypt the data            
+            The encrypted data, or atleast its first 'HEADER.size' bytes
 
     Returns:
-        dict: A dictionary of the metadata and encrypted data
+        dict: The version, type, flags, compression, range, length
+              and symbol format
     '''
-    metadata_dictionary = {}
-    data = data.decode()
-
-    # Getting the metadata location information
-    splitter_chars = key[2:12]
-    position = int("".join(list(map(str, map(ord, key)))))%len(data)
-    if position >= (len(data)-30):
-        position = int(len(data) * .2)
+    if len(data) < HEADER.size or bytes(data[:len(HEADER_MAGIC)]) != HEADER_MAGIC:
+        raise ValueError("The data doesn't start with a ListCrypt header")
+
+    _, version, data_type, flags, max_range, length = HEADER.unpack_from(data)
+    if version != 2:
+        raise ValueError(f"Unsupported format version {version}")
+    data_types = {number: name for name, number in DATA_TYPES.items()}
+    if data_type not in data_types:
+        raise ValueError(f"Unknown data type {data_type}")
+    if flags & ~KNOWN_FLAGS:
+        raise ValueError(f"Unknown header flags {flags & ~KNOWN_FLAGS:#x}")
+
+    compressions = {number: name for name, number in COMPRESSIONS.items()}
+
+    return {
+        "version": version,
+        "type": data_types[data_type],
+        "flags": flags,
+        "compression": compressions.get((flags & FLAG_COMPRESSION) >> COMPRESSION_SHIFT),
+        "range": max_range,
+        "length": length,
+        "format": _symbol_format(max_range),
+    }
+
+
+def _check_length(metadata:dict, size:int) -> int:
+    '''
+    Checks the 'size' in bytes of the data after the header matches the
+    length in the header, filling in the length of streamed data
+    '''
+    width = struct.calcsize(metadata["format"])
+    if metadata["flags"] & FLAG_STREAMED and size%width == 0:
+        metadata["length"] = size//width
+    elif size != metadata["length"]*width:
+        raise ValueError("The encrypted data is truncated or corrupted")
+    return metadata["length"]
 
-    # Splitting the metadata from the regular data
-    metadata = data[position:data.index(splitter_chars)]
-    data = data.replace(metadata+splitter_chars, '')
 
-    # Decrypt metadata
-    metadata = "".join([chr_((ord_(metadata[pos])-ord_(key[pos]))%130) for pos in range(len(metadata))])
+def _check_compression(compression:str):
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {tuple(COMPRESSIONS)}")
 
-    # Divides the metadata
-    metadata_dictionary["type"] = metadata.split('(')[0]
 
-    metadata_dictionary["range"] = int(metadata.split('(')[1].replace(')',''))
+def _compressor(compression:str, decompress=False) -> 'compressor':
+    '''
+    Returns an incremental compressor, or decompressor, for one of the
+    'COMPRESSIONS', importing its module only when it's first used
+    '''
+    _check_compression(compression)
+    if compression == 'zlib':
+        import zlib
+        return zlib.decompressobj() if decompress else zlib.compressobj()
+    if compression == 'lzma':
+        import lzma
+        return lzma.LZMADecompressor() if decompress else lzma.LZMACompressor()
+    import bz2
+    return bz2.BZ2Decompressor() if decompress else bz2.BZ2Compressor()
+
+
+def _compressible(sample:'bytes-like') -> bool:
+    '''
+    Guesses whether data is worth compressing from how much its start
+    shrinks with the fastest zlib level, so data that's already
+    compressed or encrypted skips the slower compressors entirely
+    '''
+    import zlib
 
-    metadata_dictionary["data"] = data
-    
-    return metadata_dictionary
+    sample = memoryview(sample).cast('B')[:COMPRESSION_SAMPLE]
+    return len(sample) > 0 and len(zlib.compress(sample, 1)) < len(sample)*COMPRESSION_RATIO
 
 
-def encrypt(key:'any data type', data:'any data type', processes=cpu_count()) -> bytes:
+def _compress_chunks(compression:str, chunks:'iterable') -> 'generator':
     '''
-    Encrypts the data by adding each characters integer equivalent to the 
-    integer equivalent of the character in the same position in the new key 
-    variable generated by the 'key parameter'
+    Compresses the chunks as they're yielded, yielding whatever
+    compressed data the compressor has ready after each one
+    '''
+    compressor = _compressor(compression)
+    for chunk in chunks:
+        if compressed_chunk := compressor.compress(chunk):
+            yield compressed_chunk
+    yield compressor.flush()
 
-    Args:
-        key (any data type):
-            Used to create a larger key which is used for encrypting the data 
-        data (any data type):
-            The data to be encrypted
-        processes (int, default:All available CPU cores):
-            The amount of processes allowed to run simultaneously,
-            the more allowed, the faster the decryption.
-            ( Multi-cored encryption only currently available on
-            linux )
 
-    Returns:
-        bytes: The encrypted data, along with metadata for decrypting the data
-    
+def _decompress_chunks(compression:str, chunks:'iterable', chunk_size=1 << 20) -> 'generator':
     '''
-    # ListCrypt currently does not support multiprocessing in windows
-    if platform.system() != "Linux":
-        processes = 1
+    Decompresses the chunks as they're yielded, yielding atmost
+    'chunk_size' bytes at a time so data that compressed well
+    doesn't have to fit in memory all at once
+    '''
+    decompressor = _compressor(compression, decompress=True)
+    for chunk in chunks:
+        if decompressor.eof and chunk:
+            raise ValueError("The compressed data is truncated or corrupted")
+        while True:
+            try:
+                decompressed_chunk = decompressor.decompress(chunk, chunk_size)
+            except Exception as exception:
+                # Each module raises its own error for corrupted data
+                raise ValueError("The compressed data is truncated or corrupted") from exception
+            if decompressed_chunk:
+                yield decompressed_chunk
+            # zlib hands back the input it didn't get to, the others
+            # keep it and say whether they need more
+            if compression == 'zlib':
+                chunk = decompressor.unconsumed_tail
+                if not chunk:
+                    break
+            else:
+                chunk = b""
+                if decompressor.eof or decompressor.needs_input:
+                    break
+    if compression == 'zlib':
+        yield decompressor.flush()
 
-    # Finds the origional type of the data for converting back to
-    # after decryption
-    data,data_type = convert_data(key, data)
-    metadata = data_type
+    if not decompressor.eof or decompressor.unused_data:
+        raise ValueError("The compressed data is truncated or corrupted")
 
-    # Puts a random string at the start of the data before encryption
-    # to verify no data corruption during decryption
-    confirmation_data = "39"
-    data = confirmation_data+data
 
-    # Finds the max range of the data according to 
-    # each characters ord() equivalent
-    max_range = range_finder(data)
-    metadata += f"({max_range})"
+def _decompressed_chunks(compression:str, data_type:str, chunks:'iterable') -> 'generator':
+    '''
+    Decompresses the decrypted chunks after the confirmation text,
+    decoding them back to str for every type other than the
+    'BINARY_DATA_TYPES'
+    '''
+    if data_type in BINARY_DATA_TYPES:
+        yield from _decompress_chunks(compression, chunks)
+        return
 
-    metadata_key = key
-    # Creates a new, longer key from the origional 'key' variable
-    # to match or exceed the length of the data
-    key = create_key(str(key), len(data))
+    decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+    for chunk in _decompress_chunks(compression, chunks):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
 
-    # Creates a dictionary that is shared across independent processes
-    shared_dictionary = Manager().dict()
 
-    # Splits the data into segments for even distribution
-    # across CPU cores
-    segments = processes
-    segmented_data = segment_data(data, segments)
-    segmented_key = segment_data(key, segments)
+class Keystream:
+    '''
+    Lazily generates the same characters as 'create_key', block i of
+    the keystream is sha256(key+str(i)) so any offset can be reached
+    without hashing the blocks before it
 
-    # Cleaning up memory
-    data=None
+    Args:
+        key (str):
+            The key used for encryption and decryption
+        cache_size (int, default:0):
+            The most bytes of generated keystream to keep for reuse,
+            the least recently used pages are dropped past this
+    '''
+    block_size = len(sha256("x"))
+    # The keystream is cached in pages of whole blocks
+    page_size = block_size*1024
+
+    def __init__(self, key:str, cache_size=0):
+        self.key = str(key)
+        # Hashing the key once and copying the state for every block
+        # saves rehashing the key prefix each time
+        self._prefix = hashlib.sha256(self.key.encode())
+        self.cache_size = cache_size
+        self._pages = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key_length(cls, data_length:int) -> int:
+        '''
+        The length of the key 'create_key' returns for 'data_length'
+        '''
+        return (math.ceil(data_length/cls.block_size)+5)*cls.block_size
 
-    # Leaving out the first segment for the main process to run after
-    # it starts the child processes
-    child_segmented_data = segmented_data[1:]
-    child_segmented_key = segmented_key[1:]
+    def block(self, index:int) -> bytes:
+        '''
+        Returns the 'index'th block of the keystream
+        '''
+        block_hash = self._prefix.copy()
+        block_hash.update(str(index).encode())
+        return base64.b64encode(block_hash.digest())
 
-    def multiprocess_encryption(key:str, data:str, segment:int, shared_dictionary:dict) -> bool:
+    def readinto(self, buffer:'writable bytes-like', offset:int) -> int:
         '''
-        Takes chuncks of data and adds them to a shared dictionary,
-        with the keys being the segments origional position for concatenation
-        after encryption
+        Fills a preallocated buffer with the keystream starting at
+        the character 'offset'
 
         Args:
-            data (str):
-                The string of data to be encrypted
-            segment (int):
-                The origional location of the data in the list variable
-                'segmented_data', so it can be concatenated back into the
-                correct order from the dictionary
-            shared_dictionary (dict):
-                Special dictionary created by 'multiprocessing.Manager()'
-                to be shared across multiple independent processes
+            buffer (bytearray or memoryview):
+                Filled completely with keystream bytes
+            offset (int):
+                The position in the keystream to start at
 
         Returns:
-            bool: True if the function runs successfully, otherwise Error
+            int: The number of bytes written to the buffer
         '''
-        # Encrypts the data
-        encrypted_data = "".join([chr_((ord_(data[pos])+ord_(key[pos]))%max_range) for pos in range(len(data))])
-
-        # Adds the data to the shared_dictionary
-        shared_dictionary[segment] = encrypted_data
-
-        return True
+        buffer = memoryview(buffer).cast('B')
+        length = len(buffer)
+        if self.cache_size >= self.page_size:
+            return self._readinto_pages(buffer, offset)
 
-    still_alive = []
+        block_index, skip = divmod(offset, self.block_size)
+        written = 0
 
+        while written < length:
+            block = self.block(block_index)[skip:length-written+skip]
+            buffer[written:written+len(block)] = block
+            written += len(block)
+            block_index += 1
+            skip = 0
 
-    if segments > 1:
-        # Starting multiple process for the 
-        # 'multiprocess_encryption' function
-        for data_segment,key_segment,process in zip(child_segmented_data, child_segmented_key, range(1,segments)):
-            p = Process(target=multiprocess_encryption, args=(key_segment, data_segment, process, shared_dictionary))
-            p.start()
-            still_alive.append(p)
+        return written
 
+    def page(self, index:int) -> bytes:
+        '''
+        Returns the 'index'th page of the keystream, from the cache
+        when it's been generated before
+        '''
+        with self._lock:
+            if index in self._pages:
+                self._pages.move_to_end(index)
+                return self._pages[index]
 
-    # Encrypts the first segment of data with the main process
-    multiprocess_encryption(segmented_key[:1][0], segmented_data[:1][0], 0, shared_dictionary)
+        blocks_per_page = self.page_size//self.block_size
+        first_block = index*blocks_per_page
+        page = b"".join([self.block(block_index) for block_index in range(first_block, first_block+blocks_per_page)])
 
-    # Waits until all processes have finished and terminated
-    while still_alive:
-        removal = [item for item in still_alive if not item.is_alive()]
-        [still_alive.remove(item) for item in removal]
-    
-    # Encrypt the metadata
-    key = sha256(metadata_key)
-    encrypted_metadata = "".join([chr_((ord_(metadata[pos])+ord_(key[pos]))%130) for pos in range(len(metadata))])
+        with self._lock:
+            self._pages[index] = page
+            while len(self._pages)*self.page_size > self.cache_size:
+                self._pages.popitem(last=False)
 
-    # Adds the metadata to the start of the data
-    encrypted_data = "".join([shared_dictionary[count] for count in range(segments)])
-    shared_dictionary = None;
+        return page
 
-    # Creating a seemingly random position to place the metadata in the data
-    key = sha256(str(metadata_key))
-    splitter_chars = key[2:12]
+    def _readinto_pages(self, buffer:memoryview, offset:int) -> int:
+        '''
+        'readinto' for a keystream with a cache, copying whole
+        pages rather than generating each block
+        '''
+        length = len(buffer)
+        page_index, skip = divmod(offset, self.page_size)
+        written = 0
 
-    # Turns the key to its integer equivalent and takes it by
-    # the mode of the len of the data
-    all_encrypted_data_length = len(encrypted_data)+len(splitter_chars)+len(encrypted_metadata)
-    position = int("".join(list(map(str, map(ord, key)))))%(all_encrypted_data_length)
-    if position >= all_encrypted_data_length-30:
-        position = int(all_encrypted_data_length * .2)
+        while written < length:
+            page = self.page(page_index)[skip:length-written+skip]
+            buffer[written:written+len(page)] = page
+            written += len(page)
+            page_index += 1
+            skip = 0
 
-    # Join the metadata with the regular data
-    index_data = encrypted_data[position:position+100]
+        return written
 
-    encrypted_data = encrypted_data.split(index_data)
-    encrypted_data = encrypted_data[0]+encrypted_metadata+splitter_chars+index_data+encrypted_data[1]
+    def clear_cache(self):
+        '''
+        Drops every cached page of the keystream
+        '''
+        with self._lock:
+            self._pages.clear()
 
-    return encrypted_data.encode()
+    def read(self, offset:int, length:int) -> bytes:
+        '''
+        Returns 'length' bytes of the keystream starting at the
+        character 'offset'
+        '''
+        buffer = bytearray(length)
+        self.readinto(buffer, offset)
+        return bytes(buffer)
 
 
-def decrypt(key:"any data type", encrypted_data:bytes, processes=cpu_count()) -> "origional data":
+def create_key(key:str, data_length:int) -> str:
     '''
-    Decrypts the data by subtracting each characters integer equivalent
-    by the integer equivalent of the character in the same position in 
-    the new key variable generated by the 'key parameter'
-
+    Uses the sha256 hash of the 'key' parameter to create and 
+    concatenate more keys (based upon the origional) to a new 
+    key variable that is either the same size as or slighty 
+    larger than the length of the data 
+   
     Args:
-        key (any data type):
-            Used to create a larger key which is used for encrypting the data
-        encrypted_data (bytes):
-            The encrypted bytes returned by the 'encrypt' function
-        processes (int, preset:All available CPU cores):
-            The amount of processes allowed to run simultaneously, 
-            the more allowed, the faster the decryption.
-            
-            ( Multi-cored decryption only currently available on linux )
+        key (str):
+            The key used for encryption and decryption
+        data_length (int):
+            The length of the data to be encrypted or decrypted
 
     Returns:
-        The origional data
-            
+        str: The combined keys
+
     '''
-    # ListCrypt currently does not support multiprocessing in windows
-    if platform.system() != "Linux":
-        processes = 1
+    return Keystream(key).read(0, Keystream.key_length(data_length)).decode()
 
-    # Converts the metadata to variables for easy usability
-    confirmation_data = "39"
-    metadata_dictionary = pull_metadata(sha256(str(key)), encrypted_data)
-    origional_data_type = metadata_dictionary["type"]
-    max_range = metadata_dictionary["range"]
-    data = metadata_dictionary["data"]
 
-    # Creates a new, longer key from the origional 'key' variable
-    # to match or exceed the length of the data
-    key = create_key(str(key), len(data))
+def _key_offsets(data_length:int, segments:int) -> list:
+    '''
+    Returns where each segment starts reading the keystream. Segments
+    have always started at an even split of the full 'create_key'
+    length rather than at their position in the data, so this is
+    kept for compatibility with already encrypted data
+    '''
+    key_length = Keystream.key_length(data_length)
+    segment_length = key_length//segments if key_length > segments else 1
 
-    # Creates a dictionary that is shared across independent processes
-    shared_dictionary = Manager().dict()
+    return [segment*segment_length for segment in range(segments)]
 
-    # Splits the data and key into segments for even
-    # distribution across cpu cores
-    segments = processes
-    segmented_data = segment_data(data, segments)
-    segmented_key = segment_data(key, segments)
 
-    # Leaving out the first segment for the main process to run
-    # after it starts the child processes
-    child_segmented_data = segmented_data[1:]
-    child_segmented_key = segmented_key[1:]
+def _legacy_segment_ranges(data_length:int, segments:int) -> list:
+    '''
+    Returns the (start, stop) range of each segment format version 1
+    data is split into, the last segment takes any remaining characters.
+    Each segment reads the keystream from its own '_key_offsets' offset,
+    so this layout can't change without breaking already encrypted data
+    '''
+    segments = max(1, min(segments, data_length))
+    segment_length = data_length//segments
 
-    def multiprocess_decryption(key, data:str, segment:int, shared_dictionary:dict) -> bool:
-        '''
-        Takes chuncks of data from each process and adds them to a shared
-        dictionary, with the 'segment' parameter being the origional 
-        position for concatenation after encryption
+    starts = [segment*segment_length for segment in range(segments)]
+    return list(zip(starts, starts[1:]+[data_length]))
 
-        Args:
-            data (str):
-                The string of data to be decrypted
-            segment (int):
-                The origional location of the data in the list variable
-                'segmented_data', so it can be concatenated back into
-                the correct order from the dictionary
-            shared_dictionary (dict):
-                Special dictionary created by 'multiprocessing.Manager()'
-                to be shared across multiple independent processes
 
-        Returns:
-            bool: True if the function runs successfully, otherwise Error
-        '''
-        # Decrypts the data
-        decrypted_data = "".join([chr_((ord_(data[pos])-ord_(key[pos]))%max_range) for pos in range(len(data))])
-        # Adds the data to the shared_dictionary
-        shared_dictionary[segment] = decrypted_data
+def segment_ranges(length:int, segments:int, min_segment_length=1, oversubscription=1) -> list:
+    '''
+    Splits 'length' items into (start, stop) ranges without touching the
+    data, in time proportional to the amount of ranges
 
-    still_alive = []
+    Args:
+        length (int):
+            The amount of items to split
+        segments (int):
+            The amount of ranges wanted, usually the amount of workers
+        min_segment_length (int, default:1):
+            No range is shorter than this, so there are fewer ranges
+            when there isn't enough data to go around
+        oversubscription (int, default:1):
+            How many ranges to make per segment, so work can be
+            balanced across workers that finish at different times
 
-    if segments > 1:
-        # Starting multiple process for the 'multiprocess_decryption' function
-        for data_segment,key_segment,process in zip(child_segmented_data, child_segmented_key, range(1,segments)):
-            p = Process(target=multiprocess_decryption, args=(key_segment, data_segment, process, shared_dictionary))
-            p.start()
-            still_alive.append(p)
+    Returns:
+        list:
+            Neighbouring ranges covering 0 to 'length' whose lengths differ by
+            atmost 1, atleast one range is always returned, (0, 0) for no items
+    '''
+    if segments < 1 or min_segment_length < 1 or oversubscription < 1:
+        raise ValueError("'segments', 'min_segment_length' and 'oversubscription' must be atleast 1")
 
+    count = max(1, min(segments*oversubscription, length//min_segment_length))
+    segment_length, remainder = divmod(length, count)
 
-    # Encrypts the first segment of data with the main process
-    multiprocess_decryption(segmented_key[:1][0], segmented_data[:1][0], 0, shared_dictionary)
+    # The first 'remainder' ranges each take one of the leftover items
+    ranges = []
+    start = 0
+    for segment in range(count):
+        stop = start+segment_length+(segment < remainder)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
 
-    # Waits until all processes have finished and terminated
-    while still_alive:
-        removal = [item for item in still_alive if not item.is_alive()]
-        [still_alive.remove(item) for item in removal]
 
-    # Concatenating the data from the shared dictionary, into one string
-    decrypted_data = "".join([shared_dictionary[count] for count in range(segments)])
+def _ranges(length:int, processes:int, pool:'WorkerPool') -> list:
+    '''
+    The ranges format version 2 data is split into, a pool gets several
+    per worker while processes started for the call get one each
+    '''
+    return segment_ranges(length, processes, MIN_SEGMENT_LENGTH, SEGMENTS_PER_WORKER if pool is not None else 1)
 
-    # Pulls confirmation text from data to verify successful decryption
-    pulled_confirmation = decrypted_data[:len(confirmation_data)]
 
-    # If True the origional data is returned, 
-    # otherwise the function returns False
-    if pulled_confirmation == confirmation_data:
-        decrypted_data = decrypted_data[len(confirmation_data):]
+def segment_data(data:'iterable', segments:int) -> list:
+    '''
+    Splits the data evenly amongst the amount of 'segments' required
 
-        # Converting data back to origional type
-        return convert_data_back((decrypted_data, origional_data_type))
+    Args:
+        data (any iterable):
+            The data to evenly split
+        segments (int):
+            The amount of splits you want in the data
 
+    Returns:
+        list: 
+            A list of evenly distributed items from the data
+    '''
+    # Eliminite any empty segments
+    return [data[start:stop] for start, stop in segment_ranges(len(data), max(1, segments)) if start < stop]
+
+
+def _segment_pieces(offset:int, length:int, data_length:int, segments:int) -> list:
+    '''
+    Splits 'length' characters of the data starting at 'offset' where
+    'encrypt' with 'segments' processes changes keystream offset, so
+    a chunk of the data can be ciphered on its own
+
+    Returns:
+        list: The start, stop and keystream offset of each piece
+    '''
+    ranges = _legacy_segment_ranges(data_length, segments)
+    key_offsets = _key_offsets(data_length, segments)
+
+    pieces = []
+    position = offset
+    segment = 0
+    while position < offset+length:
+        while segment < len(ranges)-1 and position >= ranges[segment][1]:
+            segment += 1
+        start, stop = ranges[segment]
+        stop = offset+length if segment == len(ranges)-1 else min(stop, offset+length)
+        pieces.append((position, stop, key_offsets[segment]+position-start))
+        position = stop
+
+    return pieces
+
+
+@functools.lru_cache(maxsize=128)
+def _metadata_number(key:str) -> int:
+    '''
+    The integer equivalent of the hashed key, which can be hundreds
+    of digits long so it's kept for keys used repeatedly
+    '''
+    return int("".join(list(map(str, map(ord, key)))))
+
+
+def _metadata_position(key:str, data_length:int) -> int:
+    '''
+    Turns the hashed key into a seemingly random position for the
+    metadata in data of 'data_length' characters
+    '''
+    position = _metadata_number(key)%data_length
+    if position >= data_length-30:
+        position = int(data_length * .2)
+
+    return position
+
+
+def pull_metadata(key:str, data:bytes) -> dict:
+    '''
+    Pulls metadata from the encrypted bytes and puts it in a 
+    dictionary for easy readibility and manipulation
+
+    Args:
+        data (bytes):
+            The ouput of running the encryption function
+        key (bytes):
+            The key used to encrypt the data            
+
+    Returns:
+        dict: A dictionary of the metadata and encrypted data
+    '''
+    # Format version 2 keeps its metadata in a fixed header
+    if bytes(data[:len(HEADER_MAGIC)]) == HEADER_MAGIC:
+        metadata_dictionary = read_header(data)
+        metadata_dictionary["data"] = memoryview(data)[HEADER.size:]
+        _check_length(metadata_dictionary, len(metadata_dictionary["data"]))
+
+        return metadata_dictionary
+
+    metadata_dictionary = {"version": 1}
+    data = data.decode()
+
+    # Getting the metadata location information
+    splitter_chars = key[2:12]
+    position = _metadata_position(key, len(data))
+
+    # Splitting the metadata from the regular data
+    metadata = data[position:data.index(splitter_chars)]
+    data = data.replace(metadata+splitter_chars, '')
+
+    # Decrypt metadata
+    metadata = "".join([chr_((ord_(metadata[pos])-ord_(key[pos]))%130) for pos in range(len(metadata))])
+
+    # Divides the metadata
+    metadata_dictionary["type"] = metadata.split('(')[0]
+
+    metadata_dictionary["range"] = int(metadata.split('(')[1].replace(')',''))
+
+    metadata_dictionary["data"] = data
+    
+    return metadata_dictionary
+
+
+class SegmentError(Exception):
+    '''
+    Raised in the caller when the worker handling a segment fails,
+    the origional exception is kept as the cause
+
+    Attributes:
+        segment (int): The position of the segment that failed
+    '''
+    def __init__(self, segment:int, message:str):
+        super().__init__(f"Segment {segment} failed: {message}")
+        self.segment = segment
+
+
+class Stats:
+    '''
+    Collects how long each stage of encrypting or decrypting takes,
+    passed to the 'stats' argument. The stages are 'conversion', 'key
+    expansion', 'segmentation', 'dispatch', 'cipher', 'join' and
+    'metadata', the same Stats can be passed to several calls to add
+    them together. Without a Stats each stage costs a single 'is None'
+    check
+
+    >>> stats = Stats()
+    >>> encrypted_data = encrypt(key, data, stats=stats)
+    >>> stats.as_dict()
+
+    Args:
+        callback (callable, *optional):
+            Called with a dict for every event, either
+            {"event": "stage", "stage": name, "seconds": seconds} as each
+            stage finishes, or {"event": "progress", "done": segments,
+            "total": segments} as each segment or file chunk finishes
+
+    Attributes:
+        stages (dict): The seconds spent in each stage
+        bytes_processed (int): The amount of characters ciphered
+        peak_segment (int): The most characters given to one worker
+    '''
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages = {}
+        self.bytes_processed = 0
+        self.peak_segment = 0
+        # Calls on the async functions' threads can share a Stats,
+        # so each thread times its own laps
+        self._lock = threading.Lock()
+        self._laps = threading.local()
+
+    def __getstate__(self) -> dict:
+        # The locks and callback stay behind when a Stats is sent back
+        # from another process, only what it collected is sent
+        return {"stages": self.stages, "bytes_processed": self.bytes_processed, "peak_segment": self.peak_segment}
+
+    def __setstate__(self, state:dict):
+        self.__init__()
+        self.stages = state["stages"]
+        self.bytes_processed = state["bytes_processed"]
+        self.peak_segment = state["peak_segment"]
+
+    def lap(self, stage=None):
+        '''
+        Adds the time since the last lap in this thread to 'stage',
+        without a stage it only starts timing the next lap
+        '''
+        now = time.perf_counter()
+        if stage is not None:
+            self.add_stage(stage, now-getattr(self._laps, "last", now))
+        self._laps.last = now
+
+    def add_stage(self, name:str, seconds:float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0)+seconds
+        if self.callback is not None:
+            self.callback({"event": "stage", "stage": name, "seconds": seconds})
+
+    def record_segments(self, ranges:list):
+        '''
+        Adds the (start, stop) ranges being ciphered
+        '''
+        with self._lock:
+            for start, stop in ranges:
+                self.bytes_processed += stop-start
+                self.peak_segment = max(self.peak_segment, stop-start)
+
+    def merge(self, other:'Stats'):
+        '''
+        Adds the stages and totals collected by another Stats, such
+        as one filled in by a call in another process
+        '''
+        for name, seconds in other.stages.items():
+            self.add_stage(name, seconds)
+        with self._lock:
+            self.bytes_processed += other.bytes_processed
+            self.peak_segment = max(self.peak_segment, other.peak_segment)
+
+    def progress(self, done:int, total:int):
+        if self.callback is not None:
+            self.callback({"event": "progress", "done": done, "total": total})
+
+    def as_dict(self) -> dict:
+        '''
+        Returns the stages and totals, along with the throughput
+        in bytes per second of the time spent ciphering
+        '''
+        with self._lock:
+            cipher_seconds = self.stages.get('cipher', 0)
+            return {
+                "stages": dict(self.stages),
+                "seconds": sum(self.stages.values()),
+                "bytes_processed": self.bytes_processed,
+                "peak_segment": self.peak_segment,
+                "throughput": self.bytes_processed/cipher_seconds if cipher_seconds else None,
+            }
+
+
+def _cipher_task(task:tuple) -> bytearray:
+    '''
+    Runs 'cipher_buffer' over the code points in a task, returning
+    the resulting code points
+    '''
+    key, data, data_format, output_format, max_range, reverse, engine = task
+    data = memoryview(data).cast(data_format)
+    output = bytearray(len(data)*struct.calcsize(output_format))
+    cipher_buffer(key, data, memoryview(output).cast(output_format), max_range, reverse, engine)
+    return output
+
+
+def _keyed_cipher_task(task:tuple) -> bytearray:
+    '''
+    Runs 'cipher_buffer' over the code points in a task like
+    '_cipher_task', but generates the range's part of the keystream in
+    the worker 'WINDOW_LENGTH' characters at a time from the key and
+    where the range starts reading it, so the workers expand the
+    keystream in parallel instead of the parent hashing all of it
+    '''
+    key, key_offset, data, data_format, output_format, max_range, reverse, engine = task
+    keystream = Keystream(key)
+    data = memoryview(data).cast(data_format)
+    output = bytearray(len(data)*struct.calcsize(output_format))
+    window_key = bytearray(min(WINDOW_LENGTH, len(data)))
+
+    with memoryview(output).cast(output_format) as output_view:
+        for start in range(0, len(data), WINDOW_LENGTH):
+            stop = min(start+WINDOW_LENGTH, len(data))
+            with memoryview(window_key)[:stop-start] as key_view:
+                keystream.readinto(key_view, key_offset+start)
+                cipher_buffer(key_view, data[start:stop], output_view[start:stop], max_range, reverse, engine)
+    return output
+
+
+def multiprocess_cipher(function:'callable', task:tuple, connection:'Connection') -> bool:
+    '''
+    Runs 'function(task)' in a child process and sends the result, or
+    the exception it raised, back through the connection
+
+    Args:
+        function (callable):
+            The function to run, such as '_cipher_task'
+        task (tuple):
+            The single argument passed to the function
+        connection (multiprocessing.connection.Connection):
+            The writing end of a pipe back to the parent process
+
+    Returns:
+        bool: True if the function ran successfully, otherwise False
+    '''
+    try:
+        connection.send((True, function(task)))
+        return True
+    except BaseException as exception:
+        try:
+            connection.send((False, exception))
+        except Exception:
+            # The exception itself couldn't be pickled
+            connection.send((False, RuntimeError(repr(exception))))
+        return False
+    finally:
+        connection.close()
+
+
+class WorkerPool:
+    '''
+    A reusable set of worker processes for 'encrypt' and 'decrypt', the
+    workers are started once and stay running between calls
+
+    Usable as a context manager, which closes the workers on exit
+
+    >>> with WorkerPool(4) as pool:
+    ...     encrypted_data = encrypt(key, data, processes=4, pool=pool)
+
+    Args:
+        processes (int, default:All available CPU cores):
+            The amount of worker processes to keep running
+    '''
+    def __init__(self, processes=cpu_count()):
+        self.processes = processes
+        self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def start(self):
+        '''
+        Starts the workers, this happens automatically on first use
+        '''
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import resource_tracker
+
+            # Workers share the parent's tracker for shared memory only
+            # if it's running before they're started
+            resource_tracker.ensure_running()
+            # An executor fails every waiting task with BrokenProcessPool
+            # when a worker dies, where a multiprocessing Pool would
+            # replace the worker and never return the task's result
+            self._executor = ProcessPoolExecutor(self.processes)
+
+    def submit(self, function:'callable', task:'any data type') -> 'Future':
+        '''
+        Runs 'function(task)' on one of the workers, returning a
+        concurrent.futures Future of its result
+        '''
+        self.start()
+        return self._executor.submit(function, task)
+
+    def imap(self, function:'callable', iterable:'iterable') -> 'iterator':
+        '''
+        Runs the function over the iterable on the workers,
+        yielding the results in order
+        '''
+        self.start()
+        return self._executor.map(function, iterable)
+
+    def terminate(self):
+        '''
+        Stops the workers straight away, abandoning any remaining work.
+        New workers are started the next time the pool is used
+        '''
+        if self._executor is not None:
+            # Executors can only cancel tasks that haven't started, so
+            # the workers running the rest are stopped directly
+            for process in list((self._executor._processes or {}).values()):
+                process.terminate()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def imap_unordered(self, function:'callable', iterable:'iterable') -> 'iterator':
+        '''
+        Runs the function over the iterable on the workers,
+        yielding the results as they finish
+        '''
+        from concurrent.futures import as_completed
+
+        futures = [self.submit(function, task) for task in iterable]
+        return (future.result() for future in as_completed(futures))
+
+    def close(self):
+        '''
+        Stops the workers once they finish any remaining work
+        '''
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _run_tasks(function:'callable', tasks:'iterable', pool:WorkerPool, timeout:float, stats=None) -> list:
+    '''
+    Runs 'function' over every task in parallel, on the pool's workers
+    if one is given, otherwise on a new process per task with the first
+    task run by the main process. Blocks until every task finishes
+    without polling the workers, raising 'SegmentError' if any of
+    the workers fail
+
+    Args:
+        function (callable):
+            A module level function taking a single task
+        tasks (list):
+            The tasks, one per segment
+        pool (WorkerPool or None):
+            The pool to run the tasks on
+        timeout (float or None):
+            Seconds to wait for every task to finish before the
+            workers are stopped and TimeoutError is raised
+        stats (Stats or None):
+            Records the time spent starting and waiting on the
+            workers, and the progress as each task finishes
+
+    Returns:
+        list: The result of each task, in the order of the tasks
+    '''
+    tasks = list(tasks)
+    total = len(tasks)
+    deadline = None if timeout is None else time.monotonic()+timeout
+
+    def remaining() -> float:
+        return None if deadline is None else max(0, deadline-time.monotonic())
+
+    if total == 1:
+        results = [function(tasks[0])]
+        if stats is not None:
+            stats.lap('cipher')
+            stats.progress(1, total)
+        return results
+
+    if pool is not None:
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from concurrent.futures.process import BrokenProcessPool
+
+        results = []
+        futures = [pool.submit(function, task) for task in tasks]
+        if stats is not None:
+            stats.lap('dispatch')
+        try:
+            for segment, future in enumerate(futures):
+                try:
+                    results.append(future.result(remaining()))
+                except FutureTimeoutError:
+                    raise TimeoutError(f"Segment {segment} didn't finish within {timeout} seconds") from None
+                except BrokenProcessPool as exception:
+                    # Every segment still running fails once a worker dies
+                    unfinished = [index for index, future in enumerate(futures) if index >= segment and future.exception() is not None]
+                    raise SegmentError(segment, f"a worker exited before segments {unfinished} returned") from exception
+                except Exception as exception:
+                    raise SegmentError(segment, repr(exception)) from exception
+                if stats is not None:
+                    stats.progress(segment+1, total)
+        except BaseException:
+            # Stops the rest of the segments rather than leaving them
+            # running on the pool ahead of its next call
+            pool.terminate()
+            raise
+        if stats is not None:
+            stats.lap('cipher')
+        return results
+
+    from multiprocessing import Pipe, Process
+    from multiprocessing.connection import wait
+
+    results = [None]*len(tasks)
+    running = {}
+    try:
+        # Starting a process for each task, leaving out the first
+        # task for the main process to run after it starts the others
+        for segment, task in enumerate(tasks[1:], 1):
+            reader, writer = Pipe(duplex=False)
+            p = Process(target=multiprocess_cipher, args=(function, task, writer))
+            p.start()
+            # Closing the parent's copy of the child's end, so reading
+            # fails instead of blocking forever if the child dies
+            writer.close()
+            running[reader] = (segment, p)
+        if stats is not None:
+            stats.lap('dispatch')
+
+        results[0] = function(tasks[0])
+        tasks = None
+        if stats is not None:
+            stats.progress(total-len(running), total)
+
+        # Sleeps until a child sends its result or exits
+        while running:
+            ready = wait(list(running), remaining())
+            if not ready:
+                raise TimeoutError(f"Segments {sorted(segment for segment, _ in running.values())} didn't finish within {timeout} seconds")
+
+            for reader in ready:
+                segment, p = running.pop(reader)
+                try:
+                    successful, result = reader.recv()
+                except EOFError:
+                    p.join()
+                    raise SegmentError(segment, f"the worker exited with code {p.exitcode} before returning") from None
+                finally:
+                    reader.close()
+
+                p.join()
+                if not successful:
+                    raise SegmentError(segment, repr(result)) from result
+                results[segment] = result
+                if stats is not None:
+                    stats.progress(total-len(running), total)
+
+        if stats is not None:
+            stats.lap('cipher')
+    finally:
+        # Stops anything still running if a segment failed or timed out
+        for reader, (_, p) in running.items():
+            p.terminate()
+            p.join()
+            reader.close()
+
+    return results
+
+
+def _calibration_task(size:int) -> bytes:
+    '''
+    Returns 'size' bytes, timing how long a worker takes to start
+    and send its result back
+    '''
+    return bytes(size)
+
+
+def _fastest(function:'callable', *args, repeat=3) -> float:
+    '''
+    The fewest seconds 'function(*args)' took out of 'repeat' calls
+    '''
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        seconds.append(time.perf_counter()-start)
+    return min(seconds)
+
+
+def calibrate(processes=True) -> dict:
+    '''
+    Times the engines, and starting a process if 'processes' is True, on
+    this machine for 'plan_execution' to base its choices on. Runs by
+    itself the first time a plan needs the costs, so calling it is only
+    needed to calibrate again or ahead of time
+
+    Args:
+        processes (bool, default:True):
+            Also time starting worker processes and sending their results
+            back, which takes tens of milliseconds
+
+    Returns:
+        dict:
+            The seconds each engine takes per call ("<engine> call") and
+            per character, generating the keystream takes per character
+            ("key"), and per process started and byte sent back
+    '''
+    small, large = 256, 1 << 14
+    key = bytes(range(256))*(large//256)
+    data = memoryview(bytes(large)).cast('B')
+    output = memoryview(bytearray(large)).cast('B')
+
+    costs = {}
+    for engine in ('python', 'numpy'):
+        if engine == 'numpy' and not numpy_available():
+            continue
+        small_seconds = _fastest(cipher_buffer, key, data[:small], output[:small], 256, False, engine)
+        large_seconds = _fastest(cipher_buffer, key, data, output, 256, False, engine)
+        costs[engine] = max(large_seconds-small_seconds, 0)/(large-small)
+        costs[f"{engine} call"] = max(small_seconds-costs[engine]*small, 0)
+    costs["key"] = _fastest(Keystream("calibration").read, 0, large)/large
+
+    if processes and platform.system() == "Linux":
+        # The first task runs in this process, so only one is started
+        size = 1 << 23
+        costs["process start"] = _fastest(_run_tasks, _calibration_task, [0, 0], None, None, repeat=2)
+        sending = _fastest(_run_tasks, _calibration_task, [0, size], None, None, repeat=1)
+        costs["transfer"] = max(sending-costs["process start"], 0)/size
+
+    with _costs_lock:
+        _costs.update(costs)
+    return dict(_costs)
+
+
+def _estimate(length:int, processes:int, engine:str, costs:dict, pool:'WorkerPool', character_size:int, records:int) -> float:
+    '''
+    The estimated seconds to cipher 'length' characters split into
+    'records' calls across 'processes' workers
+    '''
+    # Each segment is a call of its own, as is each record, and every
+    # call pays the engine's overhead again
+    segments = max(1, min(processes*(SEGMENTS_PER_WORKER if pool is not None else 1), length//MIN_SEGMENT_LENGTH))
+    work = length*costs[engine] + max(records, segments)*costs[f"{engine} call"]
+    # A single range's keystream is generated by the workers along
+    # with the cipher, while records share one short keystream
+    if records == 1:
+        work += length*costs.get("key", 0)
+    if processes == 1:
+        return work
+    # Workers share the cores when there are more of them
+    work /= min(processes, cpu_count())
+    # Results come back from every worker but the main process, and
+    # a pool's workers are sent their data too instead of forking
+    sent = length*character_size*(processes-1)/processes*costs.get("transfer", 0)
+    if pool is not None:
+        return work + 2*sent + segments*POOL_TASK_SECONDS
+    return work + sent + (processes-1)*costs.get("process start", PROCESS_START_SECONDS)
+
+
+def plan_execution(length:int, processes='auto', engine='auto', pool=None, character_size=1, records=1) -> dict:
+    '''
+    Picks how to cipher 'length' characters, on one process one character
+    at a time ('serial'), on one process with NumPy ('vectorized') or split
+    across worker processes ('processes'), from how long each takes on this
+    machine as measured by 'calibrate'. Short data is never worth starting
+    a process for, while long data is split across as many cores as pay off
+
+    Args:
+        length (int):
+            The amount of characters to encrypt or decrypt
+        processes ('auto' or int, default:'auto'):
+            The most worker processes to consider, 'auto' considers
+            every core. An int is used as it is
+        engine (str, default:'auto'):
+            'auto' picks whichever engine is faster for the length, otherwise
+            the engine is used as it is
+        pool (WorkerPool or None):
+            The pool the work would run on, starting no processes
+        character_size (int, default:1):
+            The bytes each ciphered character takes
+        records (int, default:1):
+            The amount of seperate records the characters are spread over
+
+    Returns:
+        dict:
+            The "strategy", "engine" and "processes" picked,
+            and the estimated "seconds" it'll take
+    '''
+    if processes != 'auto' and (type(processes) != int or processes < 1):
+        raise ValueError(f"'processes' must be 'auto' or atleast 1, not {processes!r}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+    if engine == 'numpy' and not numpy_available():
+        raise ImportError("The 'numpy' engine requires NumPy to be installed")
+
+    if not _costs:
+        calibrate(processes=False)
+    costs = _costs
+    engines = (engine,) if engine != 'auto' else ('numpy', 'python') if 'numpy' in costs else ('python',)
+
+    if processes == 'auto':
+        # Segments are never shorter than 'MIN_SEGMENT_LENGTH', and
+        # records aren't split between workers
+        processes = length//MIN_SEGMENT_LENGTH
+        if records > 1:
+            processes = min(processes, records)
+        if processes > 1:
+            # ListCrypt currently does not support multiprocessing in windows
+            processes = min(processes, cpu_count() if platform.system() == "Linux" else 1)
+            if pool is not None:
+                processes = min(processes, pool.processes)
+
+        # Timing process startup is only worth it once the work takes longer
+        if processes > 1 and "process start" not in costs:
+            if min(_estimate(length, 1, candidate, costs, pool, character_size, records) for candidate in engines) > PROCESS_START_SECONDS:
+                costs = calibrate(processes=True)
+            else:
+                processes = 1
+        process_counts = range(1, max(processes, 1)+1)
+    else:
+        process_counts = (processes,)
+
+    plan = None
+    for count in process_counts:
+        for candidate in engines:
+            seconds = _estimate(length, count, candidate, costs, pool, character_size, records)
+            if plan is None or seconds < plan[0]:
+                plan = (seconds, count, candidate)
+    seconds, processes, engine = plan
+
+    if processes > 1:
+        strategy = 'processes'
+    else:
+        strategy = 'vectorized' if engine == 'numpy' else 'serial'
+    return {"strategy": strategy, "engine": engine, "processes": processes, "seconds": seconds}
+
+
+def _shared_memory_task(task:tuple) -> int:
+    '''
+    Runs 'cipher_buffer' over one range of the shared memory buffers
+    created by '_cipher_shared_memory'
+    '''
+    from multiprocessing import shared_memory
+
+    names, key, key_offset, data_format, output_format, start, stop, max_range, reverse, engine = task
+    # Each worker generates the keystream of its own range
+    key = Keystream(key).read(key_offset, stop-start)
+    buffers = [shared_memory.SharedMemory(name) for name in names]
+    data_buffer, output_buffer = buffers
+    try:
+        with data_buffer.buf.cast(data_format) as data, output_buffer.buf.cast(output_format) as output:
+            with data[start:stop] as data, output[start:stop] as output:
+                return cipher_buffer(key, data, output, max_range, reverse, engine)
+    finally:
+        for buffer in buffers:
+            buffer.close()
+
+
+def _cipher_shared_memory(keystream:Keystream, source:tuple, ranges:list, key_offsets:list, output_format:str, max_range:int, reverse:bool, engine:str, pool:WorkerPool, timeout:float, stats=None) -> bytes:
+    '''
+    Encrypts or decrypts the data with the data and output held in
+    shared memory. Workers are only sent the range they work on and
+    where it starts in the keystream, generate that part of the
+    keystream themselves and write their results straight into the
+    output buffer, so nothing is pickled between processes or joined
+    afterwards
+
+    Returns:
+        bytes: The encrypted or decrypted code points
+    '''
+    from multiprocessing import shared_memory
+
+    data_format, segment = source
+    data_width = struct.calcsize(data_format)
+    output_width = struct.calcsize(output_format)
+    data_length = ranges[-1][1]
+
+    buffers = [
+        shared_memory.SharedMemory(create=True, size=max(1, data_length*data_width)),
+        shared_memory.SharedMemory(create=True, size=max(1, data_length*output_width)),
+    ]
+    data_buffer, output_buffer = buffers
+    try:
+        # Copies the data in one segment at a time to avoid encoding
+        # a second copy of all of the data
+        for start, stop in ranges:
+            data_buffer.buf[start*data_width:stop*data_width] = segment(start, stop)
+            if stats is not None:
+                stats.lap('dispatch')
+
+        names = [buffer.name for buffer in buffers]
+        tasks = [
+            (names, keystream.key, key_offset, data_format, output_format, start, stop, max_range, reverse, engine)
+            for (start, stop), key_offset in zip(ranges, key_offsets)
+        ]
+
+        _run_tasks(_shared_memory_task, tasks, pool, timeout, stats)
+
+        output = bytes(output_buffer.buf[:data_length*output_width])
+        if stats is not None:
+            stats.lap('join')
+        return output
+    finally:
+        for buffer in buffers:
+            buffer.close()
+            buffer.unlink()
+
+
+def _cipher_code_points(keystream:Keystream, source:tuple, ranges:list, key_offsets:list, output_format:str, max_range:int, reverse:bool, engine:str, pool:WorkerPool, shared_memory:bool, timeout:float, stats=None, header=None) -> bytes:
+    '''
+    Encrypts or decrypts every range of the code points in parallel
+
+    Args:
+        keystream (Keystream):
+            The keystream of the key
+        source (tuple):
+            The format and range function returned by '_code_points'
+        ranges (list):
+            The (start, stop) range of each segment
+        key_offsets (list):
+            Where each segment starts reading the keystream
+        output_format (str):
+            The array format of the resulting code points
+        stats (Stats or None):
+            Records the time spent in each stage
+        header (bytes or None):
+            Put before the code points, which are then little endian
+            the way they're stored after a header
+
+    Returns:
+        bytes: The encrypted or decrypted code points
+    '''
+    if shared_memory:
+        output = _cipher_shared_memory(keystream, source, ranges, key_offsets, output_format, max_range, reverse, engine, pool, timeout, stats)
+        return output if header is None else header+_little_endian(output, output_format)
+
+    data_format, segment = source
+    if pool is None and len(ranges) == 1:
+        results = _cipher_windows(keystream, segment, *ranges[0], key_offsets[0], data_format, output_format, max_range, reverse, engine, stats)
+    else:
+        results = _cipher_segments(keystream, segment, ranges, key_offsets, data_format, output_format, max_range, reverse, engine, pool, timeout, stats)
+
+    # The results are only joined once, along with the header
+    if header is not None:
+        results = [header, *(_little_endian(result, output_format) for result in results)]
+    output = b"".join(results)
+    if stats is not None:
+        stats.lap('join')
+    return output
+
+
+def _cipher_windows(keystream:Keystream, segment:'callable', start:int, stop:int, key_offset:int, data_format:str, output_format:str, max_range:int, reverse:bool, engine:str, stats=None) -> list:
+    '''
+    Encrypts or decrypts a range in this process 'WINDOW_LENGTH' code
+    points at a time, so only one window of the data, keystream and
+    the engine's working arrays is in memory along with the output
+
+    Returns:
+        list: The resulting code points of each window
+    '''
+    results = []
+    for window_start in range(start, stop, WINDOW_LENGTH):
+        window_stop = min(window_start+WINDOW_LENGTH, stop)
+        key = keystream.read(key_offset+window_start-start, window_stop-window_start)
+        if stats is not None:
+            stats.lap('key expansion')
+        results.append(_cipher_task((key, segment(window_start, window_stop), data_format, output_format, max_range, reverse, engine)))
+        if stats is not None:
+            stats.lap('cipher')
+    if stats is not None:
+        stats.progress(1, 1)
+    return results
+
+
+def _cipher_segments(keystream:Keystream, segment:'callable', ranges:list, key_offsets:list, data_format:str, output_format:str, max_range:int, reverse:bool, engine:str, pool:WorkerPool, timeout:float, stats=None) -> list:
+    '''
+    Encrypts or decrypts each range as a task of its own on the
+    pool or on new processes, which each generate the keystream of
+    their own range
+
+    Returns:
+        list: The resulting code points of each range
+    '''
+    tasks = []
+    for (start, stop), key_offset in zip(ranges, key_offsets):
+        tasks.append((keystream.key, key_offset, bytes(segment(start, stop)), data_format, output_format, max_range, reverse, engine))
+        if stats is not None:
+            stats.lap('dispatch')
+
+    return _run_tasks(_keyed_cipher_task, tasks, pool, timeout, stats)
+
+
+def _confirmation_code_points(metadata_dictionary:dict) -> tuple:
+    '''
+    The encrypted code points of the confirmation text at the start of
+    the data returned by 'pull_metadata', in either format version
+    '''
+    data = metadata_dictionary["data"]
+    # Format version 1 splits the key between segments by the amount of
+    # processes, only the first character always uses the start of the key
+    if metadata_dictionary["version"] == 1:
+        return tuple(map(ord_, data[:1]))
+    data_format = metadata_dictionary["format"]
+    return struct.unpack_from(f"<{min(2, len(data)//struct.calcsize(data_format))}{data_format}", data)
+
+
+def _key_confirmed(keystream:Keystream, code_points:tuple, max_range:int) -> bool:
+    '''
+    Decrypts only the confirmation text, so a wrong key is turned away
+    in constant time rather than after decrypting all of the data
+    '''
+    confirmation_data = "39"[:len(code_points)]
+    key = keystream.read(0, len(confirmation_data))
+    return bool(code_points) and [(code-key_code)%max_range for code, key_code in zip(code_points, key)] == list(map(ord_, confirmation_data))
+
+
+def _compress_data(data:'str or bytes-like', compression:str) -> tuple:
+    '''
+    Compresses the data, str as UTF-8
+
+    Returns:
+        tuple:
+            [0]: The compressed data as bytes, or the data as it
+                 was if it doesn't compress
+            [1]: The flags recording the compression, 0 if it wasn't
+    '''
+    _check_compression(compression)
+    encoded_data = data.encode('utf-8', 'surrogatepass') if type(data) == str else data
+    if not _compressible(encoded_data):
+        return data, 0
+
+    compressed_data = b"".join(_compress_chunks(compression, [encoded_data]))
+    if len(compressed_data) >= len(encoded_data):
+        return data, 0
+    return compressed_data, COMPRESSIONS[compression] << COMPRESSION_SHIFT
+
+
+def _confirm_decrypted(decrypted_data:bytes, output_format:str, data_type:str, compression=None) -> "origional data":
+    '''
+    Checks the confirmation text at the start of the decrypted code
+    points, returning the origional data if it's there, otherwise False.
+    Compressed data is decompressed after the confirmation text
+    '''
+    confirmation_data = "39"
+
+    # Bytes are compared and returned as they are
+    if data_type in BINARY_DATA_TYPES or compression is not None:
+        confirmation_data = confirmation_data.encode()
     else:
+        decrypted_data = _decode_code_points(decrypted_data, output_format)
+
+    # Pulls confirmation text from data to verify successful decryption
+    pulled_confirmation = decrypted_data[:len(confirmation_data)]
+
+    # If True the origional data is returned, 
+    # otherwise the function returns False
+    if pulled_confirmation == confirmation_data:
+        decrypted_data = decrypted_data[len(confirmation_data):]
+        if compression is not None:
+            decrypted_chunks = _decompressed_chunks(compression, data_type, [decrypted_data])
+            decrypted_data = (b"" if data_type in BINARY_DATA_TYPES else "").join(decrypted_chunks)
+
+        # Converting data back to origional type
+        return convert_data_back((decrypted_data, data_type))
+
+    else:
+        return False
+
+
+def _batch_ranges(lengths:list, batches:int) -> list:
+    '''
+    Splits the records into at most 'batches' (start, stop) ranges
+    of neighbouring records with roughly even total lengths
+    '''
+    total_length = sum(lengths)
+    ranges = []
+    start = 0
+    running_length = 0
+    for index, length in enumerate(lengths):
+        running_length += length
+        if len(ranges) < batches-1 and running_length*batches >= total_length*(len(ranges)+1):
+            ranges.append((start, index+1))
+            start = index+1
+    ranges.append((start, len(lengths)))
+
+    return [(start, stop) for start, stop in ranges if start < stop]
+
+
+def _cipher_many_task(task:tuple) -> list:
+    '''
+    Runs '_cipher_task' over each record in a batch, every record
+    reading the keystream from its start
+    '''
+    key, batch, reverse, engine = task
+    return [
+        _cipher_task((key[:length], data, data_format, output_format, max_range, reverse, engine))
+        for data, data_format, output_format, max_range, length in batch
+    ]
+
+
+class Cipher:
+    '''
+    Derives everything 'encrypt' and 'decrypt' need from a key once,
+    so encrypting or decrypting many pieces of data under the same key
+    skips hashing it again and reuses the keystream it has generated
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        cache_size (int, default:64 MiB):
+            The most bytes of generated keystream to keep for reuse,
+            the least recently used pages are dropped past this
+    '''
+    def __init__(self, key:'any data type', cache_size=1 << 26):
+        self.key = key
+        self.key_hash = sha256(str(key))
+        self.splitter_chars = self.key_hash[2:12]
+        # Generates the longer key from the origional 'key' variable one
+        # segment at a time, rather than building all of it up front
+        self.keystream = Keystream(str(key), cache_size)
+        # Caches the integer equivalent of the hashed key for
+        # positioning the metadata of format version 1
+        _metadata_number(self.key_hash)
+
+    def encrypt(self, data:'any data type', processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, format_version=FORMAT_VERSION, stats=None, compression=None) -> bytes:
+        '''
+        The same as 'encrypt', using the ciphers key
+        '''
+        if format_version not in (1, 2):
+            raise ValueError(f"Unsupported format version {format_version}")
+        if compression is not None and format_version == 1:
+            raise ValueError("Only format version 2 data can be compressed")
+
+        # ListCrypt currently does not support multiprocessing in windows
+        if platform.system() != "Linux":
+            processes = 1
+
+        if stats is not None:
+            stats.lap()
+
+        # Puts a random string at the start of the data before encryption
+        # to verify no data corruption during decryption
+        confirmation_data = "39"
+
+        if format_version == 2:
+            # Bytes are encrypted as they are, without being converted
+            # to a str and checked first, and literals are serialized.
+            # The confirmation text is read before the data rather than
+            # joined to a copy of it
+            data, data_type = _convert_data_v2(self, data)
+            flags = 0
+            if compression is not None:
+                data, flags = _compress_data(data, compression)
+            data_length = len(confirmation_data)+len(data)
+            max_range = range_finder(confirmation_data, code_points=True)
+            if len(data):
+                max_range = max(max_range, range_finder(data, code_points=True))
+        else:
+            # Finds the origional type of the data for converting back to
+            # after decryption
+            data,data_type = convert_data(self, data)
+            data = confirmation_data+data
+            data_length = len(data)
+
+            # Finds the max range of the data according to
+            # each characters ord() equivalent
+            max_range = range_finder(data)
+        metadata = data_type+f"({max_range})"
+        if stats is not None:
+            stats.lap('conversion')
+
+        keystream = self.keystream
+
+        # Picks how many processes and which engine are worth using
+        if format_version == 1 and processes == 'auto':
+            processes = cpu_count()
+        if processes == 'auto' or engine == 'auto':
+            character_size = struct.calcsize(_symbol_format(max_range)) if format_version == 2 else 1
+            plan = plan_execution(data_length, processes, engine, pool, character_size)
+            processes, engine = plan["processes"], plan["engine"]
+
+        # Splits the data into segments for even distribution
+        # across CPU cores
+        segments = processes
+        if format_version == 2:
+            # Each character uses the key at its own position
+            ranges = _ranges(data_length, segments, pool)
+            key_offsets = [start for start, _ in ranges]
+        else:
+            ranges = _legacy_segment_ranges(data_length, segments)
+            key_offsets = _key_offsets(data_length, segments)
+        if stats is not None:
+            stats.lap('segmentation')
+            stats.record_segments(ranges)
+
+        if format_version == 2:
+            output_format = _symbol_format(max_range)
+            header = HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES[data_type], flags, max_range, data_length)
+            source = _prefixed_code_points(confirmation_data, data)
+            encrypted_data = _cipher_code_points(keystream, source, ranges, key_offsets, output_format, max_range, False, engine, pool, shared_memory, timeout, stats, header)
+            data = source = None
+            if stats is not None:
+                stats.lap('metadata')
+            return encrypted_data
+
+        encrypted_data = _cipher_code_points(keystream, _code_points(data), ranges, key_offsets, 'B', max_range, False, engine, pool, shared_memory, timeout, stats)
+        encrypted_data = _decode_code_points(encrypted_data, 'B')
+        data = None
+
+        # Encrypt the metadata
+        key = self.key_hash
+        encrypted_metadata = "".join([chr_((ord_(metadata[pos])+ord_(key[pos]))%130) for pos in range(len(metadata))])
+
+        # Creating a seemingly random position to place the metadata in the data
+        splitter_chars = self.splitter_chars
+
+        # Turns the key to its integer equivalent and takes it by
+        # the mode of the len of the data
+        all_encrypted_data_length = len(encrypted_data)+len(splitter_chars)+len(encrypted_metadata)
+        position = _metadata_position(key, all_encrypted_data_length)
+
+        # Join the metadata with the regular data
+        index_data = encrypted_data[position:position+100]
+
+        encrypted_data = encrypted_data.split(index_data)
+        encrypted_data = encrypted_data[0]+encrypted_metadata+splitter_chars+index_data+encrypted_data[1]
+        if stats is not None:
+            stats.lap('metadata')
+
+        return encrypted_data.encode()
+
+    def decrypt(self, encrypted_data:bytes, processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, stats=None) -> "origional data":
+        '''
+        The same as 'decrypt', using the ciphers key
+        '''
+        # ListCrypt currently does not support multiprocessing in windows
+        if platform.system() != "Linux":
+            processes = 1
+
+        if stats is not None:
+            stats.lap()
+
+        # Converts the metadata to variables for easy usability
+        confirmation_data = "39"
+        metadata_dictionary = pull_metadata(self.key_hash, encrypted_data)
+        origional_data_type = metadata_dictionary["type"]
+        compression = metadata_dictionary.get("compression")
+        max_range = metadata_dictionary["range"]
+        data = metadata_dictionary["data"]
+
+        # Checks the key before the rest of the data is touched
+        if not _key_confirmed(self.keystream, _confirmation_code_points(metadata_dictionary), max_range):
+            return False
+        if stats is not None:
+            stats.lap('metadata')
+
+        keystream = self.keystream
+        output_format = 'B' if max_range <= 1 << 8 else 'I'
+
+        # Picks how many processes and which engine are worth using
+        version = metadata_dictionary["version"]
+        data_length = metadata_dictionary["length"] if version == 2 else len(data)
+        if version == 1 and processes == 'auto':
+            processes = cpu_count()
+        if processes == 'auto' or engine == 'auto':
+            plan = plan_execution(data_length, processes, engine, pool, struct.calcsize(output_format))
+            processes, engine = plan["processes"], plan["engine"]
+
+        # Splits the data into segments for even
+        # distribution across cpu cores
+        segments = processes
+        if version == 2:
+            data_format = metadata_dictionary["format"]
+            source = _code_points(_little_endian(data, data_format), data_format)
+            ranges = _ranges(data_length, segments, pool)
+            key_offsets = [start for start, _ in ranges]
+        else:
+            source = _code_points(data)
+            ranges = _legacy_segment_ranges(data_length, segments)
+            key_offsets = _key_offsets(data_length, segments)
+        if stats is not None:
+            stats.lap('segmentation')
+            stats.record_segments(ranges)
+
+        decrypted_data = _cipher_code_points(keystream, source, ranges, key_offsets, output_format, max_range, True, engine, pool, shared_memory, timeout, stats)
+        data = source = metadata_dictionary = None
+
+        decrypted_data = _confirm_decrypted(decrypted_data, output_format, origional_data_type, compression)
+        if stats is not None:
+            stats.lap('conversion')
+
+        return decrypted_data
+
+    def decrypt_range(self, encrypted_data:'bytes-like or file', start:int, length:int, engine='auto') -> 'str or bytes':
+        '''
+        The same as 'decrypt_range', using the ciphers key
+        '''
+        if start < 0 or length < 0:
+            raise ValueError("'start' and 'length' can't be negative")
+
+        if hasattr(encrypted_data, "read"):
+            def read(offset:int, size:int) -> bytes:
+                encrypted_data.seek(offset)
+                return encrypted_data.read(size)
+            data_size = encrypted_data.seek(0, os.SEEK_END)
+        else:
+            view = memoryview(encrypted_data).cast('B')
+            def read(offset:int, size:int) -> bytes:
+                return view[offset:offset+size]
+            data_size = len(view)
+
+        metadata_dictionary = read_header(read(0, HEADER.size))
+        _check_length(metadata_dictionary, data_size-HEADER.size)
+        data_type = metadata_dictionary["type"]
+        if data_type not in ('str', 'bytes'):
+            raise ValueError("Only str and bytes data can be decrypted in ranges")
+        if metadata_dictionary["compression"] is not None:
+            raise ValueError("Compressed data can't be decrypted in ranges")
+
+        max_range = metadata_dictionary["range"]
+        data_format = metadata_dictionary["format"]
+        width = struct.calcsize(data_format)
+        output_format = 'B' if max_range <= 1 << 8 else 'I'
+
+        def decrypt_characters(first:int, last:int) -> bytes:
+            '''
+            Decrypts the characters from 'first' up to 'last', reading
+            only their part of the data and keystream
+            '''
+            data = read(HEADER.size+first*width, (last-first)*width)
+            if len(data) != (last-first)*width:
+                raise ValueError("The encrypted data is truncated or corrupted")
+            task = (self.keystream.read(first, last-first), bytes(_little_endian(data, data_format)), data_format, output_format, max_range, True, engine)
+            return _cipher_task(task)
+
+        # The confirmation text is decrypted first to check the key
+        confirmation_data = "39"
+        if _confirm_decrypted(decrypt_characters(0, len(confirmation_data)), output_format, data_type) is False:
+            return False
+
+        # Ranges past the end of the data are cut short, like slicing
+        data_length = metadata_dictionary["length"] - len(confirmation_data)
+        start = min(start, data_length)
+        stop = min(start+length, data_length)
+        decrypted_data = decrypt_characters(start+len(confirmation_data), stop+len(confirmation_data))
+
+        if data_type == 'bytes':
+            return bytes(decrypted_data)
+        return _decode_code_points(decrypted_data, output_format)
+
+    def verify_key(self, encrypted_data:'bytes-like or file') -> bool:
+        '''
+        The same as 'verify_key', using the ciphers key
+        '''
+        if hasattr(encrypted_data, "read"):
+            encrypted_data.seek(0)
+            # The header and the largest two characters
+            start = encrypted_data.read(HEADER.size+2*4)
+            # Format version 1 hides its metadata in the data, so all of it is needed
+            if start[:len(HEADER_MAGIC)] != HEADER_MAGIC:
+                start += encrypted_data.read()
+            encrypted_data = start
+
+        view = memoryview(encrypted_data).cast('B')
+        if bytes(view[:len(HEADER_MAGIC)]) == HEADER_MAGIC:
+            metadata_dictionary = read_header(view[:HEADER.size])
+            metadata_dictionary["data"] = view[HEADER.size:]
+        else:
+            try:
+                metadata_dictionary = pull_metadata(self.key_hash, bytes(view))
+            except (ValueError, IndexError):
+                # The metadata can't be found with the wrong key
+                return False
+
+        return _key_confirmed(self.keystream, _confirmation_code_points(metadata_dictionary), metadata_dictionary["range"])
+
+    def _cipher_many(self, records:list, reverse:bool, processes:int, engine:str, pool:WorkerPool, timeout:float, stats:'Stats') -> list:
+        '''
+        Encrypts or decrypts every record from the start of the
+        keystream, splitting the records into a batch per process
+        '''
+        if platform.system() != "Linux":
+            processes = 1
+
+        # Picks how many processes and which engine are worth using
+        if records and (processes == 'auto' or engine == 'auto'):
+            length = sum(record[-1] for record in records)
+            size = sum(record[-1]*struct.calcsize(record[2]) for record in records)
+            plan = plan_execution(length, processes, engine, pool, size/max(length, 1), len(records))
+            processes, engine = plan["processes"], plan["engine"]
+
+        batches = _batch_ranges([record[-1] for record in records], processes)
+        if not batches:
+            return []
+        if stats is not None:
+            stats.lap('segmentation')
+            stats.record_segments([(0, sum(record[-1] for record in records[start:stop])) for start, stop in batches])
+
+        tasks = []
+        for start, stop in batches:
+            batch = records[start:stop]
+            key = self.keystream.read(0, max(record[-1] for record in batch))
+            if stats is not None:
+                stats.lap('key expansion')
+            tasks.append((key, batch, reverse, engine))
+
+        results = _run_tasks(_cipher_many_task, tasks, pool, timeout, stats)
+        results = list(itertools.chain.from_iterable(results))
+        if stats is not None:
+            stats.lap('join')
+        return results
+
+    def encrypt_many(self, data:'iterable', processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list:
+        '''
+        The same as 'encrypt_many', using the ciphers key
+        '''
+        if stats is not None:
+            stats.lap()
+
+        confirmation_data = "39"
+        records = []
+        data_types = []
+        for item in data:
+            item, data_type = _convert_data_v2(self, item)
+
+            length = len(confirmation_data)+len(item)
+            max_range = range_finder(confirmation_data, code_points=True)
+            if len(item):
+                max_range = max(max_range, range_finder(item, code_points=True))
+            data_format, segment = _prefixed_code_points(confirmation_data, item)
+            records.append((bytes(segment(0, length)), data_format, _symbol_format(max_range), max_range, length))
+            data_types.append(data_type)
+        if stats is not None:
+            stats.lap('conversion')
+
+        encrypted_data = self._cipher_many(records, False, processes, engine, pool, timeout, stats)
+
+        encrypted_data = [
+            HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES[data_type], 0, max_range, length)+_little_endian(encrypted_item, output_format)
+            for encrypted_item, (_, _, output_format, max_range, length), data_type in zip(encrypted_data, records, data_types)
+        ]
+        if stats is not None:
+            stats.lap('metadata')
+
+        return encrypted_data
+
+    def decrypt_many(self, encrypted_data:'iterable', processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list:
+        '''
+        The same as 'decrypt_many', using the ciphers key
+        '''
+        if stats is not None:
+            stats.lap()
+
+        records = []
+        data_types = []
+        for item in encrypted_data:
+            metadata_dictionary = pull_metadata(self.key_hash, item)
+            max_range = metadata_dictionary["range"]
+            # Pieces the key is wrong for aren't decrypted
+            if not _key_confirmed(self.keystream, _confirmation_code_points(metadata_dictionary), max_range):
+                data_types.append(None)
+                continue
+            if metadata_dictionary["version"] == 2:
+                data_format = metadata_dictionary["format"]
+                length = metadata_dictionary["length"]
+                item = _little_endian(metadata_dictionary["data"], data_format)
+            else:
+                length = len(metadata_dictionary["data"])
+                data_format, segment = _code_points(metadata_dictionary["data"])
+                item = segment(0, length)
+
+            output_format = 'B' if max_range <= 1 << 8 else 'I'
+            records.append((bytes(item), data_format, output_format, max_range, length))
+            data_types.append((metadata_dictionary["type"], metadata_dictionary.get("compression")))
+        if stats is not None:
+            stats.lap('metadata')
+
+        decrypted_items = zip(self._cipher_many(records, True, processes, engine, pool, timeout, stats), records)
+
+        decrypted_data = []
+        for data_type in data_types:
+            if data_type is None:
+                decrypted_data.append(False)
+                continue
+            data_type, compression = data_type
+            decrypted_item, (_, _, output_format, _, _) = next(decrypted_items)
+            decrypted_data.append(_confirm_decrypted(decrypted_item, output_format, data_type, compression))
+        if stats is not None:
+            stats.lap('conversion')
+
+        return decrypted_data
+
+
+def _cipher(key:'any data type') -> Cipher:
+    '''
+    Returns the key if it's already a Cipher, otherwise a Cipher
+    for the key that doesn't cache its keystream
+    '''
+    return key if isinstance(key, Cipher) else Cipher(key, cache_size=0)
+
+
+def encrypt(key:'any data type', data:'any data type', processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, format_version=FORMAT_VERSION, stats=None, compression=None) -> bytes:
+    '''
+    Encrypts the data by adding each characters integer equivalent to the 
+    integer equivalent of the character in the same position in the new key 
+    variable generated by the 'key parameter'
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data 
+        data (any data type):
+            The data to be encrypted
+        processes ('auto' or int, default:'auto'):
+            The amount of processes allowed to run simultaneously,
+            'auto' lets 'plan_execution' pick how many are worth starting
+            for the length of the data. Format version 1 uses every
+            CPU core for 'auto', its output depends on the amount
+            ( Multi-cored encryption only currently available on
+            linux )
+        engine (str, default:'auto'):
+            The engine passed to 'cipher_segment', 'auto' lets
+            'plan_execution' pick whichever is faster for the length
+        pool (WorkerPool, *optional):
+            Runs the segments on the pool's already started workers
+            instead of starting new processes for this call
+        shared_memory (bool, default:False):
+            Keeps the data, keystream and output in shared memory,
+            sending each worker only the range it works on
+        timeout (float, *optional):
+            Seconds to wait for the workers before stopping them
+            and raising TimeoutError, waits indefinitely by default
+        format_version (int, default:2):
+            2 writes a fixed header followed by fixed width characters,
+            and encrypts bytes as they are rather than converting them
+            to a str, and literals as the bytes of 'serialize_literal'.
+            1 writes the origional format with the metadata
+            hidden in the data, which depends on the amount of 'processes'
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call
+        compression (str, *optional):
+            Compresses the data with 'zlib', 'lzma' or 'bz2' before
+            encrypting it, recorded in the header so 'decrypt'
+            decompresses it. Data that doesn't compress is left as it
+            is. Format version 2 only
+
+    Returns:
+        bytes: The encrypted data, along with metadata for decrypting the data
+    
+    '''
+    return _cipher(key).encrypt(data, processes, engine, pool, shared_memory, timeout, format_version, stats, compression)
+
+
+def decrypt(key:"any data type", encrypted_data:bytes, processes='auto', engine='auto', pool=None, shared_memory=False, timeout=None, stats=None) -> "origional data":
+    '''
+    Decrypts the data by subtracting each characters integer equivalent
+    by the integer equivalent of the character in the same position in 
+    the new key variable generated by the 'key parameter'
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        encrypted_data (bytes):
+            The encrypted bytes returned by the 'encrypt' function, in
+            either format version
+        processes ('auto' or int, preset:'auto'):
+            The amount of processes allowed to run simultaneously, 
+            'auto' lets 'plan_execution' pick how many are worth starting.
+            Format version 1 must be decrypted with the same
+            amount of processes it was encrypted with, which is
+            every CPU core for 'auto'
+            
+            ( Multi-cored decryption only currently available on linux )
+        engine (str, default:'auto'):
+            The engine passed to 'cipher_segment', 'auto' lets
+            'plan_execution' pick whichever is faster for the length
+        pool (WorkerPool, *optional):
+            Runs the segments on the pool's already started workers
+            instead of starting new processes for this call
+        shared_memory (bool, default:False):
+            Keeps the data, keystream and output in shared memory,
+            sending each worker only the range it works on
+        timeout (float, *optional):
+            Seconds to wait for the workers before stopping them
+            and raising TimeoutError, waits indefinitely by default
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call
+
+    Returns:
+        The origional data
+            
+    '''
+    return _cipher(key).decrypt(encrypted_data, processes, engine, pool, shared_memory, timeout, stats)
+
+
+def decrypt_range(key:'any data type', encrypted_data:'bytes-like or file', start:int, length:int, engine='auto') -> 'str or bytes':
+    '''
+    Decrypts 'length' characters of the origional data starting at
+    'start', without decrypting anything else. Every character of format
+    version 2 data takes the same amount of bytes and uses the key at its
+    own position, so only the header, the confirmation text and the range
+    itself are read
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        encrypted_data (bytes-like or file):
+            Format version 2 data returned by 'encrypt' of a str or bytes,
+            or a binary file opened on it
+        start (int):
+            The position in the origional data to start at, in
+            characters for str and bytes for bytes
+        length (int):
+            The amount of characters or bytes to decrypt, cut
+            short at the end of the data
+
+    Returns:
+        str or bytes:
+            The decrypted range, or False if decryption fails
+    '''
+    return _cipher(key).decrypt_range(encrypted_data, start, length, engine)
+
+
+def verify_key(key:'any data type', encrypted_data:'bytes-like or file') -> bool:
+    '''
+    Checks whether the key decrypts the data by decrypting only the
+    confirmation text at its start. Format version 2 data is checked from
+    its header and first two characters alone, so a wrong key is found in
+    microseconds no matter how large the data is. 'decrypt', 'decrypt_many'
+    and 'decrypt_file' run the same check before decrypting anything else
+
+    Args:
+        key (any data type):
+            The key to check
+        encrypted_data (bytes-like or file):
+            The encrypted data, or a binary file opened on it. Only the
+            first few bytes of format version 2 files are read
+
+    Returns:
+        bool: True if the key is correct, otherwise False
+    '''
+    return _cipher(key).verify_key(encrypted_data)
+
+
+def encrypt_many(key:'any data type', data:'iterable', processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list:
+    '''
+    Encrypts many pieces of data in one call, deriving the key once
+    and splitting the pieces across processes in batches rather than
+    splitting each one
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data 
+        data (iterable):
+            The pieces of data to be encrypted, each can be any data type
+        processes ('auto' or int, default:'auto'):
+            The amount of batches the pieces are split into and
+            processes allowed to run simultaneously, 'auto' lets
+            'plan_execution' pick how many are worth starting
+        pool (WorkerPool, *optional):
+            Runs the batches on the pool's already started workers
+            instead of starting new processes for this call
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call
+
+    Returns:
+        list:
+            The encrypted bytes of each piece in the same order, each
+            can be decrypted on its own with 'decrypt'
+    '''
+    return _cipher(key).encrypt_many(data, processes, engine, pool, timeout, stats)
+
+
+def decrypt_many(key:'any data type', encrypted_data:'iterable', processes='auto', engine='auto', pool=None, timeout=None, stats=None) -> list:
+    '''
+    Decrypts many pieces of encrypted data in one call, deriving
+    the key once and splitting the pieces across processes in batches
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        encrypted_data (iterable):
+            The encrypted bytes returned by 'encrypt' or 'encrypt_many',
+            format version 1 data must have been encrypted with 'processes=1'
+        processes ('auto' or int, default:'auto'):
+            The amount of batches the pieces are split into and
+            processes allowed to run simultaneously, 'auto' lets
+            'plan_execution' pick how many are worth starting
+        pool (WorkerPool, *optional):
+            Runs the batches on the pool's already started workers
+            instead of starting new processes for this call
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call
+
+    Returns:
+        list:
+            The origional data of each piece in the same order, or
+            False for any piece that fails to decrypt
+    '''
+    return _cipher(key).decrypt_many(encrypted_data, processes, engine, pool, timeout, stats)
+
+
+# The start of every JPEG and PNG file
+JPEG_MAGIC = b"\xff\xd8\xff"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+# APP1 (Exif and XMP), APP3 to APP13 (including Photoshop's IPTC), APP15 and
+# comments. APP0 (JFIF), ICC profiles in APP2 and APP14 (Adobe) change how
+# the pixels are decoded, so they're kept
+_JPEG_METADATA_MARKERS = {0xE1, *range(0xE3, 0xEE), 0xEF, 0xFE}
+_JPEG_START_OF_SCAN = 0xDA
+_JPEG_END_OF_IMAGE = b"\xff\xd9"
+# Text, Exif and the time last modified
+_PNG_METADATA_CHUNKS = {b"tEXt", b"zTXt", b"iTXt", b"eXIf", b"tIME"}
+
+
+def _jpeg_segments(file:'binary file') -> 'generator':
+    '''
+    Yields the marker, offset and length of each segment of a JPEG up
+    to and including the start of scan, reading only their headers
+    '''
+    position = len(JPEG_MAGIC)-1
+    while True:
+        file.seek(position)
+        header = file.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            raise ValueError("The JPEG is truncated or corrupted")
+        marker = header[1]
+        # Markers can be padded with any amount of 0xFF
+        if marker == 0xFF:
+            position += 1
+            continue
+        # Restart markers have no length
+        if 0xD0 <= marker <= 0xD7:
+            yield marker, position, 2
+            position += 2
+            continue
+
+        length = 2+int.from_bytes(header[2:4], 'big')
+        yield marker, position, length
+        if marker == _JPEG_START_OF_SCAN:
+            return
+        position += length
+
+
+def _png_chunks(file:'binary file') -> 'generator':
+    '''
+    Yields the type, offset and length of each chunk of a PNG up to
+    and including the end, reading only their headers
+    '''
+    position = len(PNG_MAGIC)
+    while True:
+        file.seek(position)
+        header = file.read(8)
+        if len(header) < 8:
+            raise ValueError("The PNG is truncated or corrupted")
+        length, chunk_type = struct.unpack(">I4s", header)
+        # Length, type and CRC around the data
+        yield chunk_type, position, 12+length
+        if chunk_type == b"IEND":
+            return
+        position += 12+length
+
+
+def _copy_range(source:'binary file', destination:'binary file', offset:int, length:int):
+    source.seek(offset)
+    while length:
+        chunk = source.read(min(length, 1 << 20))
+        if not chunk:
+            raise ValueError("The image is truncated or corrupted")
+        destination.write(chunk)
+        length -= len(chunk)
+
+
+def _copy_jpeg_scans(source:'binary file', destination:'binary file'):
+    '''
+    Copies the compressed image data from where the source is up to the
+    end of image marker. Marker bytes can't appear in the compressed data,
+    so anything after it, such as the extra images of a multi picture
+    file and their own metadata, is left out
+    '''
+    carry = b""
+    while chunk := source.read(1 << 20):
+        # The marker may be split between chunks
+        window = carry+chunk
+        end = window.find(_JPEG_END_OF_IMAGE)
+        if end != -1:
+            destination.write(window[len(carry):end+len(_JPEG_END_OF_IMAGE)])
+            return
+        destination.write(chunk)
+        carry = chunk[-1:]
+
+
+def _is_jpeg_metadata(file:'binary file', marker:int, offset:int) -> bool:
+    if marker == 0xE2:
+        # APP2 holds ICC profiles, which are kept, and multi picture indexes
+        file.seek(offset+4)
+        return file.read(12) != b"ICC_PROFILE\x00"
+    return marker in _JPEG_METADATA_MARKERS
+
+
+def remove_image_exif(path:str) -> bool:
+    '''
+    Removes the metadata from the provided JPEG or PNG image, which may
+    cause unwanted effects like image rotating, but may reduce the file
+    size greatly. Only the segments or chunks holding metadata are left
+    out, the pixels are copied as they are without being decoded, and the
+    file isn't touched unless there's metadata to remove
+
+    Args:
+        path (str):
+            Path to the image
+
+    Returns:
+        bool:
+            True if the image's exif data is removed successfully, will return
+            False if the process fails, the file isn't a JPEG or PNG, or the
+            image has no exif data
+    '''
+    try:
+        with open(path, "rb") as source:
+            # Checking the start of the file skips anything that isn't an image
+            magic = source.read(len(PNG_MAGIC))
+            if magic.startswith(JPEG_MAGIC):
+                parts = [(offset, length, _is_jpeg_metadata(source, marker, offset)) for marker, offset, length in _jpeg_segments(source)]
+            elif magic == PNG_MAGIC:
+                parts = [(offset, length, chunk_type in _PNG_METADATA_CHUNKS) for chunk_type, offset, length in _png_chunks(source)]
+            else:
+                return False
+            if not any(metadata for _, _, metadata in parts):
+                return False
+
+            with _atomic_write(path) as destination:
+                destination.write(magic[:len(JPEG_MAGIC)-1] if magic.startswith(JPEG_MAGIC) else magic)
+                for offset, length, metadata in parts:
+                    if not metadata:
+                        _copy_range(source, destination, offset, length)
+                if magic.startswith(JPEG_MAGIC):
+                    _copy_jpeg_scans(source, destination)
+
+        return True
+    except Exception:
         return False
 
-def remove_image_exif(path:str) -> bool:
+
+@contextlib.contextmanager
+def _atomic_write(path:str, mode='wb'):
+    '''
+    Opens a temporary file next to 'path' that replaces it only once
+    everything has been written, the temporary file is removed if
+    anything goes wrong
+    '''
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    # Reopened by its path so the file's name is the temporary path,
+    # which workers writing parts of it open themselves
+    os.close(descriptor)
+    try:
+        with open(temporary_path, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        # A new file is left readable only by its owner, like the temporary file
+        if os.path.exists(path):
+            shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def _read_file_chunks(path:str, chunk_size:int, data_type:str) -> 'generator':
+    '''
+    Yields the file as str chunks for the 'str' type, otherwise as
+    bytes chunks, without reading all of it at once
+    '''
+    with open(path, "r" if data_type == 'str' else "rb")as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def _check_cancelled(cancel:'threading.Event'):
+    '''
+    Raises CancelledError once 'cancel' is set, stopping a streamed
+    file between chunks
+    '''
+    if cancel is not None and cancel.is_set():
+        from concurrent.futures import CancelledError
+        raise CancelledError
+
+
+def _encrypt_file_stream(key:'any data type', path:str, chunk_size:int, engine='auto', cancel=None, stats=None) -> bool:
+    '''
+    Encrypts the file 'chunk_size' characters at a time into a temporary
+    file that replaces the origional, producing the same output as
+    'encrypt' does for the files contents
+    '''
+    if stats is not None:
+        stats.lap()
+
+    # The first pass finds the type, length and range of the data
+    # without keeping any of it
+    data_type = 'str'
+    confirmation_data = "39"
+    data_length = len(confirmation_data)
+    max_range = range_finder(confirmation_data, code_points=True)
+    try:
+        for chunk in _read_file_chunks(path, chunk_size, 'str'):
+            data_length += len(chunk)
+            max_range = max(max_range, range_finder(chunk, code_points=True))
+    except UnicodeDecodeError:
+        # Files that aren't text are encrypted as bytes
+        data_type = 'bytes'
+        confirmation_data = confirmation_data.encode()
+        data_length = len(confirmation_data) + os.path.getsize(path)
+        max_range = range_finder(confirmation_data)
+        for chunk in _read_file_chunks(path, chunk_size, data_type):
+            max_range = max(max_range, range_finder(chunk))
+    if stats is not None:
+        stats.lap('conversion')
+
+    keystream = _cipher(key).keystream
+    output_format = _symbol_format(max_range)
+    offset = 0
+    # The confirmation text is a chunk of its own
+    chunks = 1 - (-(data_length-len(confirmation_data))//chunk_size)
+
+    # The second pass encrypts each chunk after the header
+    with _atomic_write(path) as output:
+        output.write(HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES[data_type], 0, max_range, data_length))
+        for done, chunk in enumerate(itertools.chain([confirmation_data], _read_file_chunks(path, chunk_size, data_type)), 1):
+            _check_cancelled(cancel)
+            data_format, segment = _code_points(chunk)
+            chunk_key = keystream.read(offset, len(chunk))
+            if stats is not None:
+                stats.lap('key expansion')
+            encrypted_chunk = _cipher_task((chunk_key, segment(0, len(chunk)), data_format, output_format, max_range, False, engine))
+            if stats is not None:
+                stats.lap('cipher')
+            output.write(_little_endian(encrypted_chunk, output_format))
+            if stats is not None:
+                stats.lap('join')
+                stats.record_segments([(offset, offset+len(chunk))])
+                stats.progress(done, chunks)
+            offset += len(chunk)
+
+    return True
+
+
+def _confirmed_chunks(data_type:str, chunks:'iterable') -> 'iterator':
+    '''
+    Checks the confirmation text at the start of the decrypted chunks,
+    returning the chunks after it, or None if it doesn't match
+    '''
+    confirmation_data = b"39" if data_type == 'bytes' else "39"
+    chunks = iter(chunks)
+
+    first_chunk = confirmation_data[:0]
+    for chunk in chunks:
+        first_chunk += chunk
+        if len(first_chunk) >= len(confirmation_data):
+            break
+    if first_chunk[:len(confirmation_data)] != confirmation_data:
+        return None
+
+    return itertools.chain([first_chunk[len(confirmation_data):]], chunks)
+
+
+def _converted_chunks(data_type:str, chunks:'iterable', cancel=None) -> 'generator':
     '''
-    Removes the metadata from the provided image, which may cause
-    unwanted effects like image rotating, but may reduce the file
-    size greatly
-    
-    Args:
-        path (str):
-            Path to the image
+    Converts decrypted chunks back to the origional type as they're
+    yielded, str for the 'str' type and bytes for everything else
+    '''
+    leftover = ""
+    for chunk in chunks:
+        _check_cancelled(cancel)
+        if data_type in ('str', 'bytes'):
+            yield chunk
+        elif data_type == 'base64':
+            # Base64 only decodes cleanly in multiples of 4 characters
+            chunk = leftover+chunk
+            split = len(chunk) - len(chunk)%4
+            leftover = chunk[split:]
+            yield base64.decodebytes(chunk[:split].encode())
+        else:
+            yield chunk.encode(data_type)
+
+    if leftover:
+        yield base64.decodebytes(leftover.encode())
+
+
+def _write_decrypted_chunks(path:str, data_type:str, chunks:'iterable', cancel=None, compression=None) -> bool:
+    '''
+    Checks the confirmation text at the start of the decrypted chunks,
+    then writes the rest of them in place of the file, decompressing
+    them and converting them back to the files origional type as
+    they're written
+    '''
+    # Checks the confirmation text before anything is written
+    chunks = _confirmed_chunks('bytes' if compression is not None else data_type, chunks)
+    if chunks is None:
+        return False
+    if compression is not None:
+        chunks = _decompressed_chunks(compression, data_type, chunks)
 
-    Returns:
-        bool:
-            True if the image's exif data is removed successfully, will return
-            False if the process fails, or the image has no exif data
+    with _atomic_write(path, "w" if data_type == 'str' else "wb") as output:
+        for chunk in _converted_chunks(data_type, chunks, cancel):
+            output.write(chunk)
+
+    return True
+
+
+def _decrypt_file_stream(key:'any data type', path:str, chunk_size:int, engine='auto', cancel=None, stats=None) -> bool:
     '''
-    try:
-        from PIL import Image
-        image = Image.open(path)
-        data = list(image.getdata())
-        image_without_exif = Image.new(image.mode, image.size)
-        image_without_exif.putdata(data)
-        image_without_exif.save(path)
+    Decrypts a file written by 'encrypt_file' 'chunk_size' characters
+    at a time into a temporary file that replaces the origional
+    '''
+    if stats is not None:
+        stats.lap()
+
+    with open(path, "rb")as file:
+        header = file.read(HEADER.size)
+
+    if header[:len(HEADER_MAGIC)] != HEADER_MAGIC:
+        return _decrypt_legacy_file_stream(key, path, chunk_size, engine, cancel, stats)
+
+    metadata = read_header(header)
+    if stats is not None:
+        stats.lap('metadata')
+    max_range = metadata["range"]
+    data_format = metadata["format"]
+    width = struct.calcsize(data_format)
+    _check_length(metadata, os.path.getsize(path)-HEADER.size)
+
+    # Converting back to python types can't be done in pieces
+    if metadata["type"] not in ('str', 'utf-8', 'base64', 'ISO-8859-1', 'bytes'):
+        return decrypt_file(key, path, stats=stats)
+
+    cipher = _cipher(key)
+    with open(path, "rb")as file:
+        # A wrong key is turned away before the temporary file is made
+        if not cipher.verify_key(file):
+            return False
+    keystream = cipher.keystream
+    output_format = 'B' if max_range <= 1 << 8 else 'I'
+    chunk_size = max(chunk_size, 2)
+    chunks = -(-metadata["length"]//chunk_size)
+
+    def decrypted_chunks() -> 'generator':
+        '''
+        Yields each chunk of the file after the header, decrypted
+        '''
+        offset = 0
+        with open(path, "rb")as file:
+            file.seek(HEADER.size)
+            while chunk := file.read(chunk_size*width):
+                length = len(chunk)//width
+                chunk_key = keystream.read(offset, length)
+                if stats is not None:
+                    stats.lap('key expansion')
+                decrypted_chunk = _cipher_task((chunk_key, _little_endian(chunk, data_format), data_format, output_format, max_range, True, engine))
+                if stats is not None:
+                    stats.lap('cipher')
+                    stats.record_segments([(offset, offset+length)])
+                    stats.progress(offset//chunk_size+1, chunks)
+                yield decrypted_chunk if metadata["type"] == 'bytes' or metadata["compression"] is not None else _decode_code_points(decrypted_chunk, output_format)
+                # The time the chunk took to be written
+                if stats is not None:
+                    stats.lap('join')
+                offset += length
+
+    return _write_decrypted_chunks(path, metadata["type"], decrypted_chunks(), cancel, metadata["compression"])
+
+
+def _decrypt_legacy_file_stream(key:'any data type', path:str, chunk_size:int, engine='auto', cancel=None, stats=None) -> bool:
+    '''
+    Decrypts a file in format version 1 'chunk_size' characters at a
+    time. Format version 1 data is split into a segment per CPU core
+    that each read the keystream from their own offset, so the chunks
+    are split at the same segments 'decrypt' uses
+    '''
+    # UTF-8 continuation bytes don't start a new character, so
+    # removing them leaves one byte per character
+    continuation_bytes = bytes(range(0x80, 0xC0))
+
+    # The first pass counts the characters in the file
+    data_length = 0
+    with open(path, "rb")as file:
+        while chunk := file.read(chunk_size):
+            data_length += len(chunk.translate(None, continuation_bytes))
+
+    cipher = _cipher(key)
+    key_hash = cipher.key_hash
+    splitter_chars = key_hash[2:12]
+    if data_length <= len(splitter_chars):
+        return False
+    position = _metadata_position(key_hash, data_length)
+
+    # The second pass finds the byte offset of the metadata
+    metadata_offset = 0
+    characters = 0
+    with open(path, "rb")as file:
+        while chunk := file.read(chunk_size):
+            chunk_characters = len(chunk.translate(None, continuation_bytes))
+            if characters + chunk_characters > position:
+                break
+            characters += chunk_characters
+            metadata_offset += len(chunk)
+        file.seek(metadata_offset)
+        chunk = file.read(chunk_size+256)
+        # Steps forward one character at a time until the position
+        for byte_position, byte in enumerate(chunk):
+            if byte not in continuation_bytes:
+                if characters == position:
+                    metadata_offset += byte_position
+                    break
+                characters += 1
 
-        return True
-    except Exception:
+        file.seek(metadata_offset)
+        metadata_area = file.read(256).decode(errors='ignore')
+
+    if splitter_chars not in metadata_area:
+        return False
+    metadata = metadata_area[:metadata_area.index(splitter_chars)]
+    metadata_bytes = len((metadata+splitter_chars).encode())
+    cipher_length = data_length-len(metadata+splitter_chars)
+
+    metadata = "".join([chr_((ord_(metadata[pos])-ord_(key_hash[pos]))%130) for pos in range(len(metadata))])
+    try:
+        origional_data_type = metadata.split('(')[0]
+        max_range = int(metadata.split('(')[1].replace(')',''))
+    except (IndexError, ValueError):
         return False
+    if stats is not None:
+        stats.lap('metadata')
+
+    # Converting back to python types can't be done in pieces
+    if origional_data_type not in ('str', 'utf-8', 'base64', 'ISO-8859-1'):
+        return decrypt_file(key, path, stats=stats)
+
+    def encrypted_chunks() -> 'generator':
+        '''
+        Yields the encrypted text around the metadata
+        '''
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with open(path, "rb")as file:
+            remaining = metadata_offset
+            while remaining:
+                chunk = file.read(min(chunk_size, remaining))
+                remaining -= len(chunk)
+                yield decoder.decode(chunk)
+            file.seek(metadata_bytes, os.SEEK_CUR)
+            while chunk := file.read(chunk_size):
+                yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+
+    keystream = cipher.keystream
+    # ListCrypt currently does not support multiprocessing in windows
+    segments = cpu_count() if platform.system() == "Linux" else 1
+
+    def decrypt_chunk(chunk:str, offset:int) -> str:
+        '''
+        Decrypts the chunk starting 'offset' characters into the data
+        '''
+        decrypted_pieces = []
+        for start, stop, key_offset in _segment_pieces(offset, len(chunk), cipher_length, segments):
+            piece_key = keystream.read(key_offset, stop-start)
+            if stats is not None:
+                stats.lap('key expansion')
+            decrypted_pieces.append(cipher_segment(piece_key, chunk[start-offset:stop-offset], max_range, reverse=True, engine=engine))
+            if stats is not None:
+                stats.lap('cipher')
+        if stats is not None:
+            stats.record_segments([(offset, offset+len(chunk))])
+        return "".join(decrypted_pieces)
+
+    def decrypted_chunks() -> 'generator':
+        '''
+        Yields the decrypted text around the metadata
+        '''
+        offset = 0
+        for chunk in encrypted_chunks():
+            yield decrypt_chunk(chunk, offset)
+            if stats is not None:
+                stats.lap('join')
+            offset += len(chunk)
+
+    return _write_decrypted_chunks(path, origional_data_type, decrypted_chunks(), cancel)
+
+
+def _cipher_mapped(keystream:Keystream, source:'file', source_offset:int, output:'file', output_offset:int, length:int, key_offset:int, window_size:int, max_range:int, reverse:bool, engine:str, cancel=None, stats=None):
+    '''
+    Encrypts or decrypts 'length' bytes of the source file straight into
+    the output file, mapping one window of each into memory at a time so
+    the page cache does the reading and writing
+    '''
+    key = bytearray(min(window_size, length))
+    granularity = mmap.ALLOCATIONGRANULARITY
+    windows = -(-length//window_size)
+    if stats is not None:
+        stats.lap()
+
+    for position in range(0, length, window_size):
+        _check_cancelled(cancel)
+        size = min(window_size, length-position)
+
+        # Maps can only start at a multiple of the allocation granularity
+        source_start = source_offset+position
+        source_skip = source_start%granularity
+        output_start = output_offset+position
+        output_skip = output_start%granularity
+
+        with mmap.mmap(source.fileno(), source_skip+size, offset=source_start-source_skip, access=mmap.ACCESS_READ) as source_map, \
+                mmap.mmap(output.fileno(), output_skip+size, offset=output_start-output_skip) as output_map:
+            with memoryview(source_map)[source_skip:source_skip+size] as data, \
+                    memoryview(output_map)[output_skip:output_skip+size] as encrypted_data, \
+                    memoryview(key)[:size] as window_key:
+                keystream.readinto(window_key, key_offset+position)
+                if stats is not None:
+                    stats.lap('key expansion')
+                cipher_buffer(window_key, data, encrypted_data, max_range, reverse, engine)
+                if stats is not None:
+                    stats.lap('cipher')
+
+        if stats is not None:
+            stats.record_segments([(position, position+size)])
+            stats.progress(position//window_size+1, windows)
+
+
+def _mapped_task(task:tuple):
+    '''
+    Runs '_cipher_mapped' over one part of a file in a worker,
+    opening the source and output files by their paths
+    '''
+    key, source_path, source_offset, output_path, output_offset, length, key_offset, window_size, max_range, reverse, engine = task
+    with open(source_path, "rb")as source, open(output_path, "r+b")as output:
+        _cipher_mapped(Keystream(key), source, source_offset, output, output_offset, length, key_offset, window_size, max_range, reverse, engine)
+
+
+def _cipher_mapped_parts(keystream:Keystream, source:'file', source_offset:int, output:'file', output_offset:int, length:int, key_offset:int, window_size:int, max_range:int, reverse:bool, engine:str, cancel, stats, pool:WorkerPool):
+    '''
+    Runs '_cipher_mapped' over the whole file, or splits it into a
+    part per worker of the pool when one is given
+    '''
+    if pool is None:
+        return _cipher_mapped(keystream, source, source_offset, output, output_offset, length, key_offset, window_size, max_range, reverse, engine, cancel, stats)
+
+    # The workers map the output file themselves
+    output.flush()
+    tasks = [
+        (keystream.key, source.name, source_offset+start, output.name, output_offset+start, stop-start, key_offset+start, window_size, max_range, reverse, engine)
+        for start, stop in segment_ranges(length, pool.processes, window_size)
+    ]
+    _run_tasks(_mapped_task, tasks, pool, None, stats)
+
+
+def _encrypt_file_mapped(key:'any data type', path:str, window_size:int, engine='auto', cancel=None, stats=None, pool=None) -> bool:
+    '''
+    Encrypts the file as bytes 'window_size' bytes at a time from a memory
+    map of it into a memory map of a preallocated temporary file that
+    replaces the origional, split across the workers of the pool if
+    one is given
+    '''
+    # Every byte value is allowed for, so each byte encrypts to one
+    # byte and the size of the output is known before starting
+    confirmation_data = b"39"
+    max_range = 1 << 8
+    file_size = os.path.getsize(path)
+    keystream = _cipher(key).keystream
+
+    header = HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES['bytes'], 0, max_range, len(confirmation_data)+file_size)
+    encrypted_confirmation = bytearray(len(confirmation_data))
+    cipher_buffer(keystream.read(0, len(confirmation_data)), memoryview(confirmation_data), memoryview(encrypted_confirmation), max_range, engine=engine)
+
+    with open(path, "rb")as source, _atomic_write(path, "w+b") as output:
+        output.write(header+encrypted_confirmation)
+        output.truncate(len(header)+len(confirmation_data)+file_size)
+        if file_size:
+            _cipher_mapped_parts(keystream, source, 0, output, len(header)+len(confirmation_data), file_size, len(confirmation_data), window_size, max_range, False, engine, cancel, stats, pool)
+
+    return True
+
+
+def _decrypt_file_mapped(key:'any data type', path:str, window_size:int, engine='auto', cancel=None, stats=None, pool=None) -> bool:
+    '''
+    Decrypts a file written by '_encrypt_file_mapped', or any format
+    version 2 bytes with one byte per character, the same way it was
+    encrypted. Anything else is streamed instead
+    '''
+    with open(path, "rb")as file:
+        header = file.read(HEADER.size)
+
+    if header[:len(HEADER_MAGIC)] != HEADER_MAGIC:
+        return _decrypt_file_stream(key, path, window_size, engine, cancel, stats)
+    metadata = read_header(header)
+    if metadata["type"] != 'bytes' or metadata["format"] != 'B' or metadata["compression"] is not None:
+        return _decrypt_file_stream(key, path, window_size, engine, cancel, stats)
+
+    max_range = metadata["range"]
+    confirmation_data = b"39"
+    data_length = _check_length(metadata, os.path.getsize(path)-HEADER.size)-len(confirmation_data)
+
+    # Checks the confirmation text before anything is written
+    cipher = _cipher(key)
+    with open(path, "rb")as file:
+        if not cipher.verify_key(file):
+            return False
+    keystream = cipher.keystream
+
+    with open(path, "rb")as source, _atomic_write(path, "w+b") as output:
+        output.truncate(data_length)
+        if data_length:
+            _cipher_mapped_parts(keystream, source, HEADER.size+len(confirmation_data), output, 0, data_length, len(confirmation_data), window_size, max_range, True, engine, cancel, stats, pool)
+
+    return True
 
 
-def encrypt_file(key:'any data type', path:str, metadata_removal=True) -> bool:
+def encrypt_file(key:'any data type', path:str, metadata_removal=True, chunk_size=None, memory_map=False, stats=None, compression=None) -> bool:
     '''
     This function enables the easy encryption of files
 
@@ -589,15 +3222,54 @@ def encrypt_file(key:'any data type', path:str, metadata_removal=True) -> bool:
         metadata_removal (bool, *optional):
             Removes any exif data from your images, 
             which may cause side effects like image rotating
+
+        chunk_size (int, *optional):
+            Streams the file through a temporary file this many
+            characters at a time, keeping memory use constant no
+            matter the file size. The output is the same as
+            without a 'chunk_size'
+
+        memory_map (bool, *optional):
+            Encrypts the file as bytes from a memory map of it into a
+            memory map of the output, one window of 'chunk_size' bytes
+            (4 MiB by default) at a time, leaving the reading and
+            writing to the page cache
+
+        stats (Stats, *optional):
+            Records the time spent in each stage, with a progress
+            event for each chunk of a streamed or memory mapped file
+
+        compression (str, *optional):
+            Compresses the file with 'zlib', 'lzma' or 'bz2' before
+            encrypting it, unless it doesn't compress. A streamed file
+            is compressed and encrypted as bytes 'chunk_size' bytes at
+            a time. Can't be used with 'memory_map'
     
     Returns:
         bool:
             True if the file is encrypted successfully
 
     '''
+    if memory_map and compression is not None:
+        raise ValueError("Compressed files can't be memory mapped, their length changes")
+
     # Attempts to remove meta data from images to reduce storage size
     if metadata_removal:
         remove_image_exif(path)
+
+    if memory_map:
+        return _encrypt_file_mapped(key, path, chunk_size or 1 << 22, stats=stats)
+
+    if chunk_size and compression is not None:
+        # The compressed length is only known once it's written,
+        # so the file is compressed and encrypted in one pass
+        with open(path, "rb")as source, _atomic_write(path) as output:
+            encrypt_stream(key, source, output, chunk_size, compression=compression)
+        return True
+
+    if chunk_size:
+        return _encrypt_file_stream(key, path, chunk_size, stats=stats)
+
     # Allows for opening both string and byte files without issue
     try:
         with open(path, "r")as file:
@@ -606,7 +3278,7 @@ def encrypt_file(key:'any data type', path:str, metadata_removal=True) -> bool:
         with open(path, "rb")as file:
             encrypted_file_data = file.read()
 
-    encrypted_data = encrypt(key, encrypted_file_data)
+    encrypted_data = encrypt(key, encrypted_file_data, stats=stats, compression=compression)
 
     with open(path, 'wb')as f:
         f.write(encrypted_data)
@@ -614,7 +3286,7 @@ def encrypt_file(key:'any data type', path:str, metadata_removal=True) -> bool:
     return True
 
 
-def decrypt_file(key:'any data type', path:str) -> bool:
+def decrypt_file(key:'any data type', path:str, chunk_size=None, memory_map=False, stats=None) -> bool:
     '''
     This function enables the easy decryption of files
     
@@ -624,19 +3296,45 @@ def decrypt_file(key:'any data type', path:str) -> bool:
             
         path (str):
             The location of your file in your filesystem
+
+        chunk_size (int, *optional):
+            Streams the file through a temporary file this many
+            characters at a time, keeping memory use constant no
+            matter the file size
+
+        memory_map (bool, *optional):
+            Decrypts files encrypted with 'memory_map' between memory
+            maps one window of 'chunk_size' bytes (4 MiB by default)
+            at a time, other files are streamed instead
+
+        stats (Stats, *optional):
+            Records the time spent in each stage, with a progress
+            event for each chunk of a streamed or memory mapped file
     
     Returns:
         bool:
             True if the file is decrypted successfully
 
     '''
+    if chunk_size or memory_map:
+        if not os.path.isfile(path):
+            raise NameError('Incorrect File Path')
+        if memory_map:
+            return _decrypt_file_mapped(key, path, chunk_size or 1 << 22, stats=stats)
+        return _decrypt_file_stream(key, path, chunk_size, stats=stats)
+
     try:
-        with open(path, "rb")as file:
-            encrypted_data = file.read()
+        file = open(path, "rb")
     except Exception:
         raise NameError('Incorrect File Path')
+    with file:
+        # A wrong key is turned away before the rest of the file is read
+        if file.read(len(HEADER_MAGIC)) == HEADER_MAGIC and not verify_key(key, file):
+            return False
+        file.seek(0)
+        encrypted_data = file.read()
 
-    decrypted_data = decrypt(key, encrypted_data)
+    decrypted_data = decrypt(key, encrypted_data, stats=stats)
 
     # Returns False if decryption process fails
     if not decrypted_data:
@@ -653,28 +3351,699 @@ def decrypt_file(key:'any data type', path:str) -> bool:
     return True
 
 
-if __name__=="__main__":
-    #Example use of the 'encrypt_file()' and 'decrypt_file()' functions
-    if True:
-        file_path = "file.txt"
-        key = "example key"
+def _cipher_stream_chunk(keystream:Keystream, chunk:bytes, data_format:str, output_format:str, offset:int, max_range:int, reverse:bool, engine:str, pool:WorkerPool) -> bytes:
+    '''
+    Encrypts or decrypts one chunk of little endian characters read from
+    a stream, starting at character 'offset' of the keystream and split
+    across the pool's workers if one is given. The resulting characters
+    are in the machine's byte order
+    '''
+    length = len(chunk)//struct.calcsize(data_format)
+    ranges = _ranges(length, pool.processes if pool is not None else 1, pool)
+    source = _code_points(_little_endian(chunk, data_format), data_format)
+    return _cipher_code_points(keystream, source, ranges, [offset+start for start, _ in ranges], output_format, max_range, reverse, engine, pool, False, None)
 
-        #Encrypts the data from the file, back into the file
-        encrypt_file(key, file_path)
-    
-        #Decrypts the data from the file, back into the file
-        decrypt_file(key, file_path)
 
-    #Example use of the 'encrypt()' and 'decrypt()' functions
-    if False:
-        data = "example data" 
-        key = "example key"
+def _stream_pool(processes:int) -> WorkerPool:
+    # ListCrypt currently does not support multiprocessing in windows
+    if processes > 1 and platform.system() == "Linux":
+        return WorkerPool(processes)
+    return None
+
+
+def _read_stream_header(source:'binary file') -> tuple:
+    '''
+    Reads the header at the start of an encrypted stream, returning
+    it along with what 'read_header' reads from it
+    '''
+    header = source.read(HEADER.size)
+    if header[:len(HEADER_MAGIC)] != HEADER_MAGIC:
+        raise ValueError("Only format version 2 data can be streamed")
+    return header, read_header(header)
+
+
+def _stream_chunks(source:'binary file', metadata:dict, chunk_size:int) -> 'generator':
+    '''
+    Yields the offset and encrypted characters of each chunk after the
+    header, checking the amount of characters matches the header
+    '''
+    width = struct.calcsize(metadata["format"])
+    offset = 0
+    while chunk := source.read(chunk_size*width):
+        if len(chunk)%width:
+            raise ValueError("The encrypted data is truncated or corrupted")
+        yield offset, chunk
+        offset += len(chunk)//width
+
+    if not metadata["flags"] & FLAG_STREAMED and offset != metadata["length"]:
+        raise ValueError("The encrypted data is truncated or corrupted")
+
+
+def encrypt_stream(key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 << 20, processes=1, engine='auto', compression=None) -> int:
+    '''
+    Encrypts everything read from the source into the destination as
+    bytes, 'chunk_size' bytes at a time, so data of any size can be piped
+    through with constant memory use
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        source (binary file):
+            Read until it ends, such as 'sys.stdin.buffer'
+        destination (binary file):
+            Where the encrypted data is written, such as 'sys.stdout.buffer'
+        chunk_size (int, default:1 MiB):
+            The most bytes read and encrypted at a time
+        processes (int, default:1):
+            The amount of worker processes each chunk is split across
+        compression (str, *optional):
+            Compresses the data with 'zlib', 'lzma' or 'bz2' a chunk
+            at a time before encrypting it, unless the first chunk
+            doesn't compress
+
+    Returns:
+        int: The amount of bytes encrypted
+    '''
+    keystream = _cipher(key).keystream
+    confirmation_data = b"39"
+    max_range = 1 << 8
+    first_chunk = source.read(chunk_size)
+
+    flags = 0
+    if compression is not None:
+        _check_compression(compression)
+        if _compressible(first_chunk):
+            flags = COMPRESSIONS[compression] << COMPRESSION_SHIFT
+
+    # Regular files have a known length, anything else, like a pipe,
+    # is marked as streamed and its length is found when decrypting.
+    # So is compressed data, its length is only known once it's written
+    try:
+        status = os.fstat(source.fileno())
+        length = status.st_size-source.tell()+len(first_chunk) if stat.S_ISREG(status.st_mode) else None
+    except (AttributeError, OSError):
+        length = None
+    if length is None or flags:
+        header = HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES['bytes'], flags | FLAG_STREAMED, max_range, 0)
+    else:
+        header = HEADER.pack(HEADER_MAGIC, 2, DATA_TYPES['bytes'], 0, max_range, len(confirmation_data)+length)
+    destination.write(header)
+
+    source_length = 0
+    def source_chunks() -> 'generator':
+        nonlocal source_length
+        chunk = first_chunk
+        while chunk:
+            source_length += len(chunk)
+            yield chunk
+            chunk = source.read(chunk_size)
+
+    chunks = source_chunks()
+    if flags:
+        chunks = _compress_chunks(compression, chunks)
+
+    offset = 0
+    pool = _stream_pool(processes)
+    try:
+        chunk = confirmation_data+next(chunks, b"")
+        while chunk:
+            destination.write(_cipher_stream_chunk(keystream, chunk, 'B', 'B', offset, max_range, False, engine, pool))
+            offset += len(chunk)
+            chunk = next(chunks, b"")
+    finally:
+        if pool is not None:
+            pool.close()
+    destination.flush()
+
+    if length is not None and source_length != length:
+        raise ValueError("The source changed size while it was being encrypted")
+    return source_length
+
+
+def decrypt_stream(key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 << 20, processes=1, engine='auto') -> bool:
+    '''
+    Decrypts format version 2 data read from the source into the
+    destination 'chunk_size' characters at a time, nothing is written
+    until the key is confirmed to be correct. Text is written as UTF-8
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        source (binary file):
+            The encrypted data, such as 'sys.stdin.buffer'
+        destination (binary file):
+            Where the decrypted data is written, such as 'sys.stdout.buffer'
+        chunk_size (int, default:1 MiB):
+            The most characters read and decrypted at a time
+        processes (int, default:1):
+            The amount of worker processes each chunk is split across
+
+    Returns:
+        bool: True if the data is decrypted successfully, otherwise False
+    '''
+    keystream = _cipher(key).keystream
+    _, metadata = _read_stream_header(source)
+    data_type = metadata["type"]
+    # Converting back to python types can't be done in pieces
+    if data_type not in ('str', 'utf-8', 'base64', 'ISO-8859-1', 'bytes'):
+        raise ValueError(f"'{data_type}' data can't be streamed, use 'decrypt' instead")
+
+    compression = metadata["compression"]
+    max_range = metadata["range"]
+    output_format = 'B' if max_range <= 1 << 8 else 'I'
+    pool = _stream_pool(processes)
+
+    def decrypted_chunks() -> 'generator':
+        for offset, chunk in _stream_chunks(source, metadata, max(chunk_size, 2)):
+            decrypted_chunk = _cipher_stream_chunk(keystream, chunk, metadata["format"], output_format, offset, max_range, True, engine, pool)
+            yield decrypted_chunk if data_type == 'bytes' or compression is not None else _decode_code_points(decrypted_chunk, output_format)
+
+    try:
+        chunks = _confirmed_chunks('bytes' if compression is not None else data_type, decrypted_chunks())
+        if chunks is None:
+            return False
+        if compression is not None:
+            chunks = _decompressed_chunks(compression, data_type, chunks)
+        for chunk in _converted_chunks(data_type, chunks):
+            destination.write(chunk.encode() if data_type == 'str' else chunk)
+    finally:
+        if pool is not None:
+            pool.close()
+    destination.flush()
+
+    return True
+
+
+def rekey_stream(key:'any data type', new_key:'any data type', source:'binary file', destination:'binary file', chunk_size=1 << 20, processes=1, engine='auto') -> bool:
+    '''
+    Re-encrypts format version 2 data read from the source under a new
+    key into the destination 'chunk_size' characters at a time, without
+    converting it back to its origional type. Nothing is written until
+    the old key is confirmed to be correct
+
+    Args:
+        key (any data type):
+            The key the data is currently encrypted with
+        new_key (any data type):
+            The key to encrypt the data with
+        source (binary file):
+            The encrypted data, such as 'sys.stdin.buffer'
+        destination (binary file):
+            Where the re-encrypted data is written
+
+    Returns:
+        bool: True if the data is re-encrypted successfully, otherwise False
+    '''
+    keystream = _cipher(key).keystream
+    new_keystream = _cipher(new_key).keystream
+    header, metadata = _read_stream_header(source)
+
+    max_range = metadata["range"]
+    data_format = metadata["format"]
+    decrypted_format = 'B' if max_range <= 1 << 8 else 'I'
+    confirmation_data = "39"
+    pool = _stream_pool(processes)
+    try:
+        for offset, chunk in _stream_chunks(source, metadata, max(chunk_size, 2)):
+            decrypted_chunk = _cipher_stream_chunk(keystream, chunk, data_format, decrypted_format, offset, max_range, True, engine, pool)
+            if offset == 0:
+                width = struct.calcsize(decrypted_format)
+                if _decode_code_points(decrypted_chunk[:len(confirmation_data)*width], decrypted_format) != confirmation_data:
+                    return False
+                destination.write(header)
+            encrypted_chunk = _cipher_stream_chunk(new_keystream, _little_endian(decrypted_chunk, decrypted_format), decrypted_format, data_format, offset, max_range, False, engine, pool)
+            destination.write(_little_endian(encrypted_chunk, data_format))
+    finally:
+        if pool is not None:
+            pool.close()
+    destination.flush()
+
+    return True
+
+
+def _record_progress(progress_path:str, operation:str, path:str):
+    '''
+    Appends a finished file to the progress file in a single unbuffered
+    write, so it's recorded the moment the file is replaced and the
+    records of workers finishing at the same time never interleave
+    '''
+    import json
+
+    if progress_path is None:
+        return
+    record = json.dumps({"operation": operation, "path": os.path.abspath(path)})+"\n"
+    descriptor = os.open(progress_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(descriptor, record.encode())
+    finally:
+        os.close(descriptor)
+
+
+def _tree_task(task:tuple) -> list:
+    '''
+    Encrypts or decrypts a batch of files one after another in a
+    worker, recording each in the progress file as it finishes.
+    Returns the path of each with the error it raised, or None if
+    it succeeded
+    '''
+    operation, key, paths, metadata_removal, chunk_size, progress_path = task
+    # Small files all start at the beginning of the keystream,
+    # so it's generated once for the whole batch
+    key = Cipher(key)
+    results = []
+    for path in paths:
+        try:
+            if operation == 'encrypt':
+                successful = encrypt_file(key, path, metadata_removal, chunk_size)
+            else:
+                successful = decrypt_file(key, path, chunk_size)
+        except Exception as exception:
+            results.append((path, repr(exception)))
+            continue
+        if successful:
+            _record_progress(progress_path, operation, path)
+        results.append((path, None if successful else "decryption failed"))
+    return results
+
+
+def _is_encrypted(path:str) -> bool:
+    '''
+    Whether the file starts with the header of format version 2
+    '''
+    with open(path, "rb")as file:
+        return file.read(len(HEADER_MAGIC)) == HEADER_MAGIC
+
+
+def _tree_files(root:str, skipped:set) -> list:
+    '''
+    Returns the path and size of every regular file under 'root',
+    leaving out symbolic links and the 'skipped' paths
+    '''
+    files = []
+    for directory, directories, names in os.walk(root):
+        directories.sort()
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            if not os.path.islink(path) and os.path.isfile(path) and os.path.abspath(path) not in skipped:
+                files.append((path, os.path.getsize(path)))
+    return files
+
+
+def _cipher_tree(operation:str, key:'any data type', root:str, processes:int, metadata_removal:bool, chunk_size:int, large_file_size:int, progress_path:str, stats:'Stats', force=False) -> dict:
+    '''
+    Shared by 'encrypt_tree' and 'decrypt_tree'
+    '''
+    import json
+
+    if not os.path.isdir(root):
+        raise NameError('Incorrect Directory Path')
+
+    # ListCrypt currently does not support multiprocessing in windows
+    if platform.system() != "Linux":
+        processes = 1
+
+    # Files finished by an earlier, interrupted run are skipped
+    finished = set()
+    if progress_path is not None and os.path.exists(progress_path):
+        with open(progress_path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line of a run that was killed mid write
+                    continue
+                if entry["operation"] == operation:
+                    finished.add(entry["path"])
+
+    skipped = {os.path.abspath(path) for path in finished}
+    if progress_path is not None:
+        skipped.add(os.path.abspath(progress_path))
+    files = _tree_files(root, skipped)
+
+    report = {"succeeded": [], "skipped": sorted(finished), "failed": {}}
+    # A file replaced just before an interruption, but not yet recorded,
+    # would otherwise be encrypted a second time
+    if operation == 'encrypt' and not force:
+        encrypted = {path for path, _ in files if _is_encrypted(path)}
+        report["skipped"] = sorted(report["skipped"]+[os.path.abspath(path) for path in encrypted])
+        files = [(path, size) for path, size in files if path not in encrypted]
+    total = len(files)
+
+    def finished_file(path:str, error:str):
+        if error is None:
+            report["succeeded"].append(path)
+        else:
+            report["failed"][path] = error
+        if stats is not None:
+            stats.progress(len(report["succeeded"])+len(report["failed"]), total)
+
+    # Large files are split across every worker one at a time, smaller
+    # ones are batched so each worker handles many files per task
+    small_files = [(path, size) for path, size in files if size < large_file_size]
+    large_files = [path for path, size in files if size >= large_file_size]
+    batches = _batch_ranges([size+1 for _, size in small_files], processes*4)
+    # The workers build their own Cipher from the key, a Cipher's
+    # hash state can't be sent to them
+    task_key = key.key if isinstance(key, Cipher) else key
+    tasks = [
+        (operation, task_key, [path for path, _ in small_files[start:stop]], metadata_removal, chunk_size, progress_path)
+        for start, stop in batches
+    ]
+
+    pool = WorkerPool(processes) if processes > 1 else None
+    try:
+        results = pool.imap_unordered(_tree_task, tasks) if pool is not None else map(_tree_task, tasks)
+        for batch in results:
+            for path, error in batch:
+                finished_file(path, error)
+
+        for path in large_files:
+            try:
+                if operation == 'encrypt':
+                    if metadata_removal:
+                        remove_image_exif(path)
+                    successful = _encrypt_file_mapped(key, path, chunk_size, pool=pool)
+                else:
+                    successful = _decrypt_file_mapped(key, path, chunk_size, pool=pool)
+            except Exception as exception:
+                finished_file(path, repr(exception))
+                continue
+            if successful:
+                _record_progress(progress_path, operation, path)
+            finished_file(path, None if successful else "decryption failed")
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # Nothing is left to resume once every file has succeeded
+    if progress_path is not None and not report["failed"]:
+        os.remove(progress_path)
+
+    return report
+
+
+def encrypt_tree(key:'any data type', root:str, processes=cpu_count(), metadata_removal=True, chunk_size=1 << 20, large_file_size=1 << 26, progress_path=None, stats=None, force=False) -> dict:
+    '''
+    Encrypts every file under the directory across a pool of worker
+    processes, working on many files at once rather than splitting each
+    file across processes
+
+    Args:
+        key (any data type):
+            The key used to encrypt the files, can be any data type
+        root (str):
+            The directory to encrypt, including every directory inside it
+        processes (int, default:All available CPU cores):
+            The amount of worker processes
+        metadata_removal (bool, *optional):
+            Removes any exif data from images before encrypting them
+        chunk_size (int, default:1 MiB):
+            Each file is streamed this many characters at a time,
+            or memory mapped this many bytes at a time if it's large
+        large_file_size (int, default:64 MiB):
+            Files of atleast this many bytes are memory mapped and split
+            across every worker, smaller files are batched together
+        progress_path (str, *optional):
+            A file recording each file as it finishes, running again with
+            the same 'progress_path' after being interrupted skips the files
+            already encrypted. It's removed once every file succeeds
+        stats (Stats, *optional):
+            Gets a progress event as each file finishes
+        force (bool, default:False):
+            Encrypts files that already start with an encrypted header
+            too, rather than skipping them
+
+    Returns:
+        dict:
+            The paths that were encrypted under "succeeded", the paths
+            skipped from an earlier run or already encrypted under
+            "skipped", and the error of each file that couldn't be
+            encrypted under "failed"
+    '''
+    return _cipher_tree('encrypt', key, root, processes, metadata_removal, chunk_size, large_file_size, progress_path, stats, force)
+
+
+def decrypt_tree(key:'any data type', root:str, processes=cpu_count(), chunk_size=1 << 20, large_file_size=1 << 26, progress_path=None, stats=None) -> dict:
+    '''
+    Decrypts every file under the directory encrypted by 'encrypt_tree'
+    or 'encrypt_file' across a pool of worker processes
+
+    Args:
+        key (any data type):
+            The key used to decrypt the files, can be any data type
+        root (str):
+            The directory to decrypt, including every directory inside it
+        processes (int, default:All available CPU cores):
+            The amount of worker processes
+        chunk_size (int, default:1 MiB):
+            Each file is streamed this many characters at a time,
+            or memory mapped this many bytes at a time if it's large
+        large_file_size (int, default:64 MiB):
+            Files of atleast this many bytes encrypted as bytes are
+            split across every worker, smaller files are batched together
+        progress_path (str, *optional):
+            A file recording each file as it finishes, running again with
+            the same 'progress_path' after being interrupted skips the files
+            already decrypted. It's removed once every file succeeds
+        stats (Stats, *optional):
+            Gets a progress event as each file finishes
+
+    Returns:
+        dict:
+            The paths that were decrypted under "succeeded", the paths
+            skipped from an earlier run under "skipped", and the error of
+            each file that couldn't be decrypted under "failed"
+    '''
+    return _cipher_tree('decrypt', key, root, processes, False, chunk_size, large_file_size, progress_path, stats)
+
+
+def _default_executor(processes=True) -> 'Executor':
+    '''
+    Returns the executor the async functions use by default, with a
+    worker process per CPU core so awaiting many calls at once doesn't
+    run more of them than there are cores. Ciphering holds the GIL, so
+    calls run on threads would keep the event loop from running. Calls
+    on a WorkerPool can only use it from this process, so they get a
+    thread per CPU core instead
+    '''
+    with _executor_lock:
+        if processes not in _executors:
+            if processes:
+                from concurrent.futures import ProcessPoolExecutor
+                from multiprocessing import resource_tracker
+
+                # Workers share the parent's tracker for shared memory
+                # only if it's running before they're started
+                resource_tracker.ensure_running()
+                _executors[processes] = ProcessPoolExecutor(max_workers=cpu_count())
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                _executors[processes] = ThreadPoolExecutor(max_workers=cpu_count(), thread_name_prefix="listcrypt")
+        return _executors[processes]
+
+
+def _is_process_executor(executor:'Executor') -> bool:
+    from concurrent.futures import ProcessPoolExecutor
+    return isinstance(executor, ProcessPoolExecutor)
+
+
+def _executor_key(key:'any data type', executor:'Executor') -> 'any data type':
+    '''
+    The key to send to the executor, a Cipher's hash state can't be
+    sent to another process so only its key is
+    '''
+    if isinstance(key, Cipher) and _is_process_executor(executor):
+        return key.key
+    return key
+
+
+class _ProcessEvent:
+    '''
+    A flag like threading.Event that can be sent to a worker process,
+    kept in a byte of shared memory the worker attaches to by name
+    '''
+    def __init__(self, name=None):
+        from multiprocessing import shared_memory
+
+        self._owner = name is None
+        self._memory = shared_memory.SharedMemory(name, create=self._owner, size=1)
+        if self._owner:
+            self._memory.buf[0] = 0
+
+    def __reduce__(self):
+        return (_ProcessEvent, (self._memory.name,))
+
+    def set(self):
+        self._memory.buf[0] = 1
+
+    def is_set(self) -> bool:
+        return self._memory.buf[0] == 1
+
+    def close(self):
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def _call_with_stats(function:'callable') -> tuple:
+    '''
+    Runs 'function' in an executor's worker process with a Stats of
+    its own, returning its result along with the Stats
+    '''
+    stats = Stats()
+    return function(stats=stats), stats
+
+
+async def _run_in_executor(function:'callable', executor:'Executor', cancel=None, stats=None) -> 'any':
+    '''
+    Awaits 'function()' on the executor, passing it 'stats' when one
+    is given. If the awaiting task is cancelled before the function
+    starts it never runs, otherwise 'cancel' is set and the function
+    is waited on to stop cleanly. A call in another process fills in a
+    Stats of its own, which is added to 'stats' once it finishes
+    '''
+    import asyncio
+
+    executor = executor or _default_executor()
+    in_process = _is_process_executor(executor)
+    if stats is not None:
+        function = functools.partial(_call_with_stats, function) if in_process else functools.partial(function, stats=stats)
+
+    concurrent_future = executor.submit(function)
+    future = asyncio.wrap_future(concurrent_future)
+    try:
+        result = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cancel is not None:
+            cancel.set()
+        # Only fails to cancel once it's started
+        if not concurrent_future.cancel():
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()
+        raise
+
+    if stats is not None and in_process:
+        result, call_stats = result
+        stats.merge(call_stats)
+    return result
+
+
+async def encrypt_async(key:'any data type', data:'any data type', processes=1, engine='auto', pool=None, shared_memory=False, timeout=None, executor=None, format_version=FORMAT_VERSION, stats=None, compression=None) -> bytes:
+    '''
+    Awaitable version of 'encrypt', running it on an executor so the
+    event loop isn't blocked
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data 
+        data (any data type):
+            The data to be encrypted
+        processes (int, default:1):
+            The amount of processes each call is split across, the
+            executor already runs as many calls at once as there are cores
+        pool (WorkerPool, *optional):
+            Runs the segments on the pool's already started workers,
+            the call itself then runs on a thread of this process
+        executor (Executor, *optional):
+            Runs the call on this executor rather than the default,
+            which runs a call per CPU core at a time in worker processes
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call, the stages
+            of a call in a worker process are added once it finishes
+
+    The other arguments are the same as 'encrypt'
+
+    Returns:
+        bytes: The encrypted data, the same as 'encrypt'
+    '''
+    executor = executor or _default_executor(processes=pool is None)
+    function = functools.partial(
+        encrypt, _executor_key(key, executor), data, processes, engine, pool, shared_memory, timeout, format_version,
+        compression=compression,
+    )
+    return await _run_in_executor(function, executor, stats=stats)
 
-        e = encrypt(key, data)
 
-        d = decrypt(key, e)
+async def decrypt_async(key:'any data type', encrypted_data:bytes, processes=1, engine='auto', pool=None, shared_memory=False, timeout=None, executor=None, stats=None) -> "origional data":
+    '''
+    Awaitable version of 'decrypt', running it on an executor so the
+    event loop isn't blocked
+
+    Args:
+        key (any data type):
+            Used to create a larger key which is used for encrypting the data
+        encrypted_data (bytes):
+            The encrypted bytes returned by the 'encrypt' function
+        processes (int, default:1):
+            The amount of processes each call is split across, the
+            executor already runs as many calls at once as there are cores
+        pool (WorkerPool, *optional):
+            Runs the segments on the pool's already started workers,
+            the call itself then runs on a thread of this process
+        executor (Executor, *optional):
+            Runs the call on this executor rather than the default,
+            which runs a call per CPU core at a time in worker processes
+        stats (Stats, *optional):
+            Records the time spent in each stage of the call, the stages
+            of a call in a worker process are added once it finishes
+
+    The other arguments are the same as 'decrypt'
+
+    Returns:
+        The origional data, or False if decryption fails
+    '''
+    executor = executor or _default_executor(processes=pool is None)
+    function = functools.partial(decrypt, _executor_key(key, executor), encrypted_data, processes, engine, pool, shared_memory, timeout)
+    return await _run_in_executor(function, executor, stats=stats)
+
+
+async def encrypt_file_async(key:'any data type', path:str, metadata_removal=True, chunk_size=1 << 20, engine='auto', executor=None, stats=None) -> bool:
+    '''
+    Awaitable version of 'encrypt_file', the file is always streamed
+    'chunk_size' characters at a time on an executor. Cancelling it
+    stops between chunks and leaves the origional file untouched
+
+    Returns:
+        bool:
+            True if the file is encrypted successfully
+    '''
+    executor = executor or _default_executor()
+    if metadata_removal:
+        await _run_in_executor(functools.partial(remove_image_exif, path), executor)
+
+    # The flag is checked between chunks, which may be in another process
+    cancel = _ProcessEvent()
+    try:
+        function = functools.partial(_encrypt_file_stream, _executor_key(key, executor), path, chunk_size, engine, cancel)
+        return await _run_in_executor(function, executor, cancel, stats)
+    finally:
+        cancel.close()
+
+
+async def decrypt_file_async(key:'any data type', path:str, chunk_size=1 << 20, engine='auto', executor=None, stats=None) -> bool:
+    '''
+    Awaitable version of 'decrypt_file', the file is always streamed
+    'chunk_size' characters at a time on an executor. Cancelling it
+    stops between chunks and leaves the encrypted file untouched
 
-        print(f"Encrypted Data: {e}")
+    Returns:
+        bool:
+            True if the file is decrypted successfully
+    '''
+    if not os.path.isfile(path):
+        raise NameError('Incorrect File Path')
+
+    executor = executor or _default_executor()
+    # The flag is checked between chunks, which may be in another process
+    cancel = _ProcessEvent()
+    try:
+        function = functools.partial(_decrypt_file_stream, _executor_key(key, executor), path, chunk_size, engine, cancel)
+        return await _run_in_executor(function, executor, cancel, stats)
+    finally:
+        cancel.close()
 
-        print(f"Decrypted Data: {d}")
 
+if __name__=="__main__":
+    from listcrypt.cli import main
+    sys.exit(main())
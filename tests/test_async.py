@@ -0,0 +1,120 @@
+'''
+Checks the awaitable functions on their default executor and others
+'''
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+def run(coroutine) -> 'any data type':
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize("key", [KEY, listcrypt.Cipher(KEY)], ids=["key", "Cipher"])
+def test_round_trip(key):
+    async def main():
+        data = os.urandom(100_000)
+        encrypted_data = await listcrypt.encrypt_async(key, data)
+        assert encrypted_data == listcrypt.encrypt(KEY, data, processes=1)
+        assert await listcrypt.decrypt_async(key, encrypted_data) == data
+
+        records = [str(record)*1000 for record in range(8)]
+        encrypted_records = await asyncio.gather(*[listcrypt.encrypt_async(key, record) for record in records])
+        assert await asyncio.gather(*[listcrypt.decrypt_async(key, record) for record in encrypted_records]) == records
+    run(main())
+
+
+def test_forwards_encrypt_arguments():
+    async def main():
+        data = "hello world "*10_000
+        encrypted_data = await listcrypt.encrypt_async(KEY, data, processes=2, shared_memory=True, timeout=60, format_version=1)
+        assert encrypted_data == listcrypt.encrypt(KEY, data, processes=2, format_version=1)
+        assert await listcrypt.decrypt_async(KEY, encrypted_data, processes=2, shared_memory=True, timeout=60) == data
+    run(main())
+
+
+def test_forwards_compression():
+    async def main():
+        data = "compressible "*10_000
+        encrypted_data = await listcrypt.encrypt_async(KEY, data, compression="zlib")
+        assert listcrypt.read_header(encrypted_data)["compression"] == "zlib"
+        assert await listcrypt.decrypt_async(KEY, encrypted_data) == data
+    run(main())
+
+
+def test_pool_and_thread_executor():
+    async def main():
+        data = os.urandom(100_000)
+        with listcrypt.WorkerPool(2) as pool:
+            encrypted_data = await listcrypt.encrypt_async(KEY, data, processes=2, pool=pool)
+        with ThreadPoolExecutor(2) as executor:
+            assert await listcrypt.decrypt_async(listcrypt.Cipher(KEY), encrypted_data, executor=executor) == data
+    run(main())
+
+
+def test_stats_from_worker_process():
+    async def main():
+        events = []
+        stats = listcrypt.Stats(events.append)
+        await listcrypt.encrypt_async(KEY, os.urandom(100_000), stats=stats)
+        assert stats.bytes_processed >= 100_000 and stats.stages["cipher"] > 0
+        assert any(event["event"] == "stage" for event in events)
+    run(main())
+
+
+def test_files(tmp_path):
+    async def main():
+        data = os.urandom(200_000)
+        path = tmp_path/"data"
+        path.write_bytes(data)
+        stats = listcrypt.Stats()
+        assert await listcrypt.encrypt_file_async(listcrypt.Cipher(KEY), str(path), chunk_size=4096, stats=stats)
+        assert path.read_bytes() != data and stats.bytes_processed
+        assert await listcrypt.decrypt_file_async(KEY, str(path), chunk_size=4096)
+        assert path.read_bytes() == data
+    run(main())
+
+
+def test_cancelled_file_is_untouched(tmp_path):
+    async def main():
+        data = os.urandom(8_000_000)
+        path = tmp_path/"data"
+        path.write_bytes(data)
+        task = asyncio.create_task(listcrypt.encrypt_file_async(KEY, str(path), metadata_removal=False, chunk_size=1024))
+        # Cancels once the temporary file shows the file is being encrypted
+        while len(os.listdir(tmp_path)) == 1:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert path.read_bytes() == data
+        assert os.listdir(tmp_path) == ["data"]
+    run(main())
+
+
+def test_event_loop_keeps_running():
+    async def heartbeat(lateness:list):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lateness.append(time.perf_counter()-start-0.001)
+
+    async def main():
+        # Starts the default executor's processes before measuring
+        await listcrypt.encrypt_async(KEY, b"")
+        lateness = []
+        beating = asyncio.create_task(heartbeat(lateness))
+        await asyncio.gather(*[listcrypt.encrypt_async(KEY, os.urandom(4 << 20)) for _ in range(2)])
+        beating.cancel()
+        lateness.sort()
+        return lateness[int(len(lateness)*.99)]
+
+    assert run(main()) < 0.05
@@ -0,0 +1,45 @@
+'''
+Checks 'encrypt_many' and 'decrypt_many' match one call per value
+'''
+
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+VALUES = ["", "short", "hello world"*100, b"\x00\xff bytes", os.urandom(5000), [1, 2, 3], {"a": 1.5}]
+
+
+@pytest.mark.parametrize("processes", [1, 2, 5])
+def test_encrypt_many_matches_encrypt(processes):
+    encrypted_values = listcrypt.encrypt_many(KEY, VALUES, processes=processes)
+    assert encrypted_values == [listcrypt.encrypt(KEY, value, processes=1) for value in VALUES]
+    assert listcrypt.decrypt_many(KEY, encrypted_values, processes=processes) == VALUES
+
+
+def test_on_pool():
+    with listcrypt.WorkerPool(2) as pool:
+        encrypted_values = listcrypt.encrypt_many(KEY, VALUES, processes=2, pool=pool)
+        assert listcrypt.decrypt_many(KEY, encrypted_values, processes=2, pool=pool) == VALUES
+
+
+def test_cipher_methods():
+    cipher = listcrypt.Cipher(KEY)
+    encrypted_values = cipher.encrypt_many(VALUES, processes=1)
+    assert encrypted_values == listcrypt.encrypt_many(KEY, VALUES, processes=1)
+    assert cipher.decrypt_many(encrypted_values, processes=1) == VALUES
+
+
+def test_decrypt_many_failures():
+    encrypted_values = listcrypt.encrypt_many(KEY, ["one", "two"], processes=1)
+    # Format version 1 data encrypted with one process is read too
+    encrypted_values.append(listcrypt.encrypt(KEY, "three", processes=1, format_version=1))
+    assert listcrypt.decrypt_many(KEY, encrypted_values, processes=1) == ["one", "two", "three"]
+    assert listcrypt.decrypt_many("wrong key", encrypted_values[:2], processes=1) == [False, False]
+
+
+def test_empty():
+    assert listcrypt.encrypt_many(KEY, [], processes=2) == []
+    assert listcrypt.decrypt_many(KEY, [], processes=2) == []
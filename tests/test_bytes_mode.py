@@ -0,0 +1,47 @@
+'''
+Checks bytes are encrypted as they are in format version 2
+'''
+
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+@pytest.mark.parametrize("data", [b"", b"text\n", os.urandom(100_000), bytes(range(256))*10], ids=len)
+def test_round_trip(data, processes):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=processes)
+    assert listcrypt.read_header(encrypted_data)["type"] == 'bytes'
+    # One byte per byte of data and the confirmation text, no base64
+    assert len(encrypted_data) == listcrypt.HEADER.size+len(data)+2
+
+    decrypted_data = listcrypt.decrypt(KEY, encrypted_data, processes=processes)
+    assert type(decrypted_data) == bytes
+    assert decrypted_data == data
+
+
+def test_bytearray():
+    data = bytearray(os.urandom(1000))
+    assert listcrypt.decrypt(KEY, listcrypt.encrypt(KEY, data, processes=1), processes=1) == data
+
+
+def test_text_bytes_in_format_version_1():
+    data = b"The quick brown fox jumps over the lazy dog\n"*100
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1, format_version=1)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_streamed_binary_file(tmp_path, chunk_size):
+    data = os.urandom(50_000)
+    path = tmp_path/"data"
+    path.write_bytes(data)
+
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, chunk_size=chunk_size)
+    assert listcrypt.read_header(path.read_bytes())["type"] == 'bytes'
+    assert listcrypt.decrypt_file(KEY, str(path), chunk_size=chunk_size)
+    assert path.read_bytes() == data
@@ -0,0 +1,52 @@
+'''
+Checks a reused 'Cipher' and its keystream cache give the same output
+as the module functions
+'''
+
+import random
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+def test_cache_stays_under_its_cap():
+    page_size = listcrypt.Keystream.page_size
+    keystream = listcrypt.Keystream(KEY, cache_size=page_size*3)
+    uncached = listcrypt.Keystream(KEY)
+    generator = random.Random(0)
+
+    # Reads across far more pages than fit, revisiting evicted ones
+    for _ in range(200):
+        offset = generator.randrange(page_size*12)
+        length = generator.randrange(1, page_size*2)
+        assert keystream.read(offset, length) == uncached.read(offset, length)
+        assert len(keystream._pages)*page_size <= keystream.cache_size
+
+
+def test_cache_smaller_than_a_page():
+    keystream = listcrypt.Keystream(KEY, cache_size=100)
+    assert keystream.read(10, 5000) == listcrypt.Keystream(KEY).read(10, 5000)
+    assert not keystream._pages
+
+
+def test_clear_cache():
+    keystream = listcrypt.Keystream(KEY, cache_size=1 << 20)
+    first_read = keystream.read(0, 1000)
+    assert keystream._pages
+    keystream.clear_cache()
+    assert not keystream._pages
+    assert keystream.read(0, 1000) == first_read
+
+
+@pytest.mark.parametrize("format_version", [1, 2])
+@pytest.mark.parametrize("data", ["hello world", b"bytes \x00\x7f", "x"*100_000, {"a": [1, 2]}], ids=repr)
+def test_cipher_matches_functions(data, format_version):
+    cipher = listcrypt.Cipher(KEY)
+    for _ in range(2):
+        encrypted_data = cipher.encrypt(data, processes=1, format_version=format_version)
+        assert encrypted_data == listcrypt.encrypt(KEY, data, processes=1, format_version=format_version)
+        assert cipher.decrypt(encrypted_data, processes=1) == data
+        assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
@@ -0,0 +1,116 @@
+'''
+Runs the 'listcrypt' command in a subprocess the way it's used in
+pipelines, checking its output and exit status
+'''
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+DATA = os.urandom(300_000)
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def listcrypt_command(*arguments, data=b"", key=KEY) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=SOURCE)
+    environment.pop("LISTCRYPT_KEY", None)
+    if key is not None:
+        environment["LISTCRYPT_KEY"] = key
+    return subprocess.run(
+        [sys.executable, "-m", "listcrypt", *arguments],
+        input=data, capture_output=True, env=environment, timeout=120,
+    )
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_pipe_round_trip(processes):
+    encrypted = listcrypt_command("encrypt", "-p", processes, "-c", "64K", data=DATA)
+    assert encrypted.returncode == 0 and encrypted.stdout != DATA
+    assert listcrypt.decrypt(KEY, encrypted.stdout) == DATA
+
+    decrypted = listcrypt_command("decrypt", "-p", processes, "-c", "64K", data=encrypted.stdout)
+    assert decrypted.returncode == 0 and decrypted.stdout == DATA
+
+
+def test_base64_round_trip():
+    encrypted = listcrypt_command("encrypt", "-f", "base64", data=DATA)
+    assert encrypted.returncode == 0
+    lines = encrypted.stdout.splitlines()
+    assert all(len(line) <= 76 for line in lines)
+
+    decrypted = listcrypt_command("decrypt", "-f", "base64", data=encrypted.stdout)
+    assert decrypted.returncode == 0 and decrypted.stdout == DATA
+
+
+def test_files_and_key_options(tmp_path):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    key_file = tmp_path/"key"
+    key_file.write_text(KEY+"\n")
+
+    # The input and output can be the same file
+    encrypted = listcrypt_command("encrypt", "--key-file", str(key_file), "-i", str(path), "-o", str(path), key=None)
+    assert encrypted.returncode == 0 and encrypted.stdout == b""
+    assert listcrypt.decrypt(KEY, path.read_bytes()) == DATA
+
+    decrypted = listcrypt_command("decrypt", "-k", KEY, "-i", str(path), key=None)
+    assert decrypted.returncode == 0 and decrypted.stdout == DATA
+
+
+def test_compression_to_a_new_file(tmp_path):
+    data = b"compressible "*20_000
+    path = tmp_path/"data.lc"
+    encrypted = listcrypt_command("encrypt", "-z", "zlib", "-o", str(path), data=data)
+    assert encrypted.returncode == 0
+    assert listcrypt.read_header(path.read_bytes())["compression"] == "zlib"
+    assert path.stat().st_size < len(data)
+
+    decrypted = listcrypt_command("decrypt", "-i", str(path))
+    assert decrypted.returncode == 0 and decrypted.stdout == data
+
+
+@pytest.mark.parametrize("output_format", ["binary", "base64"])
+def test_rekey(output_format):
+    encrypted = listcrypt_command("encrypt", "-f", output_format, data=DATA)
+    rekeyed = listcrypt_command("rekey", "--new-key", "new key", "-f", output_format, data=encrypted.stdout)
+    assert rekeyed.returncode == 0
+
+    decrypted = listcrypt_command("decrypt", "-f", output_format, data=rekeyed.stdout, key="new key")
+    assert decrypted.returncode == 0 and decrypted.stdout == DATA
+    assert listcrypt_command("decrypt", "-f", output_format, data=rekeyed.stdout).returncode == 1
+
+
+@pytest.mark.parametrize("command", [("decrypt",), ("rekey", "--new-key", "new key")], ids=["decrypt", "rekey"])
+def test_wrong_key(tmp_path, command):
+    encrypted = listcrypt_command("encrypt", data=DATA).stdout
+    path = tmp_path/"output"
+    result = listcrypt_command(*command, "-o", str(path), data=encrypted, key="wrong key")
+    assert result.returncode == 1
+    assert b"key is wrong" in result.stderr
+    # Nothing is left behind, not even the temporary file
+    assert os.listdir(tmp_path) == []
+
+
+def test_corrupt_input():
+    result = listcrypt_command("decrypt", data=b"not encrypted data")
+    assert result.returncode == 1 and result.stdout == b""
+    assert result.stderr.startswith(b"listcrypt: ")
+
+
+def test_bench():
+    result = listcrypt_command("bench", "-s", "64K", key=None)
+    assert result.returncode == 0, result.stderr
+    assert b"encrypt_stream" in result.stdout
+
+
+def test_bench_reports_a_failed_round_trip(monkeypatch, capsys):
+    import listcrypt.cli
+
+    monkeypatch.setattr(listcrypt.cli, "decrypt", lambda *arguments, **options: b"")
+    assert listcrypt.cli.main(["bench", "-s", "4K"]) == 1
+    assert "didn't give back the data" in capsys.readouterr().err
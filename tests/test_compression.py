@@ -0,0 +1,102 @@
+'''
+Checks compressed data round trips through every path, that data
+which doesn't compress is left alone and that a header which doesn't
+match the data is refused rather than decrypted into garbage
+'''
+
+import io
+import os
+
+import pytest
+
+import listcrypt
+from listcrypt.listcrypt import COMPRESSION_SHIFT, FLAG_COMPRESSION, HEADER
+
+KEY = "test key"
+TEXT = "compressible text, "*20_000
+RANDOM = os.urandom(300_000)
+
+
+def set_flags(encrypted_data:bytes, flags:int) -> bytes:
+    header = list(HEADER.unpack_from(encrypted_data))
+    header[3] = flags
+    return HEADER.pack(*header)+encrypted_data[HEADER.size:]
+
+
+@pytest.mark.parametrize("compression", listcrypt.COMPRESSIONS)
+@pytest.mark.parametrize("data", [TEXT, TEXT.encode(), {"key": [TEXT]}], ids=["str", "bytes", "dict"])
+def test_round_trip(compression, data):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1, compression=compression)
+    assert listcrypt.read_header(encrypted_data)["compression"] == compression
+    assert len(encrypted_data) < len(TEXT)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
+    assert listcrypt.decrypt_many(KEY, [encrypted_data], processes=1) == [data]
+
+
+@pytest.mark.parametrize("compression", listcrypt.COMPRESSIONS)
+def test_stream_round_trip(compression):
+    source = TEXT.encode()
+    encrypted = io.BytesIO()
+    listcrypt.encrypt_stream(KEY, io.BytesIO(source), encrypted, chunk_size=1 << 14, compression=compression)
+    assert len(encrypted.getvalue()) < len(source)
+
+    decrypted = io.BytesIO()
+    assert listcrypt.decrypt_stream(KEY, io.BytesIO(encrypted.getvalue()), decrypted, chunk_size=1 << 14)
+    assert decrypted.getvalue() == source
+    assert listcrypt.decrypt(KEY, encrypted.getvalue()) == source
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1 << 14], ids=["whole", "streamed"])
+def test_file_round_trip(tmp_path, chunk_size):
+    path = tmp_path/"data"
+    path.write_text(TEXT)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, chunk_size=chunk_size, compression="zlib")
+    assert listcrypt.read_header(path.read_bytes())["compression"] == "zlib"
+    assert listcrypt.decrypt_file(KEY, str(path), chunk_size=chunk_size)
+    assert path.read_text() == TEXT
+
+
+def test_incompressible_data_is_left_uncompressed():
+    encrypted_data = listcrypt.encrypt(KEY, RANDOM, processes=1, compression="zlib")
+    assert listcrypt.read_header(encrypted_data)["compression"] is None
+    assert len(encrypted_data) == len(listcrypt.encrypt(KEY, RANDOM, processes=1))
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == RANDOM
+
+    encrypted = io.BytesIO()
+    listcrypt.encrypt_stream(KEY, io.BytesIO(RANDOM), encrypted, compression="zlib")
+    assert listcrypt.read_header(encrypted.getvalue())["compression"] is None
+
+
+def test_unknown_compression():
+    with pytest.raises(ValueError):
+        listcrypt.encrypt(KEY, TEXT, compression="zip")
+    with pytest.raises(ValueError):
+        listcrypt.encrypt(KEY, TEXT, format_version=1, compression="zlib")
+    with pytest.raises(ValueError):
+        listcrypt.encrypt_file(KEY, "unused", memory_map=True, compression="zlib")
+
+
+def test_unknown_flag_is_refused(tmp_path):
+    encrypted_data = listcrypt.encrypt(KEY, TEXT, processes=1, compression="zlib")
+    flags = listcrypt.read_header(encrypted_data)["flags"]
+    # Bit 3, next to the compression, where a later version could keep more of them
+    encrypted_data = set_flags(encrypted_data, flags | 1 << 3)
+    with pytest.raises(ValueError):
+        listcrypt.decrypt(KEY, encrypted_data, processes=1)
+    with pytest.raises(ValueError):
+        listcrypt.decrypt_stream(KEY, io.BytesIO(encrypted_data), io.BytesIO())
+
+    path = tmp_path/"data"
+    path.write_bytes(encrypted_data)
+    with pytest.raises(ValueError):
+        listcrypt.decrypt_file(KEY, str(path), chunk_size=1 << 14)
+    assert path.read_bytes() == encrypted_data
+
+
+@pytest.mark.parametrize("compression", listcrypt.COMPRESSIONS)
+def test_wrong_compression_is_refused(compression):
+    encrypted_data = listcrypt.encrypt(KEY, TEXT, processes=1, compression=compression)
+    flags = listcrypt.read_header(encrypted_data)["flags"] & ~FLAG_COMPRESSION
+    for other in set(listcrypt.COMPRESSIONS.values())-{listcrypt.COMPRESSIONS[compression]}:
+        with pytest.raises(ValueError):
+            listcrypt.decrypt(KEY, set_flags(encrypted_data, flags | other << COMPRESSION_SHIFT), processes=1)
@@ -0,0 +1,48 @@
+'''
+Checks data encrypted in the fixed-header container format (version 2)
+'''
+
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+@pytest.mark.parametrize("data", ["hello world", "héllo wörld ✓ 𝄞", b"\xff\xfe\x00 binary", os.urandom(1000), [1, "two", 3.0]], ids=repr)
+def test_round_trip(data):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1)
+    assert encrypted_data.startswith(listcrypt.HEADER_MAGIC)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
+
+
+def test_header():
+    encrypted_data = listcrypt.encrypt(KEY, "hello world", processes=1)
+    header = listcrypt.read_header(encrypted_data)
+    assert header["version"] == 2
+    assert header["type"] == 'str'
+    # The length includes the confirmation text
+    assert header["length"] == len("hello world")+2
+    assert len(encrypted_data) == listcrypt.HEADER.size+header["length"]*len(header["format"])
+
+
+@pytest.mark.parametrize("processes", [2, 3, 7])
+def test_output_independent_of_processes(processes):
+    data = "hello world"*1000
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=processes)
+    assert encrypted_data == listcrypt.encrypt(KEY, data, processes=1)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=processes) == data
+
+
+def test_read_header_rejects_other_data():
+    with pytest.raises(ValueError):
+        listcrypt.read_header(b"not encrypted with listcrypt")
+    with pytest.raises(ValueError):
+        listcrypt.read_header(listcrypt.encrypt(KEY, "hello world", format_version=1))
+
+
+def test_unsupported_format_version():
+    with pytest.raises(ValueError):
+        listcrypt.encrypt(KEY, "hello world", format_version=3)
@@ -0,0 +1,48 @@
+'''
+Checks the 'python' and 'numpy' engines of 'cipher_segment' agree
+'''
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+requires_numpy = pytest.mark.skipif(not listcrypt.numpy_available(), reason="NumPy isn't installed")
+
+
+@requires_numpy
+@pytest.mark.parametrize("data", ["hello world", "ünïcödé text", "".join(map(chr, range(1, 2000)))], ids=len)
+def test_engines_identical(data):
+    key = listcrypt.Keystream(KEY).read(0, len(data))
+    max_range = listcrypt.range_finder(data)
+
+    python_output = listcrypt.cipher_segment(key, data, max_range, engine='python')
+    numpy_output = listcrypt.cipher_segment(key, data, max_range, engine='numpy')
+    assert numpy_output == python_output
+
+    assert listcrypt.cipher_segment(key, numpy_output, max_range, reverse=True, engine='numpy') == \
+        listcrypt.cipher_segment(key, python_output, max_range, reverse=True, engine='python')
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        listcrypt.cipher_segment("key", "data", 130, engine='fortran')
+
+
+@pytest.mark.parametrize("engine", listcrypt.ENGINES)
+@pytest.mark.parametrize("processes", [1, 4])
+@pytest.mark.parametrize("data", ["hello world"*1000, b"abc"*5000, [1, 2, 3]], ids=lambda data: type(data).__name__)
+def test_round_trip(data, processes, engine):
+    if engine == 'numpy' and not listcrypt.numpy_available():
+        pytest.skip("NumPy isn't installed")
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=processes, engine=engine)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=processes, engine=engine) == data
+
+
+@pytest.mark.parametrize("segments", [1, 3, 4, 7, 50])
+def test_segment_data(segments):
+    data = "0123456789abcdefghijk"
+    segmented_data = listcrypt.segment_data(data, segments)
+    assert "".join(segmented_data) == data
+    assert len(segmented_data) == min(segments, len(data))
@@ -0,0 +1,92 @@
+'''
+Round trips files through 'encrypt_file' and 'decrypt_file' in chunks
+'''
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import listcrypt
+import listcrypt.listcrypt
+
+KEY = "test key"
+
+
+@pytest.mark.parametrize("processes", [1, 3, 4])
+@pytest.mark.parametrize("data", ["hello world, "*3000, "abc"*10, os.urandom(5000)], ids=["text", "short", "binary"])
+@pytest.mark.parametrize("options", [{"chunk_size": 7}, {"chunk_size": 1024}, {"chunk_size": 1 << 20}, {"memory_map": True}], ids=str)
+def test_multiprocess_format_version_1_file(tmp_path, monkeypatch, processes, data, options):
+    # Format version 1 data is split into a segment per core of the
+    # machine that encrypted it, which is the machine decrypting it
+    monkeypatch.setattr(listcrypt.listcrypt, "cpu_count", lambda: processes)
+    path = tmp_path/"data"
+    path.write_bytes(listcrypt.encrypt(KEY, data, processes=processes, format_version=1))
+
+    assert listcrypt.decrypt_file(KEY, str(path), **options)
+    assert path.read_bytes() == (data if type(data) == bytes else data.encode())
+
+
+@pytest.mark.parametrize("data", ["hello world, "*3000, "héllo wörld ✓ "*3000], ids=["ascii", "unicode"])
+def test_chunked_matches_encrypt(tmp_path, data):
+    path = tmp_path/"data"
+    path.write_text(data)
+
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, chunk_size=1000)
+    assert path.read_bytes() == listcrypt.encrypt(KEY, data, processes=4)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000, 1 << 20])
+def test_chunked_round_trip(tmp_path, chunk_size):
+    data = os.urandom(100_000)
+    path = tmp_path/"data"
+    path.write_bytes(data)
+
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, chunk_size=chunk_size)
+    assert path.read_bytes() != data
+    assert listcrypt.decrypt_file(KEY, str(path), chunk_size=chunk_size)
+    assert path.read_bytes() == data
+
+
+# How much the peak RSS of streaming may grow between the smallest
+# and largest file before it's considered not flat
+RSS_TOLERANCE_MB = 16
+CHILD = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+from listcrypt import decrypt_file, encrypt_file
+if sys.argv[2] == "encrypt":
+    assert encrypt_file("test key", sys.argv[3], metadata_removal=False, chunk_size=1 << 20)
+else:
+    assert decrypt_file("test key", sys.argv[3], chunk_size=1 << 20)
+# VmHWM starts over in the new interpreter, while ru_maxrss carries
+# over the peak of the process that started it
+with open("/proc/self/status") as status:
+    print(next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))/1024)
+'''
+
+
+def streaming_rss(path, mode:str) -> float:
+    '''
+    The peak RSS in MB of streaming the file in a new interpreter,
+    so the peak of one run doesn't carry over into the next
+    '''
+    source = os.path.join(os.path.dirname(__file__), '..', 'src')
+    output = subprocess.run([sys.executable, "-c", CHILD, source, mode, str(path)], check=True, capture_output=True, text=True)
+    return float(output.stdout)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="reads the peak RSS from /proc")
+def test_streaming_memory_is_flat(tmp_path):
+    line = b"The quick brown fox jumps over the lazy dog 0123456789\n"
+    rss = []
+    for size in (2 << 20, 32 << 20):
+        path = tmp_path/f"{size}.bin"
+        data = line*(size//len(line))
+        path.write_bytes(data)
+        for mode in ('encrypt', 'decrypt'):
+            rss.append(streaming_rss(path, mode))
+        assert path.read_bytes() == data
+
+    assert max(rss)-min(rss) <= RSS_TOLERANCE_MB, rss
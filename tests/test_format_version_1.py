@@ -0,0 +1,24 @@
+'''
+Checks data encrypted in the origional format (version 1)
+'''
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+@pytest.mark.parametrize("data", ["hello world", b"hello world", b"\xff\xfe\x00 binary", [1, "two", 3.0]], ids=repr)
+def test_round_trip(data):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1, format_version=1)
+    assert not encrypted_data.startswith(listcrypt.HEADER_MAGIC)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
+
+
+def test_data_verification_uses_format_version_1():
+    # The range of format version 1 is measured on UTF-8 bytes, which
+    # can't hold these characters, so they must not pass as 'utf-8'
+    assert not listcrypt.data_verification(KEY, "café ✓")
+    with pytest.raises(TypeError):
+        listcrypt.encrypt(KEY, "café ✓".encode(), processes=1, format_version=1)
@@ -0,0 +1,137 @@
+'''
+Checks 'remove_image_exif' on small JPEG and PNG files built by hand,
+leaving out the metadata while copying everything else byte for byte
+'''
+
+import os
+import struct
+import zlib
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+EXIF = b"Exif\x00\x00MM\x00\x2a"+b"Camera Model Software"*20
+# Compressed JPEG data escapes 0xFF as 0xFF00 and has restart markers
+SCAN = os.urandom(5000).replace(b"\xff", b"\xff\x00")+b"\xff\xd0"+os.urandom(500).replace(b"\xff", b"\x00")
+PIXELS = zlib.compress(os.urandom(16*16*3))
+
+
+def jpeg_segment(marker:int, payload:bytes) -> bytes:
+    return bytes([0xFF, marker])+struct.pack(">H", len(payload)+2)+payload
+
+
+def png_chunk(chunk_type:bytes, data:bytes) -> bytes:
+    return struct.pack(">I", len(data))+chunk_type+data+struct.pack(">I", zlib.crc32(chunk_type+data))
+
+
+def jpeg(metadata=True) -> bytes:
+    kept = [
+        jpeg_segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"),
+        jpeg_segment(0xE2, b"ICC_PROFILE\x00\x01\x01"+bytes(100)),
+        jpeg_segment(0xEE, b"Adobe\x00\x64\x00\x00\x00\x00\x01"),
+        jpeg_segment(0xDB, bytes(65)),
+        jpeg_segment(0xC0, b"\x08\x00\x10\x00\x10\x03\x01\x22\x00\x02\x11\x01\x03\x11\x01"),
+        jpeg_segment(0xC4, bytes(30)),
+    ]
+    removed = [
+        jpeg_segment(0xE1, EXIF),
+        jpeg_segment(0xE1, b"http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>"),
+        jpeg_segment(0xE2, b"MPF\x00"+bytes(40)),
+        jpeg_segment(0xED, b"Photoshop 3.0\x00"+bytes(40)),
+        jpeg_segment(0xFE, b"a comment"),
+    ]
+    segments = kept[:1]+(removed if metadata else [])+kept[1:]
+    return b"\xff\xd8"+b"".join(segments)+jpeg_segment(0xDA, b"\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00")+SCAN+b"\xff\xd9"
+
+
+def png(metadata=True) -> bytes:
+    removed = [
+        png_chunk(b"eXIf", EXIF[6:]),
+        png_chunk(b"tEXt", b"Software\x00listcrypt"),
+        png_chunk(b"zTXt", b"Comment\x00\x00"+zlib.compress(b"a comment")),
+        png_chunk(b"iTXt", b"Author\x00\x00\x00\x00\x00someone"),
+        png_chunk(b"tIME", b"\x07\xea\x0a\x11\x00\x00\x00"),
+    ]
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + png_chunk(b"IHDR", struct.pack(">IIBBBBB", 16, 16, 8, 2, 0, 0, 0))
+        + b"".join(removed if metadata else [])
+        + png_chunk(b"iCCP", b"profile\x00\x00"+zlib.compress(bytes(100)))
+        + png_chunk(b"IDAT", PIXELS[:100])
+        + png_chunk(b"IDAT", PIXELS[100:])
+        + png_chunk(b"IEND", b"")
+    )
+
+
+def write(tmp_path, name:str, data:bytes) -> str:
+    path = tmp_path/name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("image", [jpeg, png], ids=["jpeg", "png"])
+def test_metadata_is_removed(tmp_path, image):
+    with_metadata = image()
+    path = write(tmp_path, "image", with_metadata)
+    assert listcrypt.remove_image_exif(path)
+
+    stripped = open(path, "rb").read()
+    assert b"Camera Model" not in stripped and b"Software" not in stripped
+    assert b"comment" not in stripped and b"Photoshop" not in stripped
+    assert len(stripped) < len(with_metadata)
+    # Nothing is left behind in the directory
+    assert os.listdir(tmp_path) == ["image"]
+
+
+@pytest.mark.parametrize("image", [jpeg, png], ids=["jpeg", "png"])
+def test_pixels_are_unchanged(tmp_path, image):
+    # Removing the metadata leaves exactly the image built without it
+    path = write(tmp_path, "image", image())
+    assert listcrypt.remove_image_exif(path)
+    assert open(path, "rb").read() == image(metadata=False)
+
+
+@pytest.mark.parametrize("image", [jpeg, png], ids=["jpeg", "png"])
+def test_images_without_metadata_are_untouched(tmp_path, image):
+    data = image(metadata=False)
+    path = write(tmp_path, "image", data)
+    modified = os.stat(path).st_mtime_ns
+    assert not listcrypt.remove_image_exif(path)
+    assert open(path, "rb").read() == data
+    assert os.stat(path).st_mtime_ns == modified
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"plain text, not an image",
+    os.urandom(100_000),
+    # Cut off in the middle of a segment or chunk
+    jpeg()[:60],
+    png()[:60],
+    # A segment length running past the end of the file
+    b"\xff\xd8"+b"\xff\xe1\xff\xff"+EXIF,
+    # Garbage where a marker should be
+    b"\xff\xd8\xff\xe0\x00\x04\x00\x00garbage",
+], ids=["empty", "text", "random", "truncated jpeg", "truncated png", "overlong segment", "bad marker"])
+def test_other_and_corrupt_files_are_untouched(tmp_path, data):
+    path = write(tmp_path, "file", data)
+    assert not listcrypt.remove_image_exif(path)
+    assert open(path, "rb").read() == data
+    assert os.listdir(tmp_path) == ["file"]
+
+
+@pytest.mark.parametrize("image", [jpeg, png], ids=["jpeg", "png"])
+def test_encrypt_file_opt_out(tmp_path, image):
+    data = image()
+    path = write(tmp_path, "image", data)
+
+    assert listcrypt.encrypt_file(KEY, path, metadata_removal=False)
+    assert listcrypt.decrypt_file(KEY, path)
+    assert open(path, "rb").read() == data
+
+    assert listcrypt.encrypt_file(KEY, path)
+    assert listcrypt.decrypt_file(KEY, path)
+    stripped = open(path, "rb").read()
+    assert stripped != data and b"Software" not in stripped
@@ -0,0 +1,48 @@
+'''
+Checks the peak memory 'encrypt' allocates stays close to twice the
+payload: the encrypted output, its joined copy and one window of the
+payload. Literals are serialized first, one more copy of their size
+'''
+
+import functools
+import random
+import tracemalloc
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+SEED = 39
+SIZE = 4 << 20
+LIMIT = 2.5
+ENGINES = ['python'] + (['numpy'] if listcrypt.numpy_available() else [])
+
+
+@functools.lru_cache(maxsize=None)
+def payloads() -> dict:
+    generator = random.Random(SEED)
+    return {
+        "bytes": (generator.randbytes(SIZE), SIZE, LIMIT),
+        "ascii str": ("".join(generator.choices("abcdefghijklmnopqrstuvwxyz ", k=SIZE)), SIZE, LIMIT),
+        "non-ascii str": ("".join(generator.choices("abcdéfghijklmnopqrstuvwxyz 日本", k=SIZE//4)), SIZE, LIMIT),
+        "literal": ([generator.randrange(1 << 40) for _ in range(SIZE//8)], None, LIMIT+1),
+    }
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", list(payloads()))
+def test_peak_memory(name, engine):
+    data, size, limit = payloads()[name]
+    size = size or len(listcrypt.serialize_literal(data))
+    cipher = listcrypt.Cipher(KEY, cache_size=0)
+
+    tracemalloc.start()
+    try:
+        encrypted_data = cipher.encrypt(data, processes=1, engine=engine)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert cipher.decrypt(encrypted_data, processes=1) == data
+    assert peak/size <= limit, f"{name} peaked at {peak/size:.2f}x its size"
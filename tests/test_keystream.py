@@ -0,0 +1,64 @@
+'''
+Checks the Keystream generates the same key as the origional 'create_key'
+'''
+
+import math
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+
+
+def baseline_create_key(key:str, data_length:int) -> str:
+    # The origional quadratic 'create_key', kept as the reference output
+    new_key = ""
+    length_of_hash = len(listcrypt.sha256("x"))
+    for i in range(math.ceil(data_length/length_of_hash)+5):
+        new_key += listcrypt.sha256(key+str(i))
+    return new_key
+
+
+@pytest.mark.parametrize("data_length", [0, 1, 43, 44, 45, 1000, 12345])
+def test_create_key_unchanged(data_length):
+    assert listcrypt.create_key(KEY, data_length) == baseline_create_key(KEY, data_length)
+
+
+@pytest.mark.parametrize("offset, length", [(0, 10), (43, 2), (44, 44), (100, 1000), (5000, 0), (12340, 5)])
+def test_read_any_offset(offset, length):
+    expected = baseline_create_key(KEY, offset+length)[offset:offset+length].encode()
+    assert listcrypt.Keystream(KEY).read(offset, length) == expected
+
+
+def test_readinto_fills_buffer():
+    buffer = bytearray(300)
+    assert listcrypt.Keystream(KEY).readinto(buffer, 17) == 300
+    assert bytes(buffer) == baseline_create_key(KEY, 317)[17:317].encode()
+
+
+@pytest.mark.parametrize("key_offset, length", [(0, 2500), (1234, 999), (50_000, 3001)])
+def test_worker_key_expansion_matches_baseline(monkeypatch, key_offset, length):
+    # Small windows, so the range spans several of them
+    monkeypatch.setattr(listcrypt.listcrypt, "WINDOW_LENGTH", 1000)
+    data = bytes(range(256))*(length//256+1)
+    data = data[:length]
+    key = baseline_create_key(KEY, key_offset+length)[key_offset:key_offset+length].encode()
+    expected = bytearray(length)
+    listcrypt.listcrypt.cipher_buffer(memoryview(key), memoryview(data), memoryview(expected), 256, engine='python')
+
+    task = (KEY, key_offset, data, 'B', 'B', 256, False, 'python')
+    assert listcrypt.listcrypt._keyed_cipher_task(task) == expected
+
+
+def test_encrypt_is_the_same_for_every_process_count():
+    data = bytes(range(256))*1200
+    expected = listcrypt.encrypt(KEY, data, processes=1)
+    for processes in (2, 3, 4):
+        stats = listcrypt.Stats()
+        assert listcrypt.encrypt(KEY, data, processes=processes, stats=stats) == expected
+        assert "dispatch" in stats.as_dict()["stages"]
+    assert listcrypt.encrypt(KEY, data, processes=2, shared_memory=True) == expected
+    with listcrypt.WorkerPool(2) as pool:
+        assert listcrypt.encrypt(KEY, data, processes=2, pool=pool) == expected
+        assert listcrypt.decrypt(KEY, expected, processes=2, pool=pool) == data
@@ -0,0 +1,105 @@
+'''
+Checks 'serialize_literal' and 'deserialize_literal' round trip every
+literal type, never build anything else, and only ever raise
+ValueError on corrupted data
+'''
+
+import math
+import random
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+SEED = 39
+
+LITERALS = [
+    None, True, False,
+    0, 255, 256, -1, (1 << 63)-1, -(1 << 63), 1 << 64, -(1 << 200),
+    0.0, -2.5, math.inf, 1e-300,
+    3+4j, complex(-0.5, math.inf),
+    "", "hello", "café ✓ \U0001F600", "\ud800",
+    b"", b"\x00\xff binary",
+    [], (), set(), {},
+    [1, 2, 3], [-(1 << 40), 1 << 40], [1 << 70, 1], [1.5, -2.0], (0.25,), [True, False], [1, 1.5],
+    {1, "two", (3.0, None)},
+    {"key": "value", 1: [2, 3], (4, 5): {"nested": {b"bytes": {6j}}}},
+    [[[], [[]]], ({"a": ()},), [{"deep": [[[[1, "x", None]]]]}]],
+]
+
+
+@pytest.mark.parametrize("data", LITERALS, ids=repr)
+def test_round_trip(data):
+    read_data = listcrypt.deserialize_literal(listcrypt.serialize_literal(data))
+    assert read_data == data
+    assert type(read_data) == type(data)
+
+
+def test_nested_types_are_kept():
+    data = {"list": [(1, 2)], "tuple": ([1.0],), "set": {(1, "a")}, "bools": [True, 1, 1.0]}
+    read_data = listcrypt.deserialize_literal(listcrypt.serialize_literal(data))
+    assert read_data == data
+    assert type(read_data["list"][0]) == tuple and type(read_data["tuple"][0]) == list
+    assert [type(item) for item in read_data["bools"]] == [bool, int, float]
+
+
+def test_nan():
+    assert math.isnan(listcrypt.deserialize_literal(listcrypt.serialize_literal(math.nan)))
+
+
+@pytest.mark.parametrize("data", LITERALS, ids=repr)
+def test_encrypt_round_trip(data):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1)
+    if type(data) not in (str, bytes):
+        assert listcrypt.read_header(encrypted_data)["type"] == "literal"
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == data
+
+
+class Code:
+    '''
+    Isn't a literal, and its str is python code that would
+    run if the reader ever evaluated it
+    '''
+    def __init__(self, source:str):
+        self.source = source
+
+    def __str__(self) -> str:
+        return self.source
+
+
+@pytest.mark.parametrize("data", [print, object(), Code("x"), [1, Code("x")], {"key": len}, bytearray(b"x")], ids=repr)
+def test_rejects_anything_else(data):
+    with pytest.raises(TypeError):
+        listcrypt.serialize_literal(data)
+
+
+@pytest.mark.parametrize("source", ["__import__('os').getcwd()", "print('ran')", "os", "[1, os.sep]", "{'key': len}"])
+def test_calls_and_names_are_never_run(source):
+    # Objects that aren't literals fall back to their str, which is
+    # read back with 'ast.literal_eval' and refused
+    encrypted_data = listcrypt.encrypt(KEY, Code(source), processes=1)
+    assert listcrypt.read_header(encrypted_data)["type"] == "ast"
+    with pytest.raises(ValueError):
+        listcrypt.decrypt(KEY, encrypted_data, processes=1)
+
+
+@pytest.mark.parametrize("data", [b"", b"x", b"i\x00", b"s\x05ab", b"l\xff", b"NN", b"d\x01l\x00N"], ids=repr)
+def test_corrupted_data(data):
+    with pytest.raises(ValueError):
+        listcrypt.deserialize_literal(data)
+
+
+def test_fuzz_only_raises_value_error():
+    generator = random.Random(SEED)
+    data = listcrypt.serialize_literal(LITERALS)
+    for _ in range(20_000):
+        corrupted = bytearray(data)
+        for _ in range(generator.randrange(1, 4)):
+            corrupted[generator.randrange(len(corrupted))] = generator.randrange(256)
+        if generator.random() < 0.3:
+            corrupted = corrupted[:generator.randrange(len(corrupted))]
+        try:
+            listcrypt.deserialize_literal(bytes(corrupted))
+        except ValueError:
+            pass
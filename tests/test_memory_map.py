@@ -0,0 +1,53 @@
+'''
+Checks memory mapped 'encrypt_file' and 'decrypt_file' round trip
+and write the same format as the other modes
+'''
+
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+DATA = os.urandom(1 << 20)
+CHUNK_SIZE = 1 << 16
+
+
+@pytest.mark.parametrize("data", [b"", b"x", DATA], ids=["empty", "one byte", "1 MB"])
+def test_round_trip(tmp_path, data):
+    path = tmp_path/"data"
+    path.write_bytes(data)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, memory_map=True)
+    assert path.read_bytes() != data
+    assert listcrypt.decrypt_file(KEY, str(path), memory_map=True)
+    assert path.read_bytes() == data
+
+
+def test_mapped_output_is_readable_by_the_other_modes(tmp_path):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, memory_map=True)
+    encrypted_data = path.read_bytes()
+
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=1) == DATA
+    assert listcrypt.decrypt_range(KEY, encrypted_data, 1000, 4096) == DATA[1000:5096]
+    assert listcrypt.decrypt_file(KEY, str(path), chunk_size=CHUNK_SIZE)
+    assert path.read_bytes() == DATA
+
+
+def test_streamed_output_is_readable_mapped(tmp_path):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, chunk_size=CHUNK_SIZE)
+    assert listcrypt.decrypt_file(KEY, str(path), memory_map=True)
+    assert path.read_bytes() == DATA
+
+
+def test_wrong_key_leaves_the_file(tmp_path):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, memory_map=True)
+    encrypted_data = path.read_bytes()
+    assert not listcrypt.decrypt_file("wrong key", str(path), memory_map=True)
+    assert path.read_bytes() == encrypted_data
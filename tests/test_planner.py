@@ -0,0 +1,69 @@
+'''
+Checks the choices 'plan_execution' makes and that 'encrypt' and
+'decrypt' follow them unless told otherwise
+'''
+
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+ENGINES = ['python'] + (['numpy'] if listcrypt.numpy_available() else [])
+LENGTHS = [0, 1, 10, 1 << 10, listcrypt.MIN_SEGMENT_LENGTH, 1 << 20, 1 << 26]
+
+
+@pytest.mark.parametrize("length", LENGTHS)
+@pytest.mark.parametrize("records", [1, 1000])
+def test_plans_are_valid(length, records):
+    plan = listcrypt.plan_execution(length, records=records)
+    assert plan["engine"] in ENGINES
+    assert 1 <= plan["processes"] <= max(1, min(listcrypt.cpu_count(), length//listcrypt.MIN_SEGMENT_LENGTH))
+    assert plan["strategy"] == ('processes' if plan["processes"] > 1 else 'vectorized' if plan["engine"] == 'numpy' else 'serial')
+    assert plan["seconds"] >= 0
+
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_pool_caps_the_processes(length):
+    with listcrypt.WorkerPool(2) as pool:
+        assert listcrypt.plan_execution(length, pool=pool)["processes"] <= 2
+
+
+def test_short_data_isnt_split():
+    assert listcrypt.plan_execution(listcrypt.MIN_SEGMENT_LENGTH-1)["processes"] == 1
+
+
+@pytest.mark.parametrize("processes", [1, 3, 16])
+@pytest.mark.parametrize("engine", ENGINES)
+def test_overrides_are_used_as_given(processes, engine):
+    plan = listcrypt.plan_execution(100, processes, engine)
+    assert plan["processes"] == processes and plan["engine"] == engine
+
+
+@pytest.mark.parametrize("processes", [0, -1, 1.5, "4"])
+def test_invalid_processes(processes):
+    with pytest.raises(ValueError):
+        listcrypt.plan_execution(100, processes)
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        listcrypt.plan_execution(100, engine="fortran")
+
+
+def test_per_call_override_is_honoured():
+    # Whatever the plan would have been, an explicit amount of
+    # processes splits the data that many ways
+    data = os.urandom(1 << 19)
+    for processes in (1, 2):
+        stats = listcrypt.Stats()
+        encrypted_data = listcrypt.encrypt(KEY, data, processes=processes, engine='python', stats=stats)
+        assert stats.peak_segment == -(-(len(data)+2)//processes)
+        assert listcrypt.decrypt(KEY, encrypted_data, processes=processes, engine='python') == data
+
+
+def test_calibrate():
+    costs = listcrypt.calibrate(processes=False)
+    for engine in ENGINES:
+        assert costs[engine] >= 0 and costs[f"{engine} call"] >= 0
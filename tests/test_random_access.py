@@ -0,0 +1,37 @@
+'''
+Checks 'decrypt_range' against the same range of a full 'decrypt'
+'''
+
+import os
+import random
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+SEED = 39
+RANGE_LENGTH = 4096
+
+
+@pytest.mark.parametrize("data", [os.urandom(1 << 20), "héllo wörld ✓ 日本 "*20_000], ids=["bytes", "str"])
+def test_ranges_match_full_decrypt(tmp_path, data):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=1)
+    decrypted_data = listcrypt.decrypt(KEY, encrypted_data, processes=1)
+    assert decrypted_data == data
+
+    path = tmp_path/"data"
+    path.write_bytes(encrypted_data)
+    generator = random.Random(SEED)
+    with open(path, "rb") as file:
+        # Random ranges, including ones running past the end
+        for _ in range(100):
+            offset = generator.randrange(len(data))
+            expected = decrypted_data[offset:offset+RANGE_LENGTH]
+            assert listcrypt.decrypt_range(KEY, file, offset, RANGE_LENGTH) == expected
+            assert listcrypt.decrypt_range(KEY, encrypted_data, offset, RANGE_LENGTH) == expected
+
+
+def test_wrong_key():
+    encrypted_data = listcrypt.encrypt(KEY, b"some data", processes=1)
+    assert listcrypt.decrypt_range("wrong key", encrypted_data, 0, 4) is False
@@ -0,0 +1,66 @@
+'''
+Checks the properties of 'segment_ranges' and 'segment_data'
+'''
+
+import random
+
+import pytest
+
+import listcrypt
+
+SEED = 39
+
+
+def check(length:int, segments:int, min_segment_length:int, oversubscription:int):
+    ranges = listcrypt.segment_ranges(length, segments, min_segment_length, oversubscription)
+    case = (length, segments, min_segment_length, oversubscription, ranges[:4])
+
+    # The ranges cover every item once, in order
+    assert ranges[0][0] == 0 and ranges[-1][1] == length, case
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:])), case
+
+    lengths = [stop-start for start, stop in ranges]
+    assert len(ranges) <= segments*oversubscription, case
+    assert max(lengths)-min(lengths) <= 1, case
+    if length == 0:
+        assert ranges == [(0, 0)], case
+        return
+    assert min(lengths) >= 1, case
+    # Only short data gets a range shorter than the minimum, and then only one
+    assert min(lengths) >= min_segment_length or len(ranges) == 1, case
+    # There are as many ranges as the minimum length allows
+    assert len(ranges) == min(segments*oversubscription, max(1, length//min_segment_length)), case
+
+
+@pytest.mark.parametrize("min_segment_length", [1, 2, 3, 7, 64])
+def test_small_cases(min_segment_length):
+    for length in range(200):
+        for segments in range(1, 40):
+            for oversubscription in (1, 2, 4):
+                check(length, segments, min_segment_length, oversubscription)
+
+
+def test_random_cases():
+    generator = random.Random(SEED)
+    for _ in range(5_000):
+        check(
+            generator.randrange(1 << generator.randrange(1, 40)),
+            generator.randrange(1, 1 << generator.randrange(1, 12)),
+            generator.randrange(1, 1 << generator.randrange(1, 24)),
+            generator.randrange(1, 9),
+        )
+
+
+@pytest.mark.parametrize("arguments", [(0, 0), (10, 1, 0), (10, 1, 1, 0)])
+def test_invalid_arguments(arguments):
+    with pytest.raises(ValueError):
+        listcrypt.segment_ranges(*arguments)
+
+
+def test_segment_data():
+    for length in range(200):
+        data = "".join(chr(97+index%26) for index in range(length))
+        for segments in range(1, 40):
+            segmented_data = listcrypt.segment_data(data, segments)
+            assert "".join(segmented_data) == data, (length, segments)
+            assert len(segmented_data) == min(segments, length), (length, segments)
@@ -0,0 +1,61 @@
+'''
+Checks what a Stats collects from each kind of call, and that
+passing one doesn't change the output
+'''
+
+import os
+import pickle
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+DATA = os.urandom(1 << 18)
+
+
+def progress_events(events:list) -> list:
+    return [event for event in events if event["event"] == "progress"]
+
+
+@pytest.mark.parametrize("processes", [1, 4])
+def test_encrypt_and_decrypt(processes):
+    events = []
+    stats = listcrypt.Stats(events.append)
+    encrypted_data = listcrypt.encrypt(KEY, DATA, processes=processes, stats=stats)
+    assert encrypted_data == listcrypt.encrypt(KEY, DATA, processes=processes)
+    assert stats.bytes_processed >= len(DATA)
+    assert stats.stages["cipher"] > 0
+
+    events = []
+    stats = listcrypt.Stats(events.append)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=processes, stats=stats) == DATA
+    assert progress_events(events)[-1] == {"event": "progress", "done": processes, "total": processes}
+    assert set(stats.as_dict()) == {"stages", "seconds", "bytes_processed", "peak_segment", "throughput"}
+
+
+@pytest.mark.parametrize("options", [{"chunk_size": 1 << 16}, {"memory_map": True}], ids=["streamed", "mapped"])
+def test_files(tmp_path, options):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    events = []
+    stats = listcrypt.Stats(events.append)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False, stats=stats, **options)
+    assert listcrypt.decrypt_file(KEY, str(path), stats=stats, **options)
+    assert path.read_bytes() == DATA
+    assert stats.bytes_processed >= 2*len(DATA)
+    assert progress_events(events)
+
+
+def test_merge_and_pickle():
+    stats = listcrypt.Stats()
+    listcrypt.encrypt(KEY, DATA, processes=1, stats=stats)
+    # Only what was collected is sent to another process
+    copy = pickle.loads(pickle.dumps(stats))
+    assert copy.as_dict() == stats.as_dict()
+
+    total = listcrypt.Stats()
+    total.merge(stats)
+    total.merge(copy)
+    assert total.bytes_processed == 2*stats.bytes_processed
+    assert total.stages["cipher"] == pytest.approx(2*stats.stages["cipher"])
@@ -0,0 +1,104 @@
+'''
+Round trips directory trees through 'encrypt_tree' and 'decrypt_tree',
+and resumes an interrupted run without encrypting any file twice
+'''
+
+import json
+import os
+
+import pytest
+
+import listcrypt
+import listcrypt.listcrypt
+
+KEY = "test key"
+
+
+def write_tree(root, count=12, size=3000) -> dict:
+    files = {}
+    for file in range(count):
+        directory = root/f"{file%3}"
+        directory.mkdir(exist_ok=True)
+        path = directory/f"{file}.bin"
+        files[str(path)] = os.urandom(size*(file+1))
+        path.write_bytes(files[str(path)])
+    return files
+
+
+def assert_decrypts_once(files:dict):
+    '''
+    Decrypting each file a single time gives back its origional,
+    which fails for a file that was encrypted twice
+    '''
+    for path, data in files.items():
+        assert listcrypt.decrypt_file(KEY, path)
+        assert open(path, "rb").read() == data
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("large_file_size", [1 << 26, 20_000], ids=["small files", "large files"])
+@pytest.mark.parametrize("encrypt_key, decrypt_key", [
+    (KEY, KEY),
+    (listcrypt.Cipher(KEY), KEY),
+    (KEY, listcrypt.Cipher(KEY)),
+], ids=["key", "Cipher encrypts", "Cipher decrypts"])
+def test_round_trip(tmp_path, processes, large_file_size, encrypt_key, decrypt_key):
+    files = write_tree(tmp_path)
+
+    report = listcrypt.encrypt_tree(encrypt_key, str(tmp_path), processes, metadata_removal=False, large_file_size=large_file_size)
+    assert sorted(report["succeeded"]) == sorted(files) and not report["failed"]
+    assert all(open(path, "rb").read() != data for path, data in files.items())
+
+    report = listcrypt.decrypt_tree(decrypt_key, str(tmp_path), processes, large_file_size=large_file_size)
+    assert sorted(report["succeeded"]) == sorted(files) and not report["failed"]
+    assert all(open(path, "rb").read() == data for path, data in files.items())
+
+
+def test_resumes_after_interruption_mid_batch(tmp_path, monkeypatch):
+    root = tmp_path/"root"
+    root.mkdir()
+    files = write_tree(root)
+    progress_path = str(tmp_path/"progress")
+
+    # Interrupts the run in the middle of the second batch
+    encrypt_file = listcrypt.listcrypt.encrypt_file
+    calls = []
+    def interrupted_encrypt_file(*arguments):
+        if len(calls) == 5:
+            raise KeyboardInterrupt
+        calls.append(arguments[1])
+        return encrypt_file(*arguments)
+    monkeypatch.setattr(listcrypt.listcrypt, "encrypt_file", interrupted_encrypt_file)
+    with pytest.raises(KeyboardInterrupt):
+        listcrypt.encrypt_tree(KEY, str(root), 1, metadata_removal=False, progress_path=progress_path)
+    monkeypatch.undo()
+
+    # Every file finished before the interruption is already recorded
+    with open(progress_path) as file:
+        recorded = [json.loads(line)["path"] for line in file]
+    assert recorded == [os.path.abspath(path) for path in calls]
+
+    report = listcrypt.encrypt_tree(KEY, str(root), 1, metadata_removal=False, progress_path=progress_path)
+    assert report["skipped"] == sorted(recorded) and not report["failed"]
+    assert sorted(report["succeeded"]+report["skipped"]) == sorted(files)
+    assert not os.path.exists(progress_path)
+    assert_decrypts_once(files)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_skips_encrypted_files(tmp_path, processes):
+    files = write_tree(tmp_path)
+    # Encrypted by a run that was interrupted before recording it
+    encrypted_path = sorted(files)[0]
+    assert listcrypt.encrypt_file(KEY, encrypted_path, metadata_removal=False)
+
+    report = listcrypt.encrypt_tree(KEY, str(tmp_path), processes, metadata_removal=False)
+    assert report["skipped"] == [encrypted_path] and not report["failed"]
+    assert_decrypts_once(files)
+
+    # With 'force' it's encrypted again
+    assert listcrypt.encrypt_file(KEY, encrypted_path, metadata_removal=False)
+    report = listcrypt.encrypt_tree(KEY, str(tmp_path), processes, metadata_removal=False, force=True)
+    assert sorted(report["succeeded"]) == sorted(files) and not report["skipped"]
+    assert listcrypt.decrypt_file(KEY, encrypted_path)
+    assert open(encrypted_path, "rb").read()[:3] == listcrypt.HEADER_MAGIC
@@ -0,0 +1,109 @@
+'''
+Checks 'encrypt' and 'decrypt' give the same output on a 'WorkerPool'
+and through shared memory, and how '_run_tasks' handles workers that
+fail, die or run past their timeout
+'''
+
+import os
+import time
+
+import pytest
+
+import listcrypt
+from listcrypt.listcrypt import _cipher_task, _run_tasks
+
+KEY = "test key"
+
+
+def sleep_task(seconds:float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def exit_task(task:tuple) -> int:
+    seconds, code = task
+    time.sleep(seconds)
+    if code:
+        os._exit(code)
+    return code
+
+
+def raise_task(message:str) -> str:
+    if message:
+        raise ValueError(message)
+    return message
+
+
+@pytest.fixture
+def pool():
+    with listcrypt.WorkerPool(2) as pool:
+        yield pool
+
+
+def test_results_in_order(pool):
+    assert _run_tasks(sleep_task, [0.05, 0, 0.02, 0], pool, None) == [0.05, 0, 0.02, 0]
+
+
+@pytest.mark.parametrize("with_pool", [True, False])
+def test_matches_polling(pool, with_pool):
+    # The results are the same as waiting on 'is_alive()' gave
+    keystream = listcrypt.Keystream(KEY)
+    data = b"0123456789abcdef"*1000
+    tasks = [(keystream.read(start, 4000), data[start:start+4000], 'B', 'B', 130, False, 'python') for start in range(0, len(data), 4000)]
+    expected = [_cipher_task(task) for task in tasks]
+    assert _run_tasks(_cipher_task, tasks, pool if with_pool else None, None) == expected
+
+
+def test_timeout_stops_the_workers(pool):
+    with pytest.raises(TimeoutError):
+        _run_tasks(sleep_task, [0, 3, 3], pool, 0.2)
+
+    # The next call doesn't wait behind the timed out tasks
+    start = time.monotonic()
+    assert _run_tasks(sleep_task, [0, 0], pool, None) == [0, 0]
+    assert time.monotonic()-start < 1.5
+
+
+def test_dead_worker_raises(pool):
+    with pytest.raises(listcrypt.SegmentError) as error:
+        _run_tasks(exit_task, [(0, 0), (0, 0), (0.5, 3)], pool, 10)
+    assert error.value.segment == 2
+
+    # The pool starts new workers afterwards
+    assert _run_tasks(exit_task, [(0, 0), (0, 0)], pool, None) == [0, 0]
+
+
+def test_failed_task_raises(pool):
+    with pytest.raises(listcrypt.SegmentError) as error:
+        _run_tasks(raise_task, ["", "", "failed"], pool, None)
+    assert error.value.segment == 2
+    assert isinstance(error.value.__cause__, ValueError)
+
+
+def test_dead_worker_without_pool():
+    with pytest.raises(listcrypt.SegmentError) as error:
+        _run_tasks(exit_task, [(0, 0), (0, 0), (0, 3)], None, None)
+    assert error.value.segment == 2
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+@pytest.mark.parametrize("processes", [1, 2, 5])
+@pytest.mark.parametrize("data", ["hello world"*5000, os.urandom(1 << 16)], ids=["text", "binary"])
+def test_encrypt_on_pool(pool, processes, data, shared_memory):
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=processes, pool=pool, shared_memory=shared_memory)
+    assert encrypted_data == listcrypt.encrypt(KEY, data, processes=processes)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=processes, pool=pool, shared_memory=shared_memory) == data
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_shared_memory_without_pool(processes):
+    data = "hello world"*5000
+    encrypted_data = listcrypt.encrypt(KEY, data, processes=processes, shared_memory=True)
+    assert encrypted_data == listcrypt.encrypt(KEY, data, processes=processes)
+    assert listcrypt.decrypt(KEY, encrypted_data, processes=processes, shared_memory=True) == data
+
+
+def test_pool_reused_between_calls(pool):
+    for size in (100, 10_000, 100):
+        data = "x"*size
+        assert listcrypt.decrypt(KEY, listcrypt.encrypt(KEY, data, processes=2, pool=pool), processes=2, pool=pool) == data
@@ -0,0 +1,62 @@
+'''
+Checks a wrong key is turned away from the confirmation text alone,
+without decrypting the rest of the data or touching files
+'''
+
+import io
+import os
+
+import pytest
+
+import listcrypt
+
+KEY = "test key"
+WRONG_KEY = "wrong key"
+DATA = os.urandom(1 << 20)
+ENCRYPTED_DATA = listcrypt.encrypt(KEY, DATA, processes=1)
+
+
+@pytest.mark.parametrize("key", [KEY, listcrypt.Cipher(KEY)], ids=["str", "Cipher"])
+def test_verify_key(key):
+    assert listcrypt.verify_key(key, ENCRYPTED_DATA)
+    assert listcrypt.verify_key(key, io.BytesIO(ENCRYPTED_DATA))
+    assert not listcrypt.verify_key(WRONG_KEY, ENCRYPTED_DATA)
+    assert not listcrypt.verify_key(listcrypt.Cipher(WRONG_KEY), io.BytesIO(ENCRYPTED_DATA))
+
+
+def test_verify_key_reads_only_the_start_of_files():
+    file = io.BytesIO(ENCRYPTED_DATA)
+    assert not listcrypt.verify_key(WRONG_KEY, file)
+    assert file.tell() < 64
+
+
+def test_verify_key_format_version_1():
+    encrypted_data = listcrypt.encrypt(KEY, "hello world", processes=1, format_version=1)
+    assert listcrypt.verify_key(KEY, encrypted_data)
+    assert not listcrypt.verify_key(WRONG_KEY, encrypted_data)
+
+
+def test_decrypt_skips_the_data():
+    stats = listcrypt.Stats()
+    assert listcrypt.decrypt(WRONG_KEY, ENCRYPTED_DATA, processes=1, stats=stats) is False
+    assert stats.bytes_processed == 0
+
+
+def test_decrypt_many():
+    encrypted_data = listcrypt.encrypt_many(KEY, [b"one", "two", DATA], processes=1)
+    assert listcrypt.decrypt_many(WRONG_KEY, encrypted_data, processes=1) == [False, False, False]
+    assert listcrypt.decrypt_many(KEY, encrypted_data, processes=1) == [b"one", "two", DATA]
+
+
+@pytest.mark.parametrize("memory_map", [False, True], ids=["streamed", "mapped"])
+def test_decrypt_file_leaves_the_file_untouched(tmp_path, memory_map):
+    path = tmp_path/"data"
+    path.write_bytes(DATA)
+    assert listcrypt.encrypt_file(KEY, str(path), metadata_removal=False)
+    encrypted_data = path.read_bytes()
+
+    assert not listcrypt.decrypt_file(WRONG_KEY, str(path), chunk_size=1 << 16, memory_map=memory_map)
+    assert path.read_bytes() == encrypted_data
+    assert os.listdir(tmp_path) == ["data"]
+    assert listcrypt.decrypt_file(KEY, str(path), memory_map=memory_map)
+    assert path.read_bytes() == DATA